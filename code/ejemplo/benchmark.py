@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Benchmark del motor de scheduling con conjuntos sintéticos a escala de facultad
+Mide carga, agrupación, asignación, guardado del resultado y exportación (la de
+Ver Resultados) a 1×, 10× y 100× la facultad de referencia y guarda los
+resultados en JSON para comparar entre versiones
+
+    python benchmark.py                          # 1× y 10×
+    python benchmark.py --escalas 1,10,100       # 100×: unos diez minutos entre generar y medir
+    python benchmark.py --comparar resultados_benchmark/anterior.json
+"""
+
+import argparse
+import csv
+import importlib.util
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datos_ejemplo import FACULTAD_REFERENCIA, generar_datos_sinteticos  # noqa: E402
+from modules.scheduling import MotorScheduling  # noqa: E402
+from modules.scheduling.entrada import cargar_datos_entrada  # noqa: E402
+from modules.utils.resultados_columnar import ARCHIVO_RESULTADOS, es_columnar, guardar_resultados  # noqa: E402
+
+try:
+    from modules.utils import exportar_excel
+
+    EXPORTADOR_DISPONIBLE = True
+except ImportError:
+    EXPORTADOR_DISPONIBLE = False
+
+try:
+    import resource
+
+    RESOURCE_DISPONIBLE = True
+except ImportError:
+    RESOURCE_DISPONIBLE = False
+
+ETAPAS = ['carga', 'agrupacion', 'asignacion', 'guardado', 'exportacion']
+VERSION_FORMATO = 2
+
+# Etapas que en un formato anterior medían otra cosa y no se comparan con él
+# (en la versión 1 'exportacion' era el guardado del archivo de resultados)
+ETAPAS_REDEFINIDAS = {1: {'exportacion'}}
+
+
+def _memoria_pico_mb():
+    """Memoria residente máxima del proceso (None si no se puede medir)"""
+    if not RESOURCE_DISPONIBLE:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux lo da en KB y macOS en bytes
+    return round(pico / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def _commit_actual():
+    try:
+        salida = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5)
+        return salida.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _guardar(filas, directorio):
+    """Guardar el resultado como lo hace generar_horarios (Arrow o Excel, CSV si no hay pandas)"""
+    try:
+        ruta = guardar_resultados(filas, os.path.join(directorio, ARCHIVO_RESULTADOS))
+        return 'arrow' if es_columnar(ruta) else 'excel'
+    except ImportError:
+        ruta = os.path.join(directorio, 'resultado.csv')
+        with open(ruta, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=list(filas[0]) if filas else [])
+            writer.writeheader()
+            writer.writerows(filas)
+        return 'csv'
+
+
+def _exportar(filas, directorio):
+    """
+    Exportar como lo hace Ver Resultados (exportar_resultados) en los formatos
+    que permiten las librerías instaladas
+
+    Returns:
+        list: formatos exportados (vacía si falta pandas)
+    """
+    if not EXPORTADOR_DISPONIBLE:
+        return []
+    formatos = ['csv']
+    if exportar_excel.XLSXWRITER_DISPONIBLE or importlib.util.find_spec('openpyxl') is not None:
+        formatos.insert(0, 'excel')
+    if exportar_excel.REPORTLAB_DISPONIBLE:
+        formatos.append('pdf')
+    exportar_excel.exportar_resultados(filas, directorio=os.path.join(directorio, 'exportacion'), formatos=formatos)
+    return formatos
+
+
+def medir_escala(escala, solapamiento=5.0, semilla=0, directorio_base=None):
+    """
+    Generar el conjunto de una escala y cronometrar cada etapa
+
+    Returns:
+        dict: tamaños, tiempos por etapa (s), resultado y memoria pico
+    """
+    tamanos = {clave: max(1, int(valor * escala)) for clave, valor in FACULTAD_REFERENCIA.items()}
+
+    with tempfile.TemporaryDirectory(dir=directorio_base) as directorio:
+        print(f"\n📐 Escala {escala}×: {tamanos['alumnos']} alumnos, {tamanos['asignaturas']} asignaturas, "
+              f"{tamanos['laboratorios']} laboratorios, {tamanos['profesores']} profesores")
+
+        inicio = time.perf_counter()
+        rutas = generar_datos_sinteticos(directorio, solapamiento=solapamiento, semilla=semilla, **tamanos)
+        generacion = time.perf_counter() - inicio
+
+        tiempos = {}
+
+        inicio = time.perf_counter()
+        datos = cargar_datos_entrada(rutas['alumnos'], rutas['asignaturas'], rutas['laboratorios'],
+                                     rutas['profesores'])
+        tiempos['carga'] = time.perf_counter() - inicio
+        print(f"   ⏱️ carga       {tiempos['carga']:8.3f}s")
+
+        motor = MotorScheduling(datos)
+        inicio = time.perf_counter()
+        motor.preparar()
+        tiempos['agrupacion'] = time.perf_counter() - inicio
+        print(f"   ⏱️ agrupación  {tiempos['agrupacion']:8.3f}s ({len(motor.grupos)} grupos)")
+
+        inicio = time.perf_counter()
+        filas = motor.resolver()
+        tiempos['asignacion'] = time.perf_counter() - inicio
+        conflictos, desequilibrio = motor.puntuacion()
+        print(f"   ⏱️ asignación  {tiempos['asignacion']:8.3f}s ({conflictos} conflictos)")
+
+        inicio = time.perf_counter()
+        formato = _guardar(filas, directorio)
+        tiempos['guardado'] = time.perf_counter() - inicio
+        print(f"   ⏱️ guardado    {tiempos['guardado']:8.3f}s ({formato})")
+
+        inicio = time.perf_counter()
+        formatos = _exportar(filas, directorio)
+        if formatos:
+            tiempos['exportacion'] = time.perf_counter() - inicio
+            print(f"   ⏱️ exportación {tiempos['exportacion']:8.3f}s ({', '.join(formatos)})")
+
+        return {
+            'escala': escala,
+            'tamanos': tamanos,
+            'matriculas': sum(len(asignaturas) for asignaturas in datos['alumnos'].values()),
+            'grupos': len(motor.grupos),
+            'conflictos': conflictos,
+            'desequilibrio': desequilibrio,
+            'formato_guardado': formato,
+            'formatos_exportacion': formatos,
+            'generacion_s': round(generacion, 4),
+            'tiempos_s': {etapa: round(valor, 4) for etapa, valor in tiempos.items()},
+            'total_s': round(sum(tiempos.values()), 4),
+            'memoria_pico_mb': _memoria_pico_mb()
+        }
+
+
+def comparar(resultados, ruta_anterior, umbral=1.2):
+    """
+    Comparar con un JSON anterior e informar de las etapas que empeoran más que el umbral
+
+    Returns:
+        list: [(escala, etapa, antes, ahora)] con las regresiones
+    """
+    with open(ruta_anterior, 'r', encoding='utf-8') as f:
+        informe = json.load(f)
+    anterior = {r['escala']: r for r in informe['resultados']}
+    redefinidas = ETAPAS_REDEFINIDAS.get(informe.get('version_formato', 1), set())
+
+    regresiones = []
+    print(f"\n📊 Comparación con {ruta_anterior} (umbral ×{umbral})")
+    for resultado in resultados:
+        previo = anterior.get(resultado['escala'])
+        if previo is None:
+            continue
+        for etapa in ETAPAS:
+            if etapa in redefinidas:
+                continue
+            antes = previo['tiempos_s'].get(etapa)
+            ahora = resultado['tiempos_s'].get(etapa)
+            if not antes or ahora is None:
+                continue
+            ratio = ahora / antes
+            marca = "❌" if ratio > umbral else "✅"
+            print(f"   {marca} {resultado['escala']:>5}× {etapa:12} {antes:8.3f}s → {ahora:8.3f}s (×{ratio:.2f})")
+            if ratio > umbral:
+                regresiones.append((resultado['escala'], etapa, antes, ahora))
+    return regresiones
+
+
+def parsear_argumentos(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark del motor de scheduling de OPTIM")
+    parser.add_argument('--escalas', default='1,10',
+                        help="múltiplos de la facultad de referencia (100 sólo a propósito: tarda minutos)")
+    parser.add_argument('--solapamiento', type=float, default=5.0, help="asignaturas por alumno de media")
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--salida', default=None, help="JSON de resultados (por defecto resultados_benchmark/)")
+    parser.add_argument('--comparar', default=None, help="JSON de una ejecución anterior")
+    parser.add_argument('--umbral', type=float, default=1.2, help="ratio de tiempo a partir del que hay regresión")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parsear_argumentos(argv)
+    escalas = [float(e) if '.' in e else int(e) for e in args.escalas.split(',') if e.strip()]
+
+    print("🏁 BENCHMARK DEL MOTOR DE SCHEDULING")
+    print("=" * 50)
+    resultados = [medir_escala(escala, args.solapamiento, args.semilla) for escala in escalas]
+
+    informe = {
+        'version_formato': VERSION_FORMATO,
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'commit': _commit_actual(),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'procesadores': os.cpu_count(),
+        'referencia': FACULTAD_REFERENCIA,
+        'solapamiento': args.solapamiento,
+        'semilla': args.semilla,
+        'resultados': resultados
+    }
+
+    salida = args.salida
+    if salida is None:
+        os.makedirs('resultados_benchmark', exist_ok=True)
+        salida = os.path.join('resultados_benchmark',
+                              f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(salida, 'w', encoding='utf-8') as f:
+        json.dump(informe, f, indent=2, ensure_ascii=False)
+    print(f"\n💾 Resultados guardados en {salida}")
+
+    if args.comparar:
+        regresiones = comparar(resultados, args.comparar, args.umbral)
+        if regresiones:
+            print(f"\n❌ {len(regresiones)} etapas más lentas que el umbral")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -2,10 +2,29 @@
 """
 Script para crear archivos CSV de ejemplo
 SIN DEPENDENCIAS - solo usa librerías estándar de Python
+
+Sin argumentos crea el ejemplo pequeño de siempre; con --sintetico genera un
+conjunto parametrizable (alumnos, asignaturas, laboratorios, profesores,
+solapamiento de matrículas, semilla) para pruebas de escala:
+
+    python datos_ejemplo.py --sintetico --alumnos 30000 --asignaturas 600 --semilla 1
 """
 
+import argparse
 import csv
 import os
+import random
+
+# Tamaño aproximado de la facultad real (escala 1× del benchmark)
+FACULTAD_REFERENCIA = {
+    'alumnos': 3000,
+    'asignaturas': 60,
+    'laboratorios': 40,
+    'profesores': 80
+}
+
+CAPACIDADES_LAB = [16, 18, 20, 24, 25, 28, 30]
+AREAS = ['Fisica', 'Quimica', 'Electronica', 'Informatica', 'Mecanica', 'Dibujo']
 
 
 def crear_directorio_datos():
@@ -125,6 +144,97 @@ def crear_profesores_csv():
     print("✅ profesores.csv creado (4 profesores)")
 
 
+# ========= GENERADOR SINTÉTICO =========
+
+def _disponibilidad_aleatoria(aleatorio):
+    """Texto tipo '08:00-12:00;15:00-19:00' con uno o dos tramos"""
+    manana = aleatorio.choice(['08:00-12:00', '08:00-14:00', '09:00-13:00', '10:00-14:00'])
+    if aleatorio.random() < 0.6:
+        tarde = aleatorio.choice(['15:00-19:00', '16:00-20:00', '15:00-18:00'])
+        return f"{manana};{tarde}"
+    return manana
+
+
+def generar_datos_sinteticos(directorio='datos_sinteticos', alumnos=3000, asignaturas=60, laboratorios=40,
+                             profesores=80, solapamiento=5.0, semilla=0):
+    """
+    Generar los cuatro CSV con una estructura parecida a la real
+
+    Las asignaturas se agrupan en cursos de 10 y cada laboratorio pertenece a
+    un área; cada alumno se matricula sobre todo en asignaturas de su curso.
+
+    Args:
+        solapamiento (float): asignaturas por alumno de media (más = más grupos con alumnos comunes)
+        semilla (int): semilla del generador (mismos parámetros y semilla → mismos archivos)
+
+    Returns:
+        dict: {'alumnos', 'asignaturas', 'laboratorios', 'profesores'} → ruta del CSV
+    """
+    aleatorio = random.Random(semilla)
+    os.makedirs(directorio, exist_ok=True)
+    rutas = {clave: os.path.join(directorio, f'{clave}.csv')
+             for clave in ('alumnos', 'asignaturas', 'laboratorios', 'profesores')}
+
+    # Laboratorios repartidos por áreas
+    labs_area = {area: [] for area in AREAS}
+    with open(rutas['laboratorios'], 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['nombre', 'capacidad', 'equipamiento', 'disponible', 'edificio', 'planta'])
+        for i in range(laboratorios):
+            area = AREAS[i % len(AREAS)]
+            nombre = f'Lab_{area}_{i + 1:04d}'
+            labs_area[area].append(nombre)
+            writer.writerow([nombre, aleatorio.choice(CAPACIDADES_LAB), f'Equipamiento {area}', 'Si',
+                             f'Edificio {chr(65 + AREAS.index(area))}', f'Planta {i % 4 + 1}'])
+
+    # Asignaturas por cursos de 10, cada una con 1-3 laboratorios de su área
+    nombres_asignaturas = []
+    with open(rutas['asignaturas'], 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['asignatura', 'laboratorio', 'equipamiento_requerido', 'duracion_horas', 'semestre'])
+        for i in range(asignaturas):
+            area = AREAS[i % len(AREAS)]
+            nombre = f'Asignatura_{i + 1:04d}'
+            nombres_asignaturas.append(nombre)
+            duracion = aleatorio.choice([2, 2, 2, 3])
+            semestre = (i // 10) % 2 + 1
+            candidatos = labs_area[area] or [lab for labs in labs_area.values() for lab in labs]
+            for lab in aleatorio.sample(candidatos, min(len(candidatos), aleatorio.randint(1, 3))):
+                writer.writerow([nombre, lab, f'Equipamiento {area}', duracion, semestre])
+
+    # Profesores: cada asignatura tiene al menos uno
+    with open(rutas['profesores'], 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['nombre', 'asignatura', 'disponibilidad_lunes', 'disponibilidad_martes',
+                         'disponibilidad_miercoles', 'disponibilidad_jueves', 'disponibilidad_viernes', 'email'])
+        for i in range(max(profesores, 1)):
+            nombre = f'Profesor_{i + 1:05d}'
+            propias = [nombres_asignaturas[j] for j in range(i, asignaturas, max(profesores, 1))]
+            if not propias and nombres_asignaturas:
+                propias = [aleatorio.choice(nombres_asignaturas)]
+            disponibilidad = [_disponibilidad_aleatoria(aleatorio) for _ in range(5)]
+            for asignatura in propias:
+                writer.writerow([nombre, asignatura, *disponibilidad, f'profesor{i + 1}@upm.es'])
+
+    # Alumnos: matrícula concentrada en su curso con algo de mezcla entre cursos
+    cursos = [nombres_asignaturas[i:i + 10] for i in range(0, asignaturas, 10)]
+    with open(rutas['alumnos'], 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['dni', 'nombre', 'apellidos', 'asignatura', 'email'])
+        for i in range(alumnos):
+            dni = f'{i + 10000000:08d}{"TRWAGMYFPDXBNJZSQVHLCKE"[i % 23]}'
+            email = f'alumno{i + 1}@alumnos.upm.es'
+            curso = aleatorio.choice(cursos) if cursos else []
+            num = max(1, min(len(nombres_asignaturas), round(aleatorio.gauss(solapamiento, 1))))
+            propias = set(aleatorio.sample(curso, min(num, len(curso))))
+            while len(propias) < num:
+                propias.add(aleatorio.choice(nombres_asignaturas))
+            for asignatura in sorted(propias):
+                writer.writerow([dni, f'Alumno{i + 1}', 'Sintético', asignatura, email])
+
+    return rutas
+
+
 def mostrar_resumen():
     """Mostrar resumen de archivos creados"""
     print("\n" + "=" * 50)
@@ -153,8 +263,32 @@ def mostrar_resumen():
     print("\n💡 Los archivos están en: ./datos_ejemplo/")
 
 
-def main():
+def parsear_argumentos(argv=None):
+    parser = argparse.ArgumentParser(description="Crear datos de ejemplo o sintéticos para OPTIM")
+    parser.add_argument('--sintetico', action='store_true', help="generar un conjunto sintético parametrizable")
+    parser.add_argument('--directorio', default='datos_sinteticos')
+    parser.add_argument('--alumnos', type=int, default=FACULTAD_REFERENCIA['alumnos'])
+    parser.add_argument('--asignaturas', type=int, default=FACULTAD_REFERENCIA['asignaturas'])
+    parser.add_argument('--laboratorios', type=int, default=FACULTAD_REFERENCIA['laboratorios'])
+    parser.add_argument('--profesores', type=int, default=FACULTAD_REFERENCIA['profesores'])
+    parser.add_argument('--solapamiento', type=float, default=5.0, help="asignaturas por alumno de media")
+    parser.add_argument('--semilla', type=int, default=0)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """Función principal"""
+    args = parsear_argumentos(argv)
+
+    if args.sintetico:
+        print("🔬 GENERANDO DATOS SINTÉTICOS")
+        print("=" * 50)
+        rutas = generar_datos_sinteticos(args.directorio, args.alumnos, args.asignaturas, args.laboratorios,
+                                         args.profesores, args.solapamiento, args.semilla)
+        for clave, ruta in rutas.items():
+            print(f"✅ {clave + '.csv':20} ({os.path.getsize(ruta)} bytes)")
+        return 0
+
     print("🔬 CREANDO DATOS DE EJEMPLO PARA LAB SCHEDULING")
     print("=" * 50)
 
@@ -1,3 +1,4 @@
+import multiprocessing
 import subprocess
 import sys
 import os
@@ -38,6 +39,51 @@ def cargar_interfaces():
 # Cargar interfaces al inicio
 cargar_interfaces()
 
+# ========= MOTOR DE SCHEDULING =========
+try:
+    from modules.scheduling import IndiceCalendario, generar_horarios
+
+    MOTOR_DISPONIBLE = True
+except ImportError as e:
+    print(f"⚠️ Motor de scheduling no disponible: {e}")
+    MOTOR_DISPONIBLE = False
+
+try:
+    from modules.data_sources.calendario import cargar_calendario
+
+    CALENDARIO_DISPONIBLE = True
+except ImportError as e:
+    print(f"⚠️ Calendario académico no disponible: {e}")
+    CALENDARIO_DISPONIBLE = False
+
+
+class HiloProgramacion(QtCore.QThread):
+    """Ejecuta la generación de horarios fuera del hilo de la interfaz"""
+
+    progreso = QtCore.pyqtSignal(int, str)
+    terminado = QtCore.pyqtSignal(object, int, str)
+
+    def __init__(self, parametros, parent=None):
+        super().__init__(parent)
+        self.parametros = parametros
+        self._cancelado = False
+
+    def cancelar(self):
+        """Pedir la cancelación; el motor la atiende en el siguiente paso"""
+        self._cancelado = True
+
+    def esta_cancelado(self):
+        return self._cancelado
+
+    def run(self):
+        try:
+            motor, cod_error, msje_error = generar_horarios(
+                progreso=self.progreso.emit, cancelado=self.esta_cancelado, **self.parametros
+            )
+        except Exception as e:
+            motor, cod_error, msje_error = None, 2, f"Error inesperado: {str(e)}"
+        self.terminado.emit(motor, cod_error, msje_error)
+
 
 class Ui_MainWindow(object):
     def __init__(self):
@@ -47,6 +93,10 @@ class Ui_MainWindow(object):
         self.path_profesores = None
         self.path_restricciones = None
         self._validation_logged = False
+        self.archivo_resultado = "horarios_laboratorios.arrow"  # Columnar; Excel se genera al exportar
+        self.hilo_programacion = None
+        self.motor = None  # Última programación, base de las reprogramaciones incrementales
+        self.ajustes_laboratorios = {}  # Ediciones de laboratorios hechas en ConfigurarHorarios
 
         # Referencias a ventanas de configuración
         self.ventana_calendario = None
@@ -378,33 +428,129 @@ Sistema listo..."""
             self._validation_logged = True
 
     def iniciar_programacion(self):
-        """Iniciar programación"""
-        self.ejecutar.setEnabled(False)
+        """Iniciar programación (o cancelarla si ya está en marcha)"""
+        if self.hilo_programacion is not None and self.hilo_programacion.isRunning():
+            self.cancelar_programacion()
+            return
+
+        if not MOTOR_DISPONIBLE:
+            self.mostrar_mensaje("⚠️ No Disponible", "Motor de scheduling no cargado")
+            return
+
+        parametros = {
+            'path_alumnos': self.path_alumnos,
+            'path_asignaturas': self.path_asignaturas,
+            'path_laboratorios': self.path_laboratorios,
+            'path_profesores': self.path_profesores,
+            'semestre': int(self.combo_semestre.currentText()),
+            'capacidad_maxima': self.spin_capacidad.value(),
+            'grupos_pares': self.check_grupos_pares.isChecked(),
+            'archivo_resultado': self.archivo_resultado,
+            'motor_anterior': self.motor,
+            'ajustes_laboratorios': dict(self.ajustes_laboratorios),
+            'optimizar': self.check_optimizacion.isChecked(),
+            'calendario': self.indice_calendario()
+        }
+
+        self.progress_bar.setValue(0)
         self.progress_bar.setVisible(True)
-        self.log_info("\n🚀 INICIANDO GENERACIÓN DE HORARIOS")
-
-        # Simular proceso
-        import time
-        pasos = [
-            (20, "📂 Cargando archivos..."),
-            (40, "⚖️ Generando grupos equilibrados..."),
-            (60, "🏢 Asignando laboratorios..."),
-            (80, "📅 Resolviendo conflictos..."),
-            (100, "💾 Exportando resultados...")
-        ]
+        self.ejecutar.setText("⏹️ Cancelar")
+        if parametros['optimizar']:
+            self.log_info(f"\n🧪 OPTIMIZACIÓN AVANZADA: búsquedas en paralelo en {os.cpu_count() or 1} núcleos")
+        elif self.motor is not None:
+            self.log_info("\n🔁 REPROGRAMANDO SÓLO LO AFECTADO POR LOS CAMBIOS")
+        else:
+            self.log_info("\n🚀 INICIANDO GENERACIÓN DE HORARIOS")
+
+        if self.ventana_resultados is not None:
+            # Soltar el archivo de resultados para que el motor pueda reemplazarlo
+            self.ventana_resultados.liberar_resultados()
+
+        self.hilo_programacion = HiloProgramacion(parametros, parent=self.main_window)
+        self.hilo_programacion.progreso.connect(self.actualizar_progreso)
+        self.hilo_programacion.terminado.connect(self.programacion_terminada)
+        self.hilo_programacion.start()
+
+    def cancelar_programacion(self):
+        """Cancelar la generación en curso"""
+        self.ejecutar.setEnabled(False)
+        self.ejecutar.setText("⏳ Cancelando...")
+        self.log_info("⏹️ Cancelando generación...")
+        self.hilo_programacion.cancelar()
 
-        for progreso, mensaje in pasos:
-            self.log_info(mensaje)
-            self.progress_bar.setValue(progreso)
-            time.sleep(0.5)
-            QtCore.QCoreApplication.processEvents()
+    def actualizar_progreso(self, porcentaje, mensaje):
+        """Recibir avances del hilo de programación"""
+        self.progress_bar.setValue(porcentaje)
+        self.log_info(mensaje)
 
-        self.log_info("✅ ¡Horarios generados exitosamente!")
+    def programacion_terminada(self, motor, cod_error, msje_error):
+        """Recoger el resultado del hilo de programación"""
         self.progress_bar.setVisible(False)
+        self.ejecutar.setText("🚀 Generar Horarios")
         self.ejecutar.setEnabled(True)
+        self.hilo_programacion = None
+
+        if self.ventana_resultados is not None:
+            # Volver a abrir los resultados (los nuevos o, si falló, los anteriores)
+            if cod_error == 0:
+                self.ventana_resultados.motor = motor
+            self.ventana_resultados.cargar_resultados()
+
+        if cod_error != 0:
+            # Una ejecución interrumpida deja el motor a medias: la próxima será completa
+            self.motor = None
+
+        if cod_error == 3:
+            self.log_info(f"⏹️ {msje_error}")
+            return
+
+        if cod_error != 0:
+            self.log_info(f"❌ {msje_error}")
+            self.mostrar_mensaje("❌ Error", msje_error)
+            return
+
+        self.motor = motor
+        stats = motor.estadisticas
+        self.log_info(f"✅ ¡Horarios generados exitosamente en {stats['tiempo_ejecucion']}! "
+                      f"({stats['grupos_asignados']}/{stats['total_grupos']} grupos asignados)")
+
+        if 'cambios' in stats:
+            self.log_info(f"🔁 {stats['grupos_recalculados']} grupos recalculados · {stats['cambios']} cambios")
+            for nombre, antes, despues in motor.cambios[:20]:
+                self.log_info(f"   {nombre}: {self.describir_fila(antes)} → {self.describir_fila(despues)}")
+            if len(motor.cambios) > 20:
+                self.log_info(f"   ... y {len(motor.cambios) - 20} cambios más")
+
+    @staticmethod
+    def describir_fila(fila):
+        """Resumen de una fila de resultado para el log de cambios"""
+        if fila is None:
+            return "(no existe)"
+        if fila['Estado'] != 'Asignado':
+            return "⚠️ sin asignar"
+        return f"{fila['Laboratorio']} {fila['Dia']} {fila['Hora_Inicio']}-{fila['Hora_Fin']}"
+
+    def laboratorio_modificado(self, nombre, datos):
+        """Recoger una edición de laboratorio y reprogramar sólo lo afectado"""
+        self.ajustes_laboratorios[nombre] = {'capacidad': datos['capacidad']} if datos is not None else None
+        # Sin programación previa (o con una en marcha) el ajuste se aplica en la siguiente
+        if self.motor is None:
+            return
+        if self.hilo_programacion is not None and self.hilo_programacion.isRunning():
+            return
+
+        self.log_info(f"🏢 Laboratorio '{nombre}' modificado")
+        self.iniciar_programacion()
 
     # ========= MÉTODOS DE INTERFACES (✅ CORREGIDOS) =========
 
+    def indice_calendario(self):
+        """Índice del calendario configurado (sin la ventana abierta, el último guardado; None si no hay)"""
+        if self.ventana_calendario is not None:
+            return IndiceCalendario.desde_datos(self.ventana_calendario.datos_calendario)
+        datos = cargar_calendario() if CALENDARIO_DISPONIBLE else None
+        return IndiceCalendario.desde_datos(datos) if datos else None
+
     def abrir_configurar_calendario(self):
         """Abrir configuración calendario"""
         if not INTERFACES_DISPONIBLES:
@@ -432,6 +578,7 @@ Sistema listo..."""
             if self.ventana_horarios is None:
                 # ✅ SOLUCIÓN: Pasar self.main_window en lugar de self
                 self.ventana_horarios = ConfigurarHorarios(parent=self.main_window)
+                self.ventana_horarios.laboratorio_modificado.connect(self.laboratorio_modificado)
             self.ventana_horarios.show()
             self.ventana_horarios.raise_()
             self.ventana_horarios.activateWindow()
@@ -448,7 +595,8 @@ Sistema listo..."""
         try:
             if self.ventana_resultados is None:
                 # ✅ SOLUCIÓN: Pasar self.main_window en lugar de self
-                self.ventana_resultados = VerResultados(parent=self.main_window)
+                self.ventana_resultados = VerResultados(parent=self.main_window,
+                                                        archivo_resultado=self.archivo_resultado, motor=self.motor)
             self.ventana_resultados.show()
             self.ventana_resultados.raise_()
             self.ventana_resultados.activateWindow()
@@ -499,6 +647,9 @@ Desarrollado para ETSIDI (2024)"""
             QtWidgets.QMessageBox.StandardButton.Yes | QtWidgets.QMessageBox.StandardButton.No
         )
         if reply == QtWidgets.QMessageBox.StandardButton.Yes:
+            if self.hilo_programacion is not None and self.hilo_programacion.isRunning():
+                self.hilo_programacion.cancelar()
+                self.hilo_programacion.wait()
             QtWidgets.QApplication.quit()
 
     def apply_dark_theme_tfg(self):
@@ -558,6 +709,9 @@ Desarrollado para ETSIDI (2024)"""
 
 
 if __name__ == "__main__":
+    # Los procesos de la optimización avanzada arrancan desde este módulo en Windows
+    multiprocessing.freeze_support()
+
     app = QtWidgets.QApplication(sys.argv)
     app.setApplicationName("OPTIM by SoftVier - ETSIDI")
     app.setStyle('Fusion')
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Carga en streaming del archivo de alumnos (una fila por par dni-asignatura)
+Lee el CSV/Excel por bloques y construye índices compactos alumno ↔ asignatura
+sin materializar el archivo completo en memoria
+"""
+
+import csv
+import os
+import sys
+from array import array
+from collections.abc import Mapping
+
+TAM_BLOQUE = 10000
+COLUMNAS = ('dni', 'asignatura', 'email')
+
+
+class IndiceAlumnos(Mapping):
+    """
+    Matrículas internadas en índices compactos
+
+    Se comporta como un diccionario {dni: [asignaturas]} de sólo lectura, que
+    es lo que esperan el motor y el particionador de grupos.
+    """
+
+    def __init__(self):
+        self.dnis = []  # id_alumno → dni
+        self.emails = []  # id_alumno → email
+        self.asignaturas = []  # id_asignatura → nombre
+        self.asignaturas_alumno = []  # id_alumno → array('H') de id_asignatura
+        self.alumnos_asignatura = []  # id_asignatura → array('I') de id_alumno
+        self._id_alumno = {}
+        self._id_asignatura = {}
+        self.filas_leidas = 0
+
+    # ========= CONSTRUCCIÓN =========
+
+    def agregar(self, dni, asignatura, email=''):
+        """Registrar una fila (dni, asignatura, email)"""
+        self.filas_leidas += 1
+
+        id_alumno = self._id_alumno.get(dni)
+        if id_alumno is None:
+            dni = sys.intern(dni)
+            id_alumno = len(self.dnis)
+            self._id_alumno[dni] = id_alumno
+            self.dnis.append(dni)
+            self.emails.append(sys.intern(email) if email else '')
+            self.asignaturas_alumno.append(array('H'))
+
+        id_asignatura = self._id_asignatura.get(asignatura)
+        if id_asignatura is None:
+            asignatura = sys.intern(asignatura)
+            id_asignatura = len(self.asignaturas)
+            self._id_asignatura[asignatura] = id_asignatura
+            self.asignaturas.append(asignatura)
+            self.alumnos_asignatura.append(array('I'))
+
+        propias = self.asignaturas_alumno[id_alumno]
+        if id_asignatura not in propias:
+            propias.append(id_asignatura)
+            self.alumnos_asignatura[id_asignatura].append(id_alumno)
+
+    # ========= CONSULTAS =========
+
+    def __getitem__(self, dni):
+        return [self.asignaturas[i] for i in self.asignaturas_alumno[self._id_alumno[dni]]]
+
+    def __iter__(self):
+        return iter(self.dnis)
+
+    def __len__(self):
+        return len(self.dnis)
+
+    def alumnos_de(self, asignatura):
+        """DNIs matriculados en una asignatura"""
+        id_asignatura = self._id_asignatura.get(asignatura)
+        if id_asignatura is None:
+            return []
+        return [self.dnis[i] for i in self.alumnos_asignatura[id_asignatura]]
+
+    def email_de(self, dni):
+        return self.emails[self._id_alumno[dni]]
+
+    @property
+    def num_matriculas(self):
+        return sum(len(ids) for ids in self.alumnos_asignatura)
+
+    # ========= SERIALIZACIÓN COMPACTA =========
+
+    def __getstate__(self):
+        """Textos unidos en una cadena y listas de arrays aplanadas (array + desplazamientos)"""
+        return {
+            'dnis': '\0'.join(self.dnis),
+            'emails': '\0'.join(self.emails),
+            'asignaturas': self.asignaturas,
+            'asignaturas_alumno': _aplanar(self.asignaturas_alumno, 'H'),
+            'alumnos_asignatura': _aplanar(self.alumnos_asignatura, 'I'),
+            'filas_leidas': self.filas_leidas
+        }
+
+    def __setstate__(self, estado):
+        self.dnis = estado['dnis'].split('\0') if estado['dnis'] else []
+        self.emails = estado['emails'].split('\0') if self.dnis else []
+        self.asignaturas = [sys.intern(a) for a in estado['asignaturas']]
+        self.asignaturas_alumno = _desaplanar(*estado['asignaturas_alumno'])
+        self.alumnos_asignatura = _desaplanar(*estado['alumnos_asignatura'])
+        self._id_alumno = dict(zip(self.dnis, range(len(self.dnis))))
+        self._id_asignatura = {a: i for i, a in enumerate(self.asignaturas)}
+        self.filas_leidas = estado['filas_leidas']
+
+
+def _aplanar(listas, tipo):
+    """[array, ...] → (array con todo, array de desplazamientos)"""
+    plano = array(tipo)
+    desplazamientos = array('I', [0])
+    for lista in listas:
+        plano.extend(lista)
+        desplazamientos.append(len(plano))
+    return plano, desplazamientos
+
+
+def _desaplanar(plano, desplazamientos):
+    return [plano[inicio:fin] for inicio, fin in zip(desplazamientos, desplazamientos[1:])]
+
+
+# ========= LECTURA POR BLOQUES =========
+
+def _posiciones(cabecera):
+    """Posición de cada columna útil en la cabecera (normalizada)"""
+    normalizada = [str(c).strip().lower() if c is not None else '' for c in cabecera]
+    return [normalizada.index(c) if c in normalizada else None for c in COLUMNAS]
+
+
+def _extraer(fila, posiciones):
+    """Tupla (dni, asignatura, email) de una fila cruda"""
+    valores = []
+    for pos in posiciones:
+        valor = fila[pos] if pos is not None and pos < len(fila) else None
+        valores.append(str(valor).strip() if valor is not None else '')
+    return tuple(valores)
+
+
+def _filas_csv(ruta):
+    with open(ruta, 'r', encoding='utf-8-sig', newline='') as f:
+        lector = csv.reader(f)
+        cabecera = next(lector, None)
+        if cabecera is None:
+            return
+        posiciones = _posiciones(cabecera)
+        for fila in lector:
+            if fila:
+                yield _extraer(fila, posiciones)
+
+
+def _filas_excel(ruta):
+    if ruta.lower().endswith('.xls'):
+        # xlrd no permite lectura incremental: se lee entero como último recurso
+        import pandas as pd
+        tabla = pd.read_excel(ruta, dtype=str).fillna('')
+        posiciones = _posiciones(tabla.columns)
+        for fila in tabla.itertuples(index=False):
+            yield _extraer(fila, posiciones)
+        return
+
+    from openpyxl import load_workbook
+    libro = load_workbook(ruta, read_only=True, data_only=True)
+    try:
+        filas = libro.active.iter_rows(values_only=True)
+        cabecera = next(filas, None)
+        if cabecera is None:
+            return
+        posiciones = _posiciones(cabecera)
+        for fila in filas:
+            if fila and any(v is not None for v in fila):
+                yield _extraer(fila, posiciones)
+    finally:
+        libro.close()
+
+
+def iterar_filas(ruta):
+    """Generador de tuplas (dni, asignatura, email) del archivo de alumnos"""
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension in ('.xlsx', '.xlsm', '.xls'):
+        return _filas_excel(ruta)
+    return _filas_csv(ruta)
+
+
+def leer_en_bloques(ruta, tam_bloque=TAM_BLOQUE):
+    """Generador de listas de hasta tam_bloque filas"""
+    bloque = []
+    for fila in iterar_filas(ruta):
+        bloque.append(fila)
+        if len(bloque) >= tam_bloque:
+            yield bloque
+            bloque = []
+    if bloque:
+        yield bloque
+
+
+def cargar_indice_alumnos(ruta, tam_bloque=TAM_BLOQUE, progreso=None, cancelado=None):
+    """
+    Construir el IndiceAlumnos leyendo el archivo por bloques
+
+    Args:
+        progreso (callable): progreso(filas_leidas) tras cada bloque
+        cancelado (callable): si devuelve True se deja de leer y se devuelve None
+
+    Returns:
+        IndiceAlumnos
+    """
+    indice = IndiceAlumnos()
+    for bloque in leer_en_bloques(ruta, tam_bloque):
+        if cancelado is not None and cancelado():
+            return None
+        for dni, asignatura, email in bloque:
+            if dni and asignatura:
+                indice.agregar(dni, asignatura, email)
+        if progreso is not None:
+            progreso(indice.filas_leidas)
+    return indice
@@ -2,21 +2,426 @@
 """
 Módulo para obtener datos de calendario académico desde web ETSIDI
 Navega automáticamente y extrae días lectivos de ambos semestres
+El último PDF y lo extraído de él se guardan en caché: mientras el servidor
+responda que el PDF no ha cambiado, no se abre el navegador ni se reprocesa
 """
 
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
 import re
+import tempfile
 import time
-from datetime import datetime
-from RPA.Browser.Selenium import Selenium
-from RPA.HTTP import HTTP
+import urllib.error
+import urllib.request
+from datetime import date, datetime, timedelta
+from html.parser import HTMLParser
+from urllib.parse import urljoin
 import fitz  # PyMuPDF para procesar PDFs
 
+from modules.utils.franjas import CLAVES_DIAS
+
+DIRECTORIO_CACHE_CALENDARIO = "cache/calendario"
+
+# Calendario en uso: lo escribe la ventana de configuración y lo lee el motor
+RUTA_CALENDARIO = "config/calendario_vigente.json"
+
+# Subir al cambiar la extracción: los datos guardados se recalculan desde el PDF en caché
+VERSION_EXTRACCION = 2
+
+# Pasado este tiempo se vuelve a buscar el enlace en la página (puede apuntar a otro PDF)
+VIGENCIA_ENLACE = 7 * 24 * 3600
+
+TIMEOUT_DESCARGA = 30
+
+# Esperas del navegador (segundos): carga de la página y redirección tras un clic
+TIMEOUT_CARGA = 15
+TIMEOUT_REDIRECCION = 5
+
+# Cabecera de las tablas de semanas: sólo se extrae el texto de las páginas donde aparece
+TEXTO_CABECERA_TABLA = 'L M X J V'
+
+# Tokens de las tablas: cabecera de la semana y días (con * si tienen horario especial)
+CABECERA_SEMANA = ('L', 'M', 'X', 'J', 'V')
+PATRON_DIA = re.compile(r'(\d{1,2})(\*?)')
+
+# (año del curso, mes) desde el que se resuelven las fechas de cada semestre
+INICIO_SEMESTRES = {'semestre_1': (0, 8), 'semestre_2': (1, 1)}
+
+ERROR_TABLAS_CALENDARIO = "No se reconocieron en el PDF las tablas de semanas de los dos semestres"
+
+# A partir de estas páginas se reparte la extracción entre procesos
+PAGINAS_PARA_PARALELO = 8
+
+# Textos del enlace al PDF, en orden de preferencia
+ENLACES_CALENDARIO = [
+    "Calendario Títulos de Grado",
+    "Calendario Grado",
+    "Titulos de Grado",
+    "Calendario"
+]
+
+
+def hash_contenido(contenido):
+    return hashlib.blake2b(contenido, digest_size=20).hexdigest()
+
+
+def descargar(url, etag=None, last_modified=None, timeout=TIMEOUT_DESCARGA):
+    """
+    GET condicional con los validadores de la descarga anterior
+
+    Returns:
+        tuple: (contenido o None si el servidor responde 304, etag, last_modified)
+    """
+    cabeceras = {'User-Agent': 'Mozilla/5.0 (OPTIM)'}
+    if etag:
+        cabeceras['If-None-Match'] = etag
+    if last_modified:
+        cabeceras['If-Modified-Since'] = last_modified
+
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, headers=cabeceras), timeout=timeout) as respuesta:
+            return respuesta.read(), respuesta.headers.get('ETag'), respuesta.headers.get('Last-Modified')
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return None, etag, last_modified
+        raise
+
+
+class _RedireccionHead(urllib.request.HTTPRedirectHandler):
+    """urllib repite como GET la petición redirigida: un HEAD debe seguir siendo HEAD"""
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        nueva = super().redirect_request(req, fp, code, msg, headers, newurl)
+        if nueva is not None and req.get_method() == 'HEAD':
+            nueva.method = 'HEAD'
+        return nueva
+
+
+# Sin esto, comprobar adónde lleva un enlace descargaría el PDF entero
+_abrir_head = urllib.request.build_opener(_RedireccionHead).open
+
+
+class _EnlacesHTML(HTMLParser):
+    """Recoge (texto, href) de cada <a> de la página"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.enlaces = []
+        self._actual = None
+
+    def handle_starttag(self, etiqueta, atributos):
+        if etiqueta == 'a':
+            self._actual = [dict(atributos).get('href'), []]
+
+    def handle_data(self, datos):
+        if self._actual is not None:
+            self._actual[1].append(datos)
+
+    def handle_endtag(self, etiqueta):
+        if etiqueta == 'a' and self._actual is not None:
+            href, textos = self._actual
+            if href:
+                self.enlaces.append((' '.join(''.join(textos).split()), href))
+            self._actual = None
+
+
+# ========= TABLAS DE SEMANAS =========
+
+def tokenizar_tablas(texto):
+    """
+    Recorrer una vez los tokens del texto y devolver las tablas L M X J V
+
+    Una tabla empieza con la cabecera y sigue mientras los tokens sean días;
+    los días se agrupan en filas de cinco (una semana). Da igual que el PDF
+    ponga cada celda en su línea o la fila entera en una.
+
+    Returns:
+        list: tablas como listas de filas [(día, especial)] × 5
+    """
+    tablas = []
+    tabla = None
+    fila = []
+    en_cabecera = 0  # tokens de la cabecera ya reconocidos
+
+    for token in re.finditer(r'\S+', texto):
+        valor = token.group()
+        if tabla is not None:
+            dia = PATRON_DIA.fullmatch(valor)
+            if dia:
+                fila.append((int(dia.group(1)), bool(dia.group(2))))
+                if len(fila) == len(CABECERA_SEMANA):
+                    tabla.append(fila)
+                    fila = []
+                continue
+            # Fin de la tabla (una fila incompleta se descarta)
+            if tabla:
+                tablas.append(tabla)
+            tabla = None
+            fila = []
+
+        if valor == CABECERA_SEMANA[en_cabecera]:
+            en_cabecera += 1
+            if en_cabecera == len(CABECERA_SEMANA):
+                tabla = []
+                en_cabecera = 0
+        else:
+            en_cabecera = 1 if valor == CABECERA_SEMANA[0] else 0
+
+    if tabla:
+        tablas.append(tabla)
+    return tablas
+
+
+def _siguiente_fecha(desde, dia, dia_semana, meses=3):
+    """Primera fecha >= desde con ese número de día que cae en ese día de la semana"""
+    anio, mes = desde.year, desde.month
+    for _ in range(meses):
+        try:
+            fecha = date(anio, mes, dia)
+        except ValueError:
+            fecha = None
+        if fecha is not None and fecha >= desde and fecha.weekday() == dia_semana:
+            return fecha
+        anio, mes = (anio + 1, 1) if mes == 12 else (anio, mes + 1)
+    return None
+
+
+def resolver_fechas(filas, anio, mes):
+    """
+    Convertir los números de día de una tabla en fechas reales
+
+    Cada celda avanza desde la anterior hasta el primer mes en que ese número
+    cae en el día de la semana de su columna: así se resuelven los cambios de
+    mes (30 31 1 2 3) y los saltos de vacaciones sin ambigüedad.
+
+    Returns:
+        list: [(date, especial, columna)] en orden cronológico
+    """
+    desde = date(anio, mes, 1)
+    fechas = []
+    for fila in filas:
+        for columna, (dia, especial) in enumerate(fila):
+            fecha = _siguiente_fecha(desde, dia, columna)
+            if fecha is None:
+                print(f"⚠️ Día {dia} sin fecha válida en la columna {CABECERA_SEMANA[columna]}")
+                continue
+            fechas.append((fecha, especial, columna))
+            desde = fecha + timedelta(days=1)
+    return fechas
+
+
+def fechas_lectivas(datos):
+    """{semestre: set de date} a partir de datos_calendario (consultas O(1))"""
+    return {
+        semestre: {date.fromisoformat(f) for fechas in por_dia.values() for f in fechas}
+        for semestre, por_dia in datos.get('fechas', {}).items()
+    }
+
+
+def dias_especiales_por_fecha(datos):
+    """{date: configuración} de los días especiales con fecha completa"""
+    especiales = {}
+    for clave, configuracion in datos.get('dias_especiales', {}).items():
+        try:
+            especiales[date.fromisoformat(clave)] = configuracion
+        except ValueError:
+            pass  # Claves antiguas tipo '30*' (sin mes ni año)
+    return especiales
+
+
+def _texto_paginas(pdf, inicio, fin):
+    """
+    Texto de las páginas [inicio, fin) que contienen tablas de semanas
+
+    Cada página se comprueba con search_for (sólo localiza la cabecera, sin
+    componer el texto) y get_text se ejecuta únicamente en las que la tienen y
+    en la primera, que lleva el curso académico. Cada proceso abre su propia
+    copia del documento: PyMuPDF no es thread-safe.
+
+    Returns:
+        list: [(número de página, texto)]
+    """
+    paginas = []
+    with fitz.open(stream=pdf, filetype='pdf') as doc:
+        for numero in range(inicio, min(fin, doc.page_count)):
+            pagina = doc[numero]
+            if numero == 0 or pagina.search_for(TEXTO_CABECERA_TABLA):
+                paginas.append((numero, pagina.get_text()))
+    return paginas
+
+
+def extraer_texto_pdf(pdf, procesos=None):
+    """
+    Texto de la primera página y de las que tienen tablas de semanas, en orden
+
+    Con pocas páginas se extrae en el propio proceso (arrancar un pool cuesta
+    más que leerlas); con más, se reparten por rangos entre procesos.
+    """
+    with fitz.open(stream=pdf, filetype='pdf') as doc:
+        num_paginas = doc.page_count
+
+    procesos = min(procesos or os.cpu_count() or 1, num_paginas)
+    if num_paginas < PAGINAS_PARA_PARALELO or procesos <= 1:
+        paginas = _texto_paginas(pdf, 0, num_paginas)
+    else:
+        tramo = -(-num_paginas // procesos)
+        with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+            futuros = [ejecutor.submit(_texto_paginas, pdf, inicio, inicio + tramo)
+                       for inicio in range(0, num_paginas, tramo)]
+            paginas = [pagina for futuro in futuros for pagina in futuro.result()]
+
+    return ''.join(texto for _, texto in sorted(paginas))
+
+
+def leer_pagina(url, timeout=TIMEOUT_DESCARGA):
+    """Descargar una página HTML y decodificarla con el charset que anuncie"""
+    peticion = urllib.request.Request(url, headers={'User-Agent': 'Mozilla/5.0 (OPTIM)'})
+    with urllib.request.urlopen(peticion, timeout=timeout) as respuesta:
+        charset = respuesta.headers.get_content_charset() or 'utf-8'
+        return respuesta.read().decode(charset, errors='replace'), respuesta.geturl()
+
+
+def buscar_enlaces_calendario(html, url_base, textos=ENLACES_CALENDARIO):
+    """
+    URLs absolutas de los <a> cuyo texto contiene alguno de los textos buscados
+
+    Returns:
+        list: [(url, es_pdf)] en el orden de preferencia de los textos
+    """
+    lector = _EnlacesHTML()
+    lector.feed(html)
+    lector.close()
+
+    candidatos = []
+    for texto in textos:
+        for texto_enlace, href in lector.enlaces:
+            if texto in texto_enlace:
+                url = urljoin(url_base, href)
+                if all(url != previo for previo, _ in candidatos):
+                    candidatos.append((url, '.pdf' in url.lower()))
+    return candidatos
+
+
+class CacheCalendario:
+    """
+    Último calendario obtenido para cada URL de página
+
+    Guarda el enlace al PDF, sus validadores HTTP (ETag/Last-Modified), el hash
+    del contenido, los datos extraídos y el propio PDF (para reextraer sin red
+    si cambia VERSION_EXTRACCION).
+    """
+
+    def __init__(self, directorio=DIRECTORIO_CACHE_CALENDARIO):
+        self.directorio = directorio
+        self._ruta_indice = os.path.join(directorio, 'calendario.json')
+
+    def _leer(self):
+        try:
+            with open(self._ruta_indice, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def entrada(self, url_pagina):
+        return self._leer().get(url_pagina)
+
+    def ultimo(self):
+        """Datos del calendario comprobado más recientemente (None si no hay ninguno vigente)"""
+        entradas = [e for e in self._leer().values() if e.get('version') == VERSION_EXTRACCION]
+        if not entradas:
+            return None
+        return max(entradas, key=lambda e: e.get('enlace_comprobado', 0))['datos']
+
+    def pdf(self, hash_pdf):
+        try:
+            with open(os.path.join(self.directorio, f"{hash_pdf}.pdf"), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def guardar(self, url_pagina, entrada, contenido=None):
+        """Escritura atómica del índice; el PDF anterior de esa página se borra"""
+        try:
+            os.makedirs(self.directorio, exist_ok=True)
+            indice = self._leer()
+            anterior = indice.get(url_pagina)
+            if contenido is not None:
+                with open(os.path.join(self.directorio, f"{entrada['hash']}.pdf"), 'wb') as f:
+                    f.write(contenido)
+            indice[url_pagina] = entrada
+
+            descriptor, temporal = tempfile.mkstemp(dir=self.directorio, suffix='.tmp')
+            with os.fdopen(descriptor, 'w', encoding='utf-8') as f:
+                json.dump(indice, f, indent=1, ensure_ascii=False)
+            os.replace(temporal, self._ruta_indice)
+        except OSError as e:
+            print(f"⚠️ No se pudo guardar la caché del calendario: {e}")
+            return
+
+        if anterior and anterior.get('hash') != entrada['hash'] and \
+                all(e.get('hash') != anterior['hash'] for e in indice.values()):
+            try:
+                os.remove(os.path.join(self.directorio, f"{anterior['hash']}.pdf"))
+            except OSError:
+                pass
+
+    def limpiar(self):
+        if not os.path.isdir(self.directorio):
+            return
+        for archivo in os.listdir(self.directorio):
+            if archivo.endswith(('.pdf', '.json', '.tmp')):
+                try:
+                    os.remove(os.path.join(self.directorio, archivo))
+                except OSError:
+                    pass
+
+
+# ========= CALENDARIO VIGENTE =========
+
+def guardar_calendario(datos, ruta=RUTA_CALENDARIO):
+    """Guardar el calendario en uso (escritura atómica)"""
+    directorio = os.path.dirname(ruta) or '.'
+    os.makedirs(directorio, exist_ok=True)
+    descriptor, temporal = tempfile.mkstemp(dir=directorio, suffix='.tmp')
+    with os.fdopen(descriptor, 'w', encoding='utf-8') as f:
+        json.dump(datos, f, indent=2, ensure_ascii=False)
+    os.replace(temporal, ruta)
+
+
+def cargar_calendario(ruta=RUTA_CALENDARIO, directorio_cache=DIRECTORIO_CACHE_CALENDARIO):
+    """
+    Calendario en uso: el guardado por la ventana o, si no hay, el último obtenido de la web
+
+    Returns:
+        dict: datos_calendario, o None si no hay ninguno
+    """
+    try:
+        with open(ruta, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return CacheCalendario(directorio_cache).ultimo()
+
 
 class CalendarioScraper:
-    def __init__(self, headless=True):
-        self.browser = Selenium()
-        self.http = HTTP()
+    def __init__(self, headless=True, usar_cache=True, directorio_cache=DIRECTORIO_CACHE_CALENDARIO,
+                 timeout_carga=TIMEOUT_CARGA, timeout_redireccion=TIMEOUT_REDIRECCION):
+        self._browser = None
         self.headless = headless
+        self.timeout_carga = timeout_carga
+        self.timeout_redireccion = timeout_redireccion
+        self.tiempos_espera = []  # [{'espera', 'segundos', 'cumplida'}] de la última navegación
+        self.cache = CacheCalendario(directorio_cache) if usar_cache else None
+        self._validadores = (None, None)  # (ETag, Last-Modified) de la última descarga
+
+    @property
+    def browser(self):
+        """Selenium sólo se importa y crea si hace falta navegar"""
+        if self._browser is None:
+            from RPA.Browser.Selenium import Selenium
+            self._browser = Selenium()
+        return self._browser
 
     def obtener_calendario_desde_web(self, url_calendario):
         """
@@ -29,23 +434,36 @@ class CalendarioScraper:
             tuple: (datos_calendario, cod_error, msje_error)
         """
         try:
-            # Abrir navegador y navegar a la página
-            cod_error, msje_error = self._abrir_web(url_calendario)
-            if cod_error != 0:
-                return None, cod_error, msje_error
+            if self.cache is not None:
+                resultado = self._obtener_desde_cache(url_calendario)
+                if resultado is not None:
+                    return resultado
+
+            # Camino rápido: la página por HTTP y el enlace con un parser HTML
+            enlace_pdf = self._buscar_enlace_http(url_calendario)
 
-            # Buscar y hacer clic en "Calendario Títulos de Grado"
-            enlace_pdf = self._buscar_enlace_calendario()
             if not enlace_pdf:
-                return None, 2, "No se encontró el enlace 'Calendario Títulos de Grado'"
+                # Abrir navegador y navegar a la página
+                cod_error, msje_error = self._abrir_web(url_calendario)
+                if cod_error != 0:
+                    return None, cod_error, msje_error
+
+                # Buscar y hacer clic en "Calendario Títulos de Grado"
+                enlace_pdf = self._buscar_enlace_calendario()
+                if not enlace_pdf:
+                    return None, 2, "No se encontró el enlace 'Calendario Títulos de Grado'"
 
             # Descargar y procesar PDF
-            contenido_calendario = self._descargar_y_procesar_pdf(enlace_pdf)
+            pdf = self._descargar_pdf(enlace_pdf)
+            contenido_calendario = self._procesar_pdf(pdf) if pdf else None
             if not contenido_calendario:
                 return None, 2, "Error procesando el PDF del calendario"
 
             # Extraer datos de los semestres
             datos_extraidos = self._extraer_datos_semestres(contenido_calendario)
+            if datos_extraidos is None:
+                return None, 2, ERROR_TABLAS_CALENDARIO
+            self._guardar_en_cache(url_calendario, enlace_pdf, pdf, datos_extraidos)
 
             return datos_extraidos, 0, "Calendario obtenido correctamente desde web"
 
@@ -55,11 +473,128 @@ class CalendarioScraper:
         finally:
             self._cerrar_navegador()
 
+    # ========= CACHÉ =========
+
+    def _obtener_desde_cache(self, url_calendario):
+        """
+        Resolver la petición con la caché si el PDF no ha cambiado
+
+        Returns:
+            tuple: (datos, 0, mensaje), (None, 2, mensaje) si el PDF nuevo no se entiende,
+                o None si hace falta el navegador
+        """
+        entrada = self.cache.entrada(url_calendario)
+        if entrada is None or time.time() - entrada.get('enlace_comprobado', 0) > VIGENCIA_ENLACE:
+            return None
+
+        try:
+            pdf, etag, last_modified = descargar(entrada['enlace_pdf'], entrada.get('etag'),
+                                                 entrada.get('last_modified'))
+        except (OSError, urllib.error.URLError) as e:
+            # Sin conexión: mejor el último calendario conocido que nada
+            if entrada.get('version') == VERSION_EXTRACCION:
+                return entrada['datos'], 0, f"Calendario recuperado de la caché (sin conexión: {e})"
+            return None
+
+        self._validadores = (etag, last_modified)
+        sin_cambios = pdf is None or hash_contenido(pdf) == entrada['hash']
+        if sin_cambios and entrada.get('version') == VERSION_EXTRACCION:
+            entrada['etag'], entrada['last_modified'] = etag, last_modified
+            self.cache.guardar(url_calendario, entrada)
+            return entrada['datos'], 0, "Calendario sin cambios (recuperado de la caché)"
+
+        if pdf is None:
+            # 304 pero con otra versión de la extracción: se reprocesa el PDF guardado
+            pdf = self.cache.pdf(entrada['hash'])
+            if pdf is None:
+                return None
+
+        texto = self._procesar_pdf(pdf)
+        if not texto:
+            return None
+        datos = self._extraer_datos_semestres(texto)
+        if datos is None:
+            return None, 2, ERROR_TABLAS_CALENDARIO
+        self._guardar_en_cache(url_calendario, entrada['enlace_pdf'], pdf, datos,
+                               enlace_comprobado=entrada['enlace_comprobado'])
+        return datos, 0, "Calendario actualizado (el PDF ha cambiado)"
+
+    def _guardar_en_cache(self, url_calendario, enlace_pdf, pdf, datos, enlace_comprobado=None):
+        if self.cache is None:
+            return
+        etag, last_modified = self._validadores
+        self.cache.guardar(url_calendario, {
+            'enlace_pdf': enlace_pdf,
+            'enlace_comprobado': enlace_comprobado or time.time(),
+            'etag': etag,
+            'last_modified': last_modified,
+            'hash': hash_contenido(pdf),
+            'version': VERSION_EXTRACCION,
+            'datos': datos
+        }, pdf)
+
+    # ========= NAVEGACIÓN =========
+
+    def _buscar_enlace_http(self, url):
+        """
+        Enlace al PDF sin navegador (None si hace falta Selenium)
+
+        Los enlaces que no apuntan a un .pdf se siguen como haría el clic: vale
+        si la redirección acaba en un PDF.
+        """
+        try:
+            html, url_final = leer_pagina(url)
+        except (OSError, urllib.error.URLError, ValueError) as e:
+            print(f"⚠️ Página no accesible por HTTP ({e}): se usará el navegador")
+            return None
+
+        for enlace, es_pdf in buscar_enlaces_calendario(html, url_final):
+            if es_pdf:
+                return enlace
+            try:
+                peticion = urllib.request.Request(enlace, method='HEAD', headers={'User-Agent': 'Mozilla/5.0 (OPTIM)'})
+                with _abrir_head(peticion, timeout=TIMEOUT_DESCARGA) as respuesta:
+                    destino = respuesta.geturl()
+                    if '.pdf' in destino.lower() or respuesta.headers.get_content_type() == 'application/pdf':
+                        return destino
+            except (OSError, urllib.error.URLError, ValueError):
+                continue
+        return None
+
+    def _esperar(self, descripcion, espera, timeout):
+        """
+        Ejecutar una espera explícita de Selenium y anotar cuánto tardó
+
+        Returns:
+            bool: True si la condición se cumplió antes del timeout
+        """
+        inicio = time.perf_counter()
+        try:
+            espera(timeout=timeout)
+            cumplida = True
+        except AssertionError:
+            # SeleniumLibrary señala así el timeout de sus esperas
+            cumplida = False
+        segundos = time.perf_counter() - inicio
+        self.tiempos_espera.append({'espera': descripcion, 'segundos': round(segundos, 3), 'cumplida': cumplida})
+        print(f"⏱️ {descripcion}: {segundos:.2f}s{'' if cumplida else ' (timeout)'}")
+        return cumplida
+
+    def _esperar_enlaces(self):
+        """Esperar a que la página tenga alguno de los enlaces candidatos"""
+        condiciones = ' or '.join(f"contains(text(), '{texto}')" for texto in ENLACES_CALENDARIO)
+        return self._esperar("Carga de la página",
+                             lambda timeout: self.browser.wait_until_page_contains_element(
+                                 f"xpath://a[{condiciones}]", timeout=timeout),
+                             self.timeout_carga)
+
     def _abrir_web(self, url):
         """Abrir navegador y navegar a la URL"""
+        self.tiempos_espera = []
         try:
             self.browser.open_available_browser(url, headless=self.headless)
-            time.sleep(2)  # Esperar carga
+            # Se sigue aunque venza: la búsqueda de enlaces informará si no están
+            self._esperar_enlaces()
             return 0, ""
         except Exception as e:
             return 2, f"Error abriendo navegador: {str(e)}"
@@ -68,14 +603,7 @@ class CalendarioScraper:
         """Buscar enlace de 'Calendario Títulos de Grado'"""
         try:
             # Buscar el enlace por texto
-            enlaces_posibles = [
-                "Calendario Títulos de Grado",
-                "Calendario Grado",
-                "Titulos de Grado",
-                "Calendario"
-            ]
-
-            for texto_enlace in enlaces_posibles:
+            for texto_enlace in ENLACES_CALENDARIO:
                 try:
                     # Intentar hacer clic en el enlace
                     elemento = self.browser.find_element(f"xpath://a[contains(text(), '{texto_enlace}')]")
@@ -83,14 +611,23 @@ class CalendarioScraper:
                     if href and '.pdf' in href.lower():
                         return href
 
-                    # Si no tiene href directo, hacer clic y buscar redirect
+                    # Si no tiene href directo, hacer clic y esperar a que cambie la URL
+                    url_anterior = self.browser.get_location()
                     self.browser.click_element(elemento)
-                    time.sleep(3)
+                    self._esperar(f"Redirección de '{texto_enlace}'",
+                                  lambda timeout: self.browser.wait_for_condition(
+                                      f"return window.location.href != {json.dumps(url_anterior)}",
+                                      timeout=timeout),
+                                  self.timeout_redireccion)
 
                     # Verificar si nos redirigió a un PDF
                     url_actual = self.browser.get_location()
                     if '.pdf' in url_actual.lower():
                         return url_actual
+                    if url_actual != url_anterior:
+                        # Otra página: volver para probar el siguiente texto
+                        self.browser.go_back()
+                        self._esperar_enlaces()
 
                 except Exception:
                     continue
@@ -101,20 +638,20 @@ class CalendarioScraper:
             print(f"Error buscando enlace: {str(e)}")
             return None
 
-    def _descargar_y_procesar_pdf(self, url_pdf):
-        """Descargar PDF y extraer texto"""
+    def _descargar_pdf(self, url_pdf):
+        """Descargar el PDF (guardando sus validadores HTTP para la caché)"""
         try:
-            # Descargar PDF
-            archivo_temporal = "temp_calendario.pdf"
-            self.http.download(url=url_pdf, target_file=archivo_temporal, overwrite=True)
-
-            # Procesar PDF con PyMuPDF
-            texto_completo = ""
-            with fitz.open(archivo_temporal) as doc:
-                for pagina in doc:
-                    texto_completo += pagina.get_text()
+            pdf, etag, last_modified = descargar(url_pdf)
+            self._validadores = (etag, last_modified)
+            return pdf
+        except Exception as e:
+            print(f"Error descargando PDF: {str(e)}")
+            return None
 
-            return texto_completo
+    def _procesar_pdf(self, pdf):
+        """Extraer el texto del PDF (desde memoria, sin archivo temporal)"""
+        try:
+            return extraer_texto_pdf(pdf)
 
         except Exception as e:
             print(f"Error procesando PDF: {str(e)}")
@@ -125,67 +662,45 @@ class CalendarioScraper:
         Extraer datos estructurados de ambos semestres del texto del calendario
 
         Returns:
-            dict: Estructura con datos de ambos semestres
+            dict: por semestre y día de la semana, los días como se muestran ('30*')
+                y en 'fechas' sus fechas ISO en paralelo; 'dias_especiales' va por fecha ISO.
+                None si no se reconocen las tablas de los dos semestres
         """
+        curso = self._extraer_curso_academico(texto_calendario)
         datos = {
-            'semestre_1': {'lunes': [], 'martes': [], 'miercoles': [], 'jueves': [], 'viernes': []},
-            'semestre_2': {'lunes': [], 'martes': [], 'miercoles': [], 'jueves': [], 'viernes': []},
+            'semestre_1': {dia: [] for dia in CLAVES_DIAS},
+            'semestre_2': {dia: [] for dia in CLAVES_DIAS},
+            'fechas': {'semestre_1': {dia: [] for dia in CLAVES_DIAS},
+                       'semestre_2': {dia: [] for dia in CLAVES_DIAS}},
             'dias_especiales': {},
-            'curso_academico': self._extraer_curso_academico(texto_calendario)
+            'curso_academico': curso
         }
 
         try:
-            # Buscar patrones de calendarios en formato tabla
-            # Patrón típico: L    M    X    J    V
-            patron_tabla = r'L\s+M\s+X\s+J\s+V\s*\n((?:\d+[*]?\s+\d+[*]?\s+\d+[*]?\s+\d+[*]?\s+\d+[*]?\s*\n?)+)'
-
-            tablas_encontradas = re.findall(patron_tabla, texto_calendario, re.MULTILINE)
-
-            if len(tablas_encontradas) >= 2:
-                # Procesar primer semestre
-                self._procesar_tabla_semestre(tablas_encontradas[0], datos['semestre_1'], datos['dias_especiales'])
-
-                # Procesar segundo semestre
-                self._procesar_tabla_semestre(tablas_encontradas[1], datos['semestre_2'], datos['dias_especiales'])
-            else:
-                # Método alternativo: buscar por meses conocidos
-                datos = self._extraer_por_meses(texto_calendario)
-
+            tablas = tokenizar_tablas(texto_calendario)
+            if len(tablas) < 2:
+                # Sin las tablas no hay forma de saber a qué fecha corresponde cada día
+                print(f"⚠️ Se esperaban las tablas de semanas de los dos semestres y hay {len(tablas)}")
+                return None
+
+            anio = int(curso[:4])
+            for semestre, filas in zip(('semestre_1', 'semestre_2'), tablas):
+                desfase, mes = INICIO_SEMESTRES[semestre]
+                for fecha, especial, columna in resolver_fechas(filas, anio + desfase, mes):
+                    dia = CLAVES_DIAS[columna]
+                    iso = fecha.isoformat()
+                    datos[semestre][dia].append(f"{fecha.day}*" if especial else str(fecha.day))
+                    datos['fechas'][semestre][dia].append(iso)
+                    if especial:
+                        datos['dias_especiales'][iso] = {
+                            'tipo': 'horario_especial',
+                            'descripcion': 'Día especial detectado automáticamente'
+                        }
             return datos
 
         except Exception as e:
             print(f"Error extrayendo datos: {str(e)}")
-            return self._generar_datos_ejemplo()
-
-    def _procesar_tabla_semestre(self, tabla_texto, semestre_data, dias_especiales):
-        """Procesar una tabla de semestre específica"""
-        dias_semana = ['lunes', 'martes', 'miercoles', 'jueves', 'viernes']
-
-        # Dividir en líneas y procesar cada fila
-        lineas = tabla_texto.strip().split('\n')
-
-        for linea in lineas:
-            if not linea.strip():
-                continue
-
-            # Extraer números (con o sin asterisco)
-            numeros = re.findall(r'\d+[*]?', linea)
-
-            if len(numeros) == 5:  # Una fila completa L-M-X-J-V
-                for i, numero in enumerate(numeros):
-                    dia_semana = dias_semana[i]
-
-                    if '*' in numero:
-                        # Día especial
-                        dia_limpio = numero.replace('*', '')
-                        semestre_data[dia_semana].append(numero)  # Mantener el *
-                        dias_especiales[numero] = {
-                            'tipo': 'horario_especial',
-                            'descripcion': 'Día especial detectado automáticamente'
-                        }
-                    else:
-                        # Día normal
-                        semestre_data[dia_semana].append(numero)
+            return None
 
     def _extraer_curso_academico(self, texto):
         """Extraer el curso académico del texto"""
@@ -199,73 +714,34 @@ class CalendarioScraper:
             año_actual = datetime.now().year
             return f"{año_actual}-{año_actual + 1}"
 
-    def _extraer_por_meses(self, texto):
-        """Método alternativo: extraer por meses conocidos"""
-        # Implementación simplificada para casos donde el patrón de tabla no funciona
-        datos = self._generar_datos_ejemplo()
-
-        # Buscar patrones de fechas específicas
-        meses_primer_sem = ['septiembre', 'octubre', 'noviembre', 'diciembre', 'enero']
-        meses_segundo_sem = ['febrero', 'marzo', 'abril', 'mayo', 'junio']
-
-        # Extraer fechas con asterisco (días especiales)
-        fechas_especiales = re.findall(r'(\d{1,2})[*]', texto)
-
-        for fecha in fechas_especiales:
-            datos['dias_especiales'][f"{fecha}*"] = {
-                'tipo': 'horario_especial',
-                'descripcion': 'Día especial'
-            }
-
-        return datos
-
-    def _generar_datos_ejemplo(self):
-        """Generar datos de ejemplo si falla la extracción"""
-        return {
-            'semestre_1': {
-                'lunes': ['16', '23', '30*', '7'],
-                'martes': ['17', '24', '31', '8'],
-                'miercoles': ['18', '25', '1', '9*'],
-                'jueves': ['19', '26', '2', '10'],
-                'viernes': ['20', '27', '3*', '11']
-            },
-            'semestre_2': {
-                'lunes': ['3', '10', '17', '24'],
-                'martes': ['4', '11*', '18', '25'],
-                'miercoles': ['5', '12', '19', '26'],
-                'jueves': ['6', '13', '20', '27'],
-                'viernes': ['7', '14', '21', '28']
-            },
-            'dias_especiales': {
-                '30*': {'tipo': 'horario_martes', 'descripcion': 'Día del Pilar'},
-                '9*': {'tipo': 'horario_viernes', 'descripcion': 'Día especial'},
-                '3*': {'tipo': 'horario_lunes', 'descripcion': 'Día especial'},
-                '11*': {'tipo': 'horario_miercoles', 'descripcion': 'Día especial'}
-            },
-            'curso_academico': f"{datetime.now().year}-{datetime.now().year + 1}"
-        }
-
     def _cerrar_navegador(self):
-        """Cerrar navegador"""
+        """Cerrar navegador (si llegó a abrirse)"""
+        if self._browser is None:
+            return
         try:
-            self.browser.close_browser()
+            self._browser.close_browser()
         except:
             pass
 
 
 # Función principal de fachada
-def obtener_calendario_web(url_calendario, headless=True):
+def obtener_calendario_web(url_calendario, headless=True, usar_cache=True,
+                           timeout_carga=TIMEOUT_CARGA, timeout_redireccion=TIMEOUT_REDIRECCION):
     """
     Función principal para uso externo
 
     Args:
         url_calendario (str): URL del calendario ETSIDI
         headless (bool): Ejecutar navegador en modo headless
+        usar_cache (bool): reutilizar lo extraído si el PDF no ha cambiado
+        timeout_carga (float): espera máxima a que la página muestre los enlaces
+        timeout_redireccion (float): espera máxima a la redirección tras un clic
 
     Returns:
         tuple: (datos_calendario, cod_error, mensaje_error)
     """
-    scraper = CalendarioScraper(headless=headless)
+    scraper = CalendarioScraper(headless=headless, usar_cache=usar_cache, timeout_carga=timeout_carga,
+                                timeout_redireccion=timeout_redireccion)
     return scraper.obtener_calendario_desde_web(url_calendario)
 
 
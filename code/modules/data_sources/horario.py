@@ -0,0 +1,519 @@
+"""
+Almacén SQLite de la configuración de horarios (laboratorios, cursos y asignaciones)
+Sustituye al JSON que ConfigurarHorarios reescribía entero en cada guardado:
+cada registro es una fila, guardar sólo toca las filas cambiadas dentro de una
+transacción y abrir la configuración es una consulta por tabla.
+Varios coordinadores pueden compartir el archivo: cada registro lleva una
+versión (bloqueo optimista) y cada guardado una revisión global, de modo que
+sólo chocan las ediciones del mismo registro y el resto se recoge por diferencias
+"""
+
+import json
+import os
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+
+from modules.data_sources.tablas import leer_tabla
+from modules.utils.franjas import CLAVES_DIAS, DIAS_SEMANA, hora_a_minutos, minutos_a_hora
+from modules.utils.indice_ocupacion import IndiceOcupacion
+
+RUTA_ALMACEN = "config/horarios_sistema.db"
+RUTA_JSON_ANTERIOR = "config/horarios_sistema.json"
+
+# Subir al cambiar el esquema (las tablas se crean con IF NOT EXISTS)
+VERSION_ESQUEMA = 2
+
+# Segundos que un escritor espera a que otro suelte el bloqueo de la base
+TIMEOUT_BLOQUEO = 30
+
+# GetDriveTypeW: DRIVE_REMOVABLE, DRIVE_FIXED, DRIVE_RAMDISK (DRIVE_REMOTE = 4 no entra)
+UNIDADES_LOCALES_WINDOWS = (2, 3, 6)
+SISTEMAS_ARCHIVOS_RED = {'nfs', 'nfs4', 'cifs', 'smb', 'smbfs', 'smb3', 'afs', 'ncpfs', '9p', 'ceph',
+                         'glusterfs', 'lustre', 'davfs', 'sshfs', 'gpfs', 'ocfs2', 'gfs2'}
+
+TABLAS = ('laboratorios', 'cursos', 'asignaciones')
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS laboratorios (
+    nombre TEXT PRIMARY KEY,
+    capacidad INTEGER NOT NULL DEFAULT 0,
+    equipamiento TEXT NOT NULL DEFAULT '',
+    edificio TEXT NOT NULL DEFAULT '',
+    version INTEGER NOT NULL DEFAULT 1,
+    revision INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS cursos (
+    codigo TEXT PRIMARY KEY,
+    descripcion TEXT NOT NULL DEFAULT '',
+    es_doble_grado INTEGER NOT NULL DEFAULT 0,
+    comparte_con TEXT NOT NULL DEFAULT '',
+    version INTEGER NOT NULL DEFAULT 1,
+    revision INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS asignaciones (
+    id TEXT PRIMARY KEY,
+    curso TEXT NOT NULL,
+    laboratorio TEXT NOT NULL,
+    dia TEXT NOT NULL,
+    inicio TEXT NOT NULL,
+    fin TEXT NOT NULL,
+    version INTEGER NOT NULL DEFAULT 1,
+    revision INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS asignaciones_laboratorio_dia ON asignaciones (laboratorio, dia, inicio);
+CREATE INDEX IF NOT EXISTS asignaciones_dia ON asignaciones (dia);
+CREATE INDEX IF NOT EXISTS asignaciones_curso ON asignaciones (curso);
+CREATE TABLE IF NOT EXISTS eliminados (
+    tabla TEXT NOT NULL,
+    clave TEXT NOT NULL,
+    revision INTEGER NOT NULL,
+    PRIMARY KEY (tabla, clave)
+);
+CREATE INDEX IF NOT EXISTS eliminados_revision ON eliminados (revision);
+CREATE TABLE IF NOT EXISTS metadatos (
+    clave TEXT PRIMARY KEY,
+    valor TEXT
+);
+"""
+
+# Tablas creadas con la versión 1 del esquema, sin versión ni revisión por registro
+COLUMNAS_VERSION = (('version', 1), ('revision', 0))
+
+# (tabla, clave primaria, campos) → columnas en el orden del INSERT
+CAMPOS = {
+    'laboratorios': ('nombre', ('capacidad', 'equipamiento', 'edificio')),
+    'cursos': ('codigo', ('descripcion', 'es_doble_grado', 'comparte_con')),
+    'asignaciones': ('id', ('curso', 'laboratorio', 'dia', 'inicio', 'fin'))
+}
+
+DEFECTOS = {'capacidad': 0, 'es_doble_grado': False}
+
+CAMPOS_IMPORTACION = ('curso', 'laboratorio', 'dia', 'inicio', 'fin')
+
+# Cabeceras alternativas (las de ConfigurarHorarios.exportar_horarios, con tilde...)
+ALIAS_COLUMNAS = {'día': 'dia', 'hora_inicio': 'inicio', 'hora_fin': 'fin'}
+
+# 'miercoles', 'miércoles' o 'Miércoles' → 'Miércoles' (el texto del formulario)
+NOMBRES_DIAS = {**{clave: dia for clave, dia in zip(CLAVES_DIAS, DIAS_SEMANA)},
+                **{dia.lower(): dia for dia in DIAS_SEMANA}}
+
+
+def _fila(tabla, clave, datos):
+    _, campos = CAMPOS[tabla]
+    return (clave,) + tuple(datos.get(campo, DEFECTOS.get(campo, '')) for campo in campos)
+
+
+class ConflictoEdicion(Exception):
+    """Otro usuario guardó antes alguno de los registros que se iban a guardar, o una asignación que choca"""
+
+    def __init__(self, conflictos, solapes=()):
+        self.conflictos = conflictos  # [(tabla, clave)]
+        self.solapes = list(solapes)  # [(asignación propia, asignación guardada con la que choca)]
+        mensaje = f"{len(conflictos)} registros modificados por otro usuario"
+        if self.solapes:
+            mensaje += f", {len(self.solapes)} asignaciones solapadas con otras guardadas"
+        super().__init__(mensaje)
+
+
+def _tipo_unidad_windows(ruta):
+    """GetDriveTypeW de la unidad de la ruta (DRIVE_REMOTE para unidades de red mapeadas)"""
+    import ctypes
+
+    unidad = os.path.splitdrive(ruta)[0]
+    return ctypes.windll.kernel32.GetDriveTypeW(unidad + '\\') if unidad else 0
+
+
+def _sistema_archivos_posix(ruta):
+    """Tipo de sistema de archivos del punto de montaje que contiene la ruta (None si no se sabe)"""
+    try:
+        with open('/proc/mounts', 'r', encoding='utf-8') as f:
+            montajes = [linea.split()[1:3] for linea in f if len(linea.split()) >= 3]
+    except OSError:
+        return None  # Sin /proc (p.ej. macOS)
+
+    ruta = os.path.realpath(ruta)
+    mejor, tipo = '', None
+    for punto, sistema in montajes:
+        punto = punto.replace('\\040', ' ')
+        dentro = ruta == punto or ruta.startswith(punto.rstrip('/') + '/')
+        if dentro and len(punto) >= len(mejor):
+            mejor, tipo = punto, sistema
+    return tipo
+
+
+def es_unidad_local(ruta):
+    """
+    True sólo si la ruta está con seguridad en un disco local
+
+    WAL no es seguro en unidades de red; ante la duda (unidad mapeada, ruta
+    UNC, sistema que no se puede identificar) se considera compartida.
+    """
+    ruta = os.path.abspath(ruta)
+    if ruta.startswith('\\\\') or ruta.startswith('//'):
+        return False
+    if os.name == 'nt':
+        return _tipo_unidad_windows(ruta) in UNIDADES_LOCALES_WINDOWS
+    tipo = _sistema_archivos_posix(os.path.dirname(ruta) or '.')
+    return tipo is not None and tipo not in SISTEMAS_ARCHIVOS_RED and not tipo.startswith('fuse.')
+
+
+def leer_asignaciones(ruta):
+    """
+    Leer un archivo de asignaciones para importarlas en bloque
+
+    CSV/Excel con columnas curso, laboratorio, dia, inicio, fin (también las del
+    Excel que exporta ConfigurarHorarios: Día, Hora_Inicio, Hora_Fin); JSON
+    como lista de objetos con esas claves o como el 'asignaciones' del JSON de
+    configuración.
+
+    Returns:
+        list: dicts con las cinco claves (textos sin normalizar)
+    """
+    if os.path.splitext(ruta)[1].lower() == '.json':
+        with open(ruta, 'r', encoding='utf-8') as f:
+            contenido = json.load(f)
+        if isinstance(contenido, dict):
+            contenido = list(contenido.get('asignaciones', contenido).values())
+        filas = [{str(clave).strip().lower(): valor for clave, valor in fila.items()} for fila in contenido]
+    else:
+        filas = leer_tabla(ruta)
+    asignaciones = []
+    for fila in filas:
+        fila = {ALIAS_COLUMNAS.get(clave, clave): valor for clave, valor in fila.items()}
+        asignaciones.append({campo: str(fila.get(campo) or '').strip() for campo in CAMPOS_IMPORTACION})
+    return asignaciones
+
+
+def validar_asignaciones(filas, laboratorios, cursos, indice_ocupacion, asignaciones):
+    """
+    Validar en una pasada un lote de asignaciones contra la configuración y entre sí
+
+    Cada fila se comprueba contra el índice de ocupación existente y contra las
+    filas válidas anteriores del lote (con un índice propio), de modo que se
+    informa de todos los conflictos a la vez sin modificar la configuración.
+
+    Args:
+        filas (list): salida de leer_asignaciones
+        laboratorios, cursos, asignaciones (dict): los de ConfigurarHorarios
+        indice_ocupacion (IndiceOcupacion): el de las asignaciones existentes
+
+    Returns:
+        tuple: ({id: asignación normalizada} válidas, [(número de fila, motivo)])
+    """
+    nuevas = {}
+    errores = []
+    lote = IndiceOcupacion()
+    for numero, fila in enumerate(filas, start=2):  # Fila 1 = cabecera
+        faltan = [campo for campo in CAMPOS_IMPORTACION if not fila.get(campo)]
+        if faltan:
+            errores.append((numero, f"faltan {', '.join(faltan)}"))
+            continue
+        curso, laboratorio = fila['curso'], fila['laboratorio']
+        dia = NOMBRES_DIAS.get(fila['dia'].lower())
+        if curso not in cursos:
+            errores.append((numero, f"curso {curso} desconocido"))
+            continue
+        if laboratorio not in laboratorios:
+            errores.append((numero, f"laboratorio {laboratorio} desconocido"))
+            continue
+        if dia is None:
+            errores.append((numero, f"día '{fila['dia']}' no válido"))
+            continue
+        try:
+            inicio, fin = hora_a_minutos(fila['inicio']), hora_a_minutos(fila['fin'])
+        except ValueError:
+            errores.append((numero, f"hora no válida ({fila['inicio']}-{fila['fin']})"))
+            continue
+        if inicio >= fin:
+            errores.append((numero, "la hora de inicio debe ser anterior a la de fin"))
+            continue
+
+        inicio, fin = minutos_a_hora(inicio), minutos_a_hora(fin)
+        asignacion_id = f"{curso}_{laboratorio}_{dia}_{inicio}"
+        if asignacion_id in asignaciones or asignacion_id in nuevas:
+            errores.append((numero, f"asignación repetida ({asignacion_id})"))
+            continue
+        solapados = indice_ocupacion.solapados(laboratorio, dia, inicio, fin)
+        if solapados:
+            otra = asignaciones[solapados[0]]
+            errores.append((numero, f"{laboratorio} ya ocupado el {dia} de {otra['inicio']} a {otra['fin']}"))
+            continue
+        solapados = lote.solapados(laboratorio, dia, inicio, fin)
+        if solapados:
+            otra = nuevas[solapados[0]]
+            errores.append((numero, f"se solapa con otra fila del lote ({otra['curso']} "
+                                    f"{otra['inicio']}-{otra['fin']})"))
+            continue
+
+        nuevas[asignacion_id] = {'curso': curso, 'laboratorio': laboratorio, 'dia': dia,
+                                 'inicio': inicio, 'fin': fin}
+        lote.agregar(asignacion_id, laboratorio, dia, inicio, fin)
+    return nuevas, errores
+
+
+def _registro(tabla, fila):
+    _, campos = CAMPOS[tabla]
+    datos = dict(zip(campos, fila[1:]))
+    if 'es_doble_grado' in datos:
+        datos['es_doble_grado'] = bool(datos['es_doble_grado'])
+    return datos
+
+
+class AlmacenHorarios:
+    """
+    Configuración de horarios en una base SQLite compartible entre usuarios
+
+    En disco local va en modo WAL: las lecturas no esperan a una escritura en
+    curso y cada commit sólo añade las páginas tocadas al log. En una unidad de
+    red WAL no es fiable (usa memoria compartida entre procesos de la misma
+    máquina) y se usa el diario clásico con bloqueo de archivo. En ambos casos,
+    si el proceso se corta a mitad de un guardado la base queda como estaba.
+
+    Cada instancia recuerda la versión con la que leyó cada registro; al
+    guardar, un registro que otro usuario cambió entretanto es un conflicto.
+    """
+
+    def __init__(self, ruta=RUTA_ALMACEN, compartido=None, timeout=TIMEOUT_BLOQUEO):
+        """
+        Args:
+            compartido (bool): la base está (o puede estar) en una unidad de red; None =
+                deducirlo de la ruta, y sólo se usa WAL si consta que es un disco local
+            timeout (float): segundos de espera si otro usuario está guardando
+        """
+        self.ruta = ruta
+        self.compartido = not es_unidad_local(ruta) if compartido is None else compartido
+        self.versiones = {}  # {(tabla, clave): versión leída}
+        self.revision = 0  # Última revisión global incorporada
+        directorio = os.path.dirname(ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        # Sin transacciones implícitas: cada escritura abre la suya con BEGIN IMMEDIATE
+        self._conexion = sqlite3.connect(ruta, timeout=timeout, isolation_level=None)
+        self._conexion.execute(f"PRAGMA journal_mode={'DELETE' if self.compartido else 'WAL'}")
+        self._conexion.execute(f"PRAGMA synchronous={'FULL' if self.compartido else 'NORMAL'}")
+        # executescript confirma cualquier transacción abierta: va antes y por separado
+        self._conexion.executescript(ESQUEMA)
+        with self._transaccion():
+            self._migrar_esquema()
+            self._conexion.execute("INSERT OR REPLACE INTO metadatos VALUES ('version_esquema', ?)",
+                                   (str(VERSION_ESQUEMA),))
+
+    @contextmanager
+    def _transaccion(self):
+        """BEGIN IMMEDIATE … COMMIT: toma el bloqueo de escritura antes de leer las versiones"""
+        self._conexion.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._conexion.execute("ROLLBACK")
+            raise
+        self._conexion.execute("COMMIT")
+
+    def _migrar_esquema(self):
+        """Añadir versión y revisión a las tablas creadas con el esquema 1"""
+        for tabla in TABLAS:
+            columnas = {fila[1] for fila in self._conexion.execute(f"PRAGMA table_info({tabla})")}
+            for columna, defecto in COLUMNAS_VERSION:
+                if columna not in columnas:
+                    self._conexion.execute(
+                        f"ALTER TABLE {tabla} ADD COLUMN {columna} INTEGER NOT NULL DEFAULT {defecto}")
+
+    def _revision_actual(self):
+        fila = self._conexion.execute("SELECT valor FROM metadatos WHERE clave = 'revision'").fetchone()
+        return int(fila[0]) if fila else 0
+
+    def vacio(self):
+        return not any(self._conexion.execute(f"SELECT 1 FROM {tabla} LIMIT 1").fetchone() for tabla in TABLAS)
+
+    def _leer(self, tabla, condicion='', parametros=()):
+        clave, campos = CAMPOS[tabla]
+        consulta = f"SELECT {clave}, {', '.join(campos)}, version FROM {tabla} {condicion} ORDER BY rowid"
+        for fila in self._conexion.execute(consulta, parametros):
+            self.versiones[(tabla, fila[0])] = fila[-1]
+            yield fila[0], _registro(tabla, fila[:-1])
+
+    def cargar(self):
+        """
+        Leer toda la configuración (en una transacción de lectura consistente)
+
+        Returns:
+            tuple: (laboratorios, cursos, asignaciones) con el formato de ConfigurarHorarios
+        """
+        self.versiones = {}
+        self._conexion.execute("BEGIN")
+        try:
+            self.revision = self._revision_actual()
+            return tuple(dict(self._leer(tabla)) for tabla in TABLAS)
+        finally:
+            self._conexion.execute("COMMIT")
+
+    def cambios_desde(self, revision=None):
+        """
+        Registros que otros usuarios guardaron o eliminaron desde una revisión
+
+        Args:
+            revision (int): None = la última incorporada por este almacén
+
+        Returns:
+            dict: {(tabla, clave): datos o None si se eliminó}; avanza self.revision
+        """
+        revision = self.revision if revision is None else revision
+        cambios = {}
+        self._conexion.execute("BEGIN")
+        try:
+            actual = self._revision_actual()
+            if actual == revision:
+                return cambios
+            for tabla, clave in self._conexion.execute(
+                    "SELECT tabla, clave FROM eliminados WHERE revision > ?", (revision,)).fetchall():
+                cambios[(tabla, clave)] = None
+                self.versiones.pop((tabla, clave), None)
+            for tabla in TABLAS:
+                for clave, datos in self._leer(tabla, "WHERE revision > ?", (revision,)):
+                    cambios[(tabla, clave)] = datos
+            self.revision = actual
+            return cambios
+        finally:
+            self._conexion.execute("COMMIT")
+
+    def _guardados_desde(self, revision):
+        """[(tabla, clave)] escritos o eliminados por guardados posteriores a una revisión"""
+        guardados = self._conexion.execute("SELECT tabla, clave FROM eliminados WHERE revision > ?",
+                                           (revision,)).fetchall()
+        for tabla in TABLAS:
+            nombre_clave, _ = CAMPOS[tabla]
+            guardados += [(tabla, fila[0]) for fila in self._conexion.execute(
+                f"SELECT {nombre_clave} FROM {tabla} WHERE revision > ?", (revision,))]
+        return guardados
+
+    def _solapes(self, cambios):
+        """
+        Asignaciones nuevas o cambiadas que chocan con otras guardadas en el mismo laboratorio y día
+
+        Las que también se cambian o eliminan en este guardado no cuentan (se sustituyen).
+
+        Returns:
+            list: [(asignación propia, asignación guardada)]
+        """
+        propias = {clave for tabla, clave in cambios if tabla == 'asignaciones'}
+        solapes = []
+        for (tabla, clave), datos in cambios.items():
+            if tabla != 'asignaciones' or datos is None:
+                continue
+            # Horas 'HH:MM': el orden del texto es el de la hora y usa el índice (laboratorio, dia, inicio)
+            for (guardada,) in self._conexion.execute(
+                    "SELECT id FROM asignaciones WHERE laboratorio = ? AND dia = ? AND inicio < ? AND fin > ?",
+                    (datos['laboratorio'], datos['dia'], datos['fin'], datos['inicio'])):
+                if guardada not in propias:
+                    solapes.append((clave, guardada))
+        return solapes
+
+    def leer_registros(self, tabla, claves):
+        """{clave: datos} de los registros guardados (los que no existen no aparecen)"""
+        nombre_clave, _ = CAMPOS[tabla]
+        registros = {}
+        for clave in claves:
+            registros.update(self._leer(tabla, f"WHERE {nombre_clave} = ?", (clave,)))
+        return registros
+
+    def aplicar(self, cambios, reemplazar=False):
+        """
+        Guardar los registros cambiados en una sola transacción
+
+        Cada registro se compara con la versión que se leyó de él (ninguna si es
+        nuevo); si alguno cambió en la base desde entonces, o una asignación choca
+        con otra guardada en el mismo laboratorio y día, no se guarda nada.
+
+        Args:
+            cambios (dict): {(tabla, clave): datos o None si se eliminó}
+            reemplazar (bool): vaciar antes las tablas en lugar de comprobar registro a
+                registro (p.ej. al guardar los datos de ejemplo); se rechaza si otro
+                usuario guardó algo desde la última lectura
+
+        Returns:
+            int: filas escritas o borradas
+
+        Raises:
+            ConflictoEdicion: con los registros que otro usuario modificó y las
+                asignaciones que se solapan con otras guardadas
+        """
+        with self._transaccion():
+            revision = self._revision_actual() + 1
+            actuales = {}
+            if reemplazar:
+                # Sustituir todo sólo si nadie ha guardado desde la última lectura
+                conflictos = self._guardados_desde(self.revision)
+                if conflictos:
+                    raise ConflictoEdicion(conflictos)
+                self.versiones = {}
+                for tabla in TABLAS:
+                    nombre_clave, _ = CAMPOS[tabla]
+                    self._conexion.execute(
+                        f"INSERT OR REPLACE INTO eliminados SELECT ?, {nombre_clave}, ? FROM {tabla}", (tabla, revision))
+                    self._conexion.execute(f"DELETE FROM {tabla}")
+            else:
+                conflictos = []
+                for (tabla, clave) in cambios:
+                    nombre_clave, _ = CAMPOS[tabla]
+                    fila = self._conexion.execute(f"SELECT version FROM {tabla} WHERE {nombre_clave} = ?",
+                                                  (clave,)).fetchone()
+                    actuales[(tabla, clave)] = fila[0] if fila else None
+                    if actuales[(tabla, clave)] != self.versiones.get((tabla, clave)):
+                        conflictos.append((tabla, clave))
+                solapes = self._solapes(cambios)
+                if conflictos or solapes:
+                    raise ConflictoEdicion(conflictos, solapes)
+
+            for tabla in TABLAS:
+                nombre_clave, campos = CAMPOS[tabla]
+                borrados = [clave for (t, clave), datos in cambios.items() if t == tabla and datos is None]
+                filas = [_fila(tabla, clave, datos) + ((actuales.get((tabla, clave)) or 0) + 1, revision)
+                         for (t, clave), datos in cambios.items() if t == tabla and datos is not None]
+                self._conexion.executemany(f"DELETE FROM {tabla} WHERE {nombre_clave} = ?",
+                                           [(clave,) for clave in borrados])
+                self._conexion.executemany("INSERT OR REPLACE INTO eliminados VALUES (?, ?, ?)",
+                                           [(tabla, clave, revision) for clave in borrados])
+                self._conexion.executemany("DELETE FROM eliminados WHERE tabla = ? AND clave = ?",
+                                           [(tabla, fila[0]) for fila in filas])
+                marcadores = ', '.join('?' * (len(campos) + 3))
+                self._conexion.executemany(f"INSERT OR REPLACE INTO {tabla} VALUES ({marcadores})", filas)
+                for clave in borrados:
+                    self.versiones.pop((tabla, clave), None)
+                for fila in filas:
+                    self.versiones[(tabla, fila[0])] = fila[-2]
+
+            self._conexion.execute("INSERT OR REPLACE INTO metadatos VALUES ('revision', ?)", (str(revision),))
+            self._conexion.execute("INSERT OR REPLACE INTO metadatos VALUES ('fecha_guardado', ?)",
+                                   (datetime.now().isoformat(),))
+        if self.revision == revision - 1:
+            # Nadie más guardó entremedias: no hay nada que recoger hasta esta revisión
+            self.revision = revision
+        return len(cambios)
+
+    def guardar_todo(self, laboratorios, cursos, asignaciones):
+        """Sustituir toda la configuración (una transacción)"""
+        cambios = {}
+        for tabla, registros in zip(TABLAS, (laboratorios, cursos, asignaciones)):
+            cambios.update({(tabla, clave): datos for clave, datos in registros.items()})
+        return self.aplicar(cambios, reemplazar=True)
+
+    def migrar_json(self, ruta_json=RUTA_JSON_ANTERIOR):
+        """
+        Importar una única vez el JSON de versiones anteriores si el almacén está vacío
+
+        Returns:
+            bool: True si se importó
+        """
+        migrado = self._conexion.execute("SELECT 1 FROM metadatos WHERE clave = 'json_importado'").fetchone()
+        if migrado or not self.vacio() or not os.path.exists(ruta_json):
+            return False
+        with open(ruta_json, 'r', encoding='utf-8') as f:
+            config_data = json.load(f)
+        self.guardar_todo(config_data.get('laboratorios', {}), config_data.get('cursos', {}),
+                          config_data.get('asignaciones', {}))
+        self._conexion.execute("INSERT OR REPLACE INTO metadatos VALUES ('json_importado', ?)", (ruta_json,))
+        return True
+
+    def cerrar(self):
+        self._conexion.close()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Disponibilidad horaria de profesores compilada a bitsets
+Los textos tipo '08:00-12:00;14:00-18:00' se parsean una única vez al cargar;
+después cada consulta es un AND de bits (una máscara por profesor y día)
+"""
+
+import numpy as np
+
+from modules.data_sources.tablas import leer_tabla
+from modules.utils.franjas import CLAVES_DIAS, mascara_disponibilidad
+
+
+class DisponibilidadProfesores:
+    """Profesores, sus asignaturas y una máscara de franjas libres por día"""
+
+    def __init__(self):
+        self.nombres = []  # id → nombre
+        self.emails = []  # id → email
+        self.asignaturas = []  # id → [asignaturas que imparte]
+        self.mascaras = []  # id → [máscara lunes, ..., máscara viernes]
+        self._id = {}
+        self._matriz = None
+
+    def agregar(self, nombre, asignatura, textos_disponibilidad, email=''):
+        """Registrar una fila del archivo (un profesor puede aparecer en varias)"""
+        id_profesor = self._id.get(nombre)
+        if id_profesor is None:
+            id_profesor = len(self.nombres)
+            self._id[nombre] = id_profesor
+            self.nombres.append(nombre)
+            self.emails.append(email)
+            self.asignaturas.append([])
+            self.mascaras.append([mascara_disponibilidad(texto) for texto in textos_disponibilidad])
+            self._matriz = None
+
+        if asignatura and asignatura not in self.asignaturas[id_profesor]:
+            self.asignaturas[id_profesor].append(asignatura)
+
+    def __len__(self):
+        return len(self.nombres)
+
+    def indice(self, nombre):
+        return self._id.get(nombre)
+
+    # ========= CONSULTAS VECTORIZADAS =========
+
+    def matriz(self):
+        """Matriz uint64 (profesores × días) con las máscaras"""
+        if self._matriz is None:
+            self._matriz = np.array(self.mascaras, dtype=np.uint64).reshape(len(self.mascaras), len(CLAVES_DIAS))
+        return self._matriz
+
+    def libres(self, ids_profesores, mascaras):
+        """
+        Qué profesores tienen libres todas las franjas de cada máscara, cada día
+
+        Returns:
+            ndarray bool (días × máscaras × profesores), en el orden en que el
+            motor enumera los candidatos
+        """
+        disponibilidad = self.matriz()[list(ids_profesores)].T[:, None, :]
+        mascaras = np.asarray(mascaras, dtype=np.uint64)[None, :, None]
+        return (disponibilidad & mascaras) == mascaras
+
+
+def cargar_profesores(ruta):
+    """
+    Cargar el archivo de profesores compilando su disponibilidad
+
+    Columnas: nombre, asignatura, disponibilidad_lunes ... disponibilidad_viernes, email
+
+    Returns:
+        DisponibilidadProfesores
+    """
+    profesores = DisponibilidadProfesores()
+    for fila in leer_tabla(ruta):
+        nombre = fila.get('nombre', '')
+        if not nombre:
+            continue
+        textos = [fila.get(f'disponibilidad_{clave}', '') for clave in CLAVES_DIAS]
+        profesores.agregar(nombre, fila.get('asignatura', ''), textos, fila.get('email', ''))
+
+    return profesores
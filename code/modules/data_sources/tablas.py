@@ -0,0 +1,28 @@
+"""
+Lectura genérica de tablas CSV/Excel para los archivos de entrada
+"""
+
+import csv
+import os
+
+
+def leer_tabla(ruta):
+    """
+    Leer un archivo CSV o Excel como lista de diccionarios
+
+    Las cabeceras se normalizan a minúsculas sin espacios
+    """
+    extension = os.path.splitext(ruta)[1].lower()
+
+    if extension in ('.xlsx', '.xls'):
+        import pandas as pd
+        filas = pd.read_excel(ruta, dtype=str).fillna('').to_dict('records')
+    else:
+        with open(ruta, 'r', encoding='utf-8-sig', newline='') as f:
+            filas = list(csv.DictReader(f))
+
+    return [
+        {str(clave).strip().lower(): (str(valor).strip() if valor is not None else '')
+         for clave, valor in fila.items()}
+        for fila in filas
+    ]
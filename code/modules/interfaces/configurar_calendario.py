@@ -6,11 +6,11 @@ from datetime import datetime
 
 # Importar el scraper del calendario
 try:
-    from modules.utils.obtener_datos_calendario import obtener_calendario_web
+    from modules.data_sources.calendario import cargar_calendario, guardar_calendario, obtener_calendario_web
 
     SCRAPER_DISPONIBLE = True
 except ImportError:
-    print("⚠️ Módulo obtener_datos_calendario no disponible")
+    print("⚠️ Módulo de calendario no disponible")
     SCRAPER_DISPONIBLE = False
 
 
@@ -32,6 +32,13 @@ class ConfigurarCalendario(QtWidgets.QMainWindow):
 
         self.setupUi()
 
+        # Calendario en uso de la sesión anterior
+        if SCRAPER_DISPONIBLE:
+            datos = cargar_calendario()
+            if datos:
+                self.datos_calendario = datos
+                self.actualizar_tablas_semestres()
+
     def cargar_url_desde_config(self):
         """Cargar URL desde configuracion_labs.xml"""
         try:
@@ -309,6 +316,7 @@ class ConfigurarCalendario(QtWidgets.QMainWindow):
             if cod_error == 0:
                 self.datos_calendario = datos
                 self.actualizar_tablas_semestres()
+                self.fijar_calendario()
                 self.log_info("✅ Datos obtenidos correctamente desde web")
                 self.log_info(f"📅 Curso académico: {datos.get('curso_academico', 'N/A')}")
                 self.log_info(f"📊 Días especiales detectados: {len(datos.get('dias_especiales', {}))}")
@@ -327,13 +335,21 @@ class ConfigurarCalendario(QtWidgets.QMainWindow):
 
     def actualizar_tablas_semestres(self):
         """Actualizar las tablas con los datos cargados"""
+        # Fechas ISO en paralelo a los días (las configuraciones antiguas no las tienen)
+        fechas = self.datos_calendario.get('fechas', {})
+
         # Actualizar 1º Semestre
-        self.poblar_tabla_semestre(self.tabla_sem1, self.datos_calendario['semestre_1'])
+        self.poblar_tabla_semestre(self.tabla_sem1, self.datos_calendario['semestre_1'], fechas.get('semestre_1'))
 
         # Actualizar 2º Semestre
-        self.poblar_tabla_semestre(self.tabla_sem2, self.datos_calendario['semestre_2'])
+        self.poblar_tabla_semestre(self.tabla_sem2, self.datos_calendario['semestre_2'], fechas.get('semestre_2'))
+
+    @staticmethod
+    def clave_dia(item):
+        """Clave del día en dias_especiales: su fecha ISO o, sin ella, el texto de la celda"""
+        return item.data(QtCore.Qt.ItemDataRole.UserRole) or item.text()
 
-    def poblar_tabla_semestre(self, tabla, datos_semestre):
+    def poblar_tabla_semestre(self, tabla, datos_semestre, fechas_semestre=None):
         """Poblar tabla de semestre con datos"""
         dias_semana = ['lunes', 'martes', 'miercoles', 'jueves', 'viernes']
 
@@ -347,8 +363,11 @@ class ConfigurarCalendario(QtWidgets.QMainWindow):
         # Poblar cada columna (día de la semana)
         for col, dia in enumerate(dias_semana):
             fechas = datos_semestre[dia]
+            isos = (fechas_semestre or {}).get(dia, [])
             for fila, fecha in enumerate(fechas):
                 item = QtWidgets.QTableWidgetItem(str(fecha))
+                if fila < len(isos):
+                    item.setData(QtCore.Qt.ItemDataRole.UserRole, isos[fila])
 
                 # Aplicar estilo especial para días con asterisco
                 if '*' in str(fecha):
@@ -373,13 +392,16 @@ class ConfigurarCalendario(QtWidgets.QMainWindow):
             # Determinar semestre
             semestre = "1º" if sender == self.tabla_sem1 else "2º"
 
+            clave = self.clave_dia(item)
+            if clave != fecha:
+                fecha = datetime.fromisoformat(clave).strftime("%d/%m/%Y")
             self.info_dia_sel.setText(f"Seleccionado: {fecha} ({dia_semana} - {semestre} Semestre)")
 
             # Verificar si es día especial
-            if '*' in fecha:
+            if '*' in item.text():
                 self.radio_especial.setChecked(True)
-                if fecha in self.datos_calendario['dias_especiales']:
-                    dia_config = self.datos_calendario['dias_especiales'][fecha]
+                if clave in self.datos_calendario['dias_especiales']:
+                    dia_config = self.datos_calendario['dias_especiales'][clave]
                     tipo_horario = dia_config.get('tipo', 'horario_especial')
                     # Mapear tipo a índice del combo
                     tipos = ['horario_lunes', 'horario_martes', 'horario_miercoles', 'horario_jueves',
@@ -417,7 +439,9 @@ class ConfigurarCalendario(QtWidgets.QMainWindow):
             tipos = ['horario_lunes', 'horario_martes', 'horario_miercoles', 'horario_jueves', 'horario_viernes']
             tipo_seleccionado = tipos[self.combo_tipo_especial.currentIndex()]
 
-            self.datos_calendario['dias_especiales'][fecha_nueva] = {
+            # La clave es la fecha completa si la celda la tiene (si no, el texto como antes)
+            clave = tabla_sel.currentItem().data(QtCore.Qt.ItemDataRole.UserRole) or fecha_nueva
+            self.datos_calendario['dias_especiales'][clave] = {
                 'tipo': tipo_seleccionado,
                 'descripcion': self.line_descripcion.text()
             }
@@ -432,16 +456,27 @@ class ConfigurarCalendario(QtWidgets.QMainWindow):
             fecha_nueva = fecha_sel.replace('*', '')
 
             # Remover de días especiales si existía
-            if fecha_sel in self.datos_calendario['dias_especiales']:
-                del self.datos_calendario['dias_especiales'][fecha_sel]
+            clave = self.clave_dia(tabla_sel.currentItem())
+            if clave in self.datos_calendario['dias_especiales']:
+                del self.datos_calendario['dias_especiales'][clave]
 
             # Actualizar tabla
             tabla_sel.currentItem().setText(fecha_nueva)
             tabla_sel.currentItem().setBackground(QtGui.QColor(42, 42, 42))
             tabla_sel.currentItem().setForeground(QtGui.QColor(255, 255, 255))
 
+        self.fijar_calendario()
         self.log_info(f"✅ Configuración aplicada a fecha: {fecha_nueva}")
 
+    def fijar_calendario(self):
+        """Guardar el calendario como el que usa el motor (sin pasar por el diálogo)"""
+        if not SCRAPER_DISPONIBLE:
+            return
+        try:
+            guardar_calendario(self.datos_calendario)
+        except OSError as e:
+            self.log_info(f"⚠️ No se pudo guardar el calendario en uso: {e}")
+
     def guardar_configuracion(self):
         """Guardar configuración con QFileDialog"""
         nombre_default = "OPTIM_Calendario_Academico.json"
@@ -480,6 +515,7 @@ class ConfigurarCalendario(QtWidgets.QMainWindow):
                     self.datos_calendario = json.load(f)
 
                 self.actualizar_tablas_semestres()
+                self.fijar_calendario()
                 self.log_info(f"📂 Configuración cargada: {fname}")
                 self.mostrar_mensaje("✅ Éxito", "Configuración cargada correctamente")
 
@@ -506,6 +542,7 @@ class ConfigurarCalendario(QtWidgets.QMainWindow):
             }
 
             self.actualizar_tablas_semestres()
+            self.fijar_calendario()
             self.log_info("🧹 Calendarios limpiados")
 
     def log_info(self, mensaje):
@@ -1,20 +1,31 @@
 import sys
-import json
 import os
 from PyQt6 import QtCore, QtGui, QtWidgets
 from datetime import datetime, time
 
+from modules.data_sources.horario import (RUTA_ALMACEN, RUTA_JSON_ANTERIOR, AlmacenHorarios, ConflictoEdicion,
+                                          leer_asignaciones, validar_asignaciones)
+from modules.interfaces.modelos_tabla import ModeloAsignaciones
+from modules.utils.indice_ocupacion import IndiceOcupacion
+
 
 class ConfigurarHorarios(QtWidgets.QMainWindow):
+    # Cambio en un laboratorio: (nombre, {capacidad, ...} o None si se eliminó)
+    laboratorio_modificado = QtCore.pyqtSignal(str, object)
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.parent = parent
-        self.config_path = "config/horarios_sistema.json"
+        self.config_path = RUTA_ALMACEN
+        self.almacen = None
 
         # Datos del sistema
         self.laboratorios = {}  # {nombre: {capacidad: 24, equipamiento: "..."}}
         self.cursos = {}  # {codigo: {descripcion: "...", es_doble: bool, comparte_con: "..."}}
         self.asignaciones = {}  # {id: {curso: "M204", laboratorio: "Lab_A", dia: "Lunes", inicio: "08:00", fin: "10:00"}}
+        self.indice_ocupacion = IndiceOcupacion()  # Intervalos por (laboratorio, día) en minutos
+        self.cambios_pendientes = set()  # {(tabla, clave)} editados desde el último guardado
+        self.reemplazar_al_guardar = False  # Los datos no salen del almacén (p.ej. los de ejemplo)
 
         self.setupUi()
         self.cargar_configuracion()
@@ -154,10 +165,11 @@ class ConfigurarHorarios(QtWidgets.QMainWindow):
         self.label_asignaciones.setText("📋 ASIGNACIONES ACTUALES")
         self.label_asignaciones.setStyleSheet("color: white; font-weight: bold; font-size: 13px;")
 
-        self.tabla_asignaciones = QtWidgets.QTableWidget(self.centralwidget)
+        self.tabla_asignaciones = QtWidgets.QTableView(self.centralwidget)
         self.tabla_asignaciones.setGeometry(QtCore.QRect(400, 345, 550, 370))  # Ajustada para nueva posición
-        self.tabla_asignaciones.setColumnCount(6)
-        self.tabla_asignaciones.setHorizontalHeaderLabels(['Curso', 'Laboratorio', 'Día', 'Inicio', 'Fin', 'Acción'])
+        self.modelo_asignaciones = ModeloAsignaciones(parent=self)
+        self.tabla_asignaciones.setModel(self.modelo_asignaciones)
+        self.tabla_asignaciones.clicked.connect(self.click_tabla_asignaciones)
 
         # Ajustar anchos de columna
         self.tabla_asignaciones.setColumnWidth(0, 70)  # Curso
@@ -279,6 +291,11 @@ class ConfigurarHorarios(QtWidgets.QMainWindow):
 
     def setup_botones(self):
         """Botones principales"""
+        self.btn_importar = QtWidgets.QPushButton(self.centralwidget)
+        self.btn_importar.setGeometry(QtCore.QRect(450, 730, 140, 45))
+        self.btn_importar.setText("📥 Importar")
+        self.btn_importar.clicked.connect(lambda: self.importar_asignaciones())
+
         self.btn_guardar = QtWidgets.QPushButton(self.centralwidget)
         self.btn_guardar.setGeometry(QtCore.QRect(600, 730, 140, 45))
         self.btn_guardar.setText("💾 Guardar")
@@ -286,8 +303,8 @@ class ConfigurarHorarios(QtWidgets.QMainWindow):
 
         self.btn_cargar = QtWidgets.QPushButton(self.centralwidget)
         self.btn_cargar.setGeometry(QtCore.QRect(750, 730, 140, 45))
-        self.btn_cargar.setText("📂 Cargar")
-        self.btn_cargar.clicked.connect(lambda: self.cargar_configuracion(mostrar_mensaje=True))
+        self.btn_cargar.setText("🔄 Recargar")
+        self.btn_cargar.clicked.connect(self.recargar_configuracion)
 
         self.btn_exportar = QtWidgets.QPushButton(self.centralwidget)
         self.btn_exportar.setGeometry(QtCore.QRect(900, 730, 140, 45))
@@ -311,8 +328,10 @@ class ConfigurarHorarios(QtWidgets.QMainWindow):
                 'equipamiento': datos['equipamiento'],
                 'edificio': datos['edificio']
             }
+            self.marcar_cambio('laboratorios', datos['nombre'])
             self.actualizar_lista_laboratorios()
             self.actualizar_combos()
+            self.laboratorio_modificado.emit(datos['nombre'], self.laboratorios[datos['nombre']])
 
     def editar_laboratorio(self):
         """Editar laboratorio seleccionado"""
@@ -343,8 +362,13 @@ class ConfigurarHorarios(QtWidgets.QMainWindow):
                     'edificio': nuevos_datos['edificio']
                 })
 
+            self.marcar_cambio('laboratorios', nombre)
+            self.marcar_cambio('laboratorios', nuevos_datos['nombre'])
             self.actualizar_lista_laboratorios()
             self.actualizar_combos()
+            if nuevos_datos['nombre'] != nombre:
+                self.laboratorio_modificado.emit(nombre, None)
+            self.laboratorio_modificado.emit(nuevos_datos['nombre'], self.laboratorios[nuevos_datos['nombre']])
 
     def eliminar_laboratorio(self):
         """Eliminar laboratorio seleccionado"""
@@ -362,8 +386,10 @@ class ConfigurarHorarios(QtWidgets.QMainWindow):
 
         if reply == QtWidgets.QMessageBox.StandardButton.Yes:
             del self.laboratorios[nombre]
+            self.marcar_cambio('laboratorios', nombre)
             self.actualizar_lista_laboratorios()
             self.actualizar_combos()
+            self.laboratorio_modificado.emit(nombre, None)
 
     # ========= MÉTODOS DE GESTIÓN DE CURSOS =========
 
@@ -377,6 +403,7 @@ class ConfigurarHorarios(QtWidgets.QMainWindow):
                 'es_doble_grado': datos['es_doble_grado'],
                 'comparte_con': datos['comparte_con']
             }
+            self.marcar_cambio('cursos', datos['codigo'])
             self.actualizar_lista_cursos()
             self.actualizar_combos()
 
@@ -408,6 +435,8 @@ class ConfigurarHorarios(QtWidgets.QMainWindow):
                     'comparte_con': nuevos_datos['comparte_con']
                 })
 
+            self.marcar_cambio('cursos', codigo)
+            self.marcar_cambio('cursos', nuevos_datos['codigo'])
             self.actualizar_lista_cursos()
             self.actualizar_combos()
 
@@ -427,6 +456,7 @@ class ConfigurarHorarios(QtWidgets.QMainWindow):
 
         if reply == QtWidgets.QMessageBox.StandardButton.Yes:
             del self.cursos[codigo]
+            self.marcar_cambio('cursos', codigo)
             self.actualizar_lista_cursos()
             self.actualizar_combos()
 
@@ -489,28 +519,66 @@ class ConfigurarHorarios(QtWidgets.QMainWindow):
             'inicio': inicio,
             'fin': fin
         }
+        self.indice_ocupacion.agregar(asignacion_id, laboratorio, dia, inicio, fin)
+        self.marcar_cambio('asignaciones', asignacion_id)
 
-        self.actualizar_tabla_asignaciones()
+        self.modelo_asignaciones.insertar(asignacion_id)
         self.actualizar_calendario()
         self.limpiar_formulario()
 
         # Verificar dobles grados
         self.verificar_dobles_grados(curso, laboratorio, dia, inicio, fin)
 
+    def importar_asignaciones(self, ruta=None):
+        """
+        Importar asignaciones en bloque desde CSV/Excel/JSON
+
+        Todas las filas se validan en una pasada (ver validar_asignaciones); las
+        válidas se añaden y las vistas se refrescan una sola vez al final.
+        """
+        if not ruta:
+            ruta, _ = QtWidgets.QFileDialog.getOpenFileName(
+                self, "Importar asignaciones", "",
+                "Asignaciones (*.csv *.xlsx *.xls *.json);;Todos los archivos (*)"
+            )
+            if not ruta:
+                return
+
+        try:
+            filas = leer_asignaciones(ruta)
+        except Exception as e:
+            self.mostrar_mensaje("❌ Error", f"Error leyendo {os.path.basename(ruta)}:\n{str(e)}")
+            return
+
+        nuevas, errores = validar_asignaciones(filas, self.laboratorios, self.cursos, self.indice_ocupacion,
+                                               self.asignaciones)
+        if nuevas:
+            self.asignaciones.update(nuevas)
+            for asignacion_id, datos in nuevas.items():
+                self.indice_ocupacion.agregar(asignacion_id, datos['laboratorio'], datos['dia'], datos['inicio'],
+                                              datos['fin'])
+                self.marcar_cambio('asignaciones', asignacion_id)
+            self.actualizar_tabla_asignaciones()
+            self.actualizar_calendario()
+
+        resumen = f"{len(nuevas)} de {len(filas)} asignaciones importadas"
+        if not errores:
+            self.mostrar_mensaje("✅ Éxito", resumen)
+            return
+        msg_box = QtWidgets.QMessageBox(self)
+        msg_box.setWindowTitle("⚠️ Importación con conflictos")
+        msg_box.setText(f"{resumen}\n{len(errores)} filas descartadas (ver detalles)")
+        msg_box.setDetailedText("\n".join(f"Fila {numero}: {motivo}" for numero, motivo in errores))
+        msg_box.exec()
+
     def verificar_conflictos(self, curso, laboratorio, dia, inicio, fin):
         """Verificar conflictos de horario"""
-        for asignacion in self.asignaciones.values():
-            if (asignacion['laboratorio'] == laboratorio and
-                    asignacion['dia'] == dia):
-
-                # Verificar solapamiento de horarios
-                inicio_existente = asignacion['inicio']
-                fin_existente = asignacion['fin']
-
-                if not (fin <= inicio_existente or inicio >= fin_existente):
-                    self.mostrar_mensaje("❌ Conflicto",
-                                         f"Laboratorio {laboratorio} ya ocupado el {dia} de {inicio_existente} a {fin_existente}")
-                    return True
+        solapados = self.indice_ocupacion.solapados(laboratorio, dia, inicio, fin)
+        if solapados:
+            asignacion = self.asignaciones[solapados[0]]
+            self.mostrar_mensaje("❌ Conflicto",
+                                 f"Laboratorio {laboratorio} ya ocupado el {dia} de {asignacion['inicio']} a {asignacion['fin']}")
+            return True
         return False
 
     def verificar_dobles_grados(self, curso_asignado, laboratorio, dia, inicio, fin):
@@ -535,7 +603,9 @@ class ConfigurarHorarios(QtWidgets.QMainWindow):
         """Eliminar asignación"""
         if asignacion_id in self.asignaciones:
             del self.asignaciones[asignacion_id]
-            self.actualizar_tabla_asignaciones()
+            self.indice_ocupacion.eliminar(asignacion_id)
+            self.marcar_cambio('asignaciones', asignacion_id)
+            self.modelo_asignaciones.eliminar(asignacion_id)
             self.actualizar_calendario()
 
     def limpiar_formulario(self):
@@ -576,20 +646,13 @@ class ConfigurarHorarios(QtWidgets.QMainWindow):
         self.combo_form_lab.addItems(list(self.laboratorios.keys()))
 
     def actualizar_tabla_asignaciones(self):
-        """Actualizar tabla de asignaciones"""
-        self.tabla_asignaciones.setRowCount(len(self.asignaciones))
-
-        for row, (asignacion_id, datos) in enumerate(self.asignaciones.items()):
-            self.tabla_asignaciones.setItem(row, 0, QtWidgets.QTableWidgetItem(datos['curso']))
-            self.tabla_asignaciones.setItem(row, 1, QtWidgets.QTableWidgetItem(datos['laboratorio']))
-            self.tabla_asignaciones.setItem(row, 2, QtWidgets.QTableWidgetItem(datos['dia']))
-            self.tabla_asignaciones.setItem(row, 3, QtWidgets.QTableWidgetItem(datos['inicio']))
-            self.tabla_asignaciones.setItem(row, 4, QtWidgets.QTableWidgetItem(datos['fin']))
+        """Recargar la tabla entera (altas y bajas sueltas van por el modelo)"""
+        self.modelo_asignaciones.establecer(self.asignaciones)
 
-            # Botón eliminar
-            btn_eliminar = QtWidgets.QPushButton("🗑️")
-            btn_eliminar.clicked.connect(lambda checked, aid=asignacion_id: self.eliminar_asignacion(aid))
-            self.tabla_asignaciones.setCellWidget(row, 5, btn_eliminar)
+    def click_tabla_asignaciones(self, index):
+        """Eliminar la asignación al pulsar en la columna 'Acción'"""
+        if index.column() == ModeloAsignaciones.COLUMNA_ACCION:
+            self.eliminar_asignacion(self.modelo_asignaciones.id_en(index.row()))
 
     def actualizar_calendario(self):
         """Actualizar vista calendario"""
@@ -672,39 +735,156 @@ class ConfigurarHorarios(QtWidgets.QMainWindow):
 
     # ========= MÉTODOS DE PERSISTENCIA =========
 
+    def marcar_cambio(self, tabla, clave):
+        """Anotar un registro editado para guardarlo en el siguiente guardado"""
+        self.cambios_pendientes.add((tabla, clave))
+
+    def abrir_almacen(self):
+        """Abrir el almacén (la primera vez importa el JSON de versiones anteriores)"""
+        if self.almacen is None:
+            self.almacen = AlmacenHorarios(self.config_path)
+            if self.almacen.migrar_json(RUTA_JSON_ANTERIOR):
+                print(f"📦 Configuración importada de {RUTA_JSON_ANTERIOR} a {self.config_path}")
+        return self.almacen
+
     def guardar_configuracion(self):
-        """Guardar configuración"""
+        """
+        Guardar configuración (sólo los registros cambiados, en una transacción)
+
+        Si otro usuario guardó antes alguno de esos registros, se recogen sus
+        cambios (los suyos prevalecen en los registros en conflicto y en las
+        asignaciones propias que chocan con las suyas) y se guarda el resto de
+        ediciones propias.
+        """
         try:
-            os.makedirs("config", exist_ok=True)
+            almacen = self.abrir_almacen()
+            conflictos = []
+            descartadas = []
+            if self.reemplazar_al_guardar:
+                try:
+                    escritos = almacen.guardar_todo(self.laboratorios, self.cursos, self.asignaciones)
+                except ConflictoEdicion:
+                    # Otro usuario guardó su configuración mientras aquí se veían los datos de ejemplo
+                    self.cargar_configuracion()
+                    self.mostrar_mensaje("⚠️ Conflictos", "Otro usuario guardó una configuración mientras "
+                                                         "se editaban los datos de ejemplo.\nSe ha cargado la suya "
+                                                         "y los datos de ejemplo no se han guardado.")
+                    return
+            else:
+                try:
+                    escritos = almacen.aplicar(self.cambios_a_guardar())
+                except ConflictoEdicion as e:
+                    conflictos = e.conflictos
+                    descartadas = self.incorporar_cambios(almacen.cambios_desde())
+                    escritos = almacen.aplicar(self.cambios_a_guardar())
+            self.cambios_pendientes.clear()
+            self.reemplazar_al_guardar = False
+
+            mensaje = f"Configuración guardada en:\n{self.config_path}\n({escritos} registros actualizados)"
+            if conflictos:
+                registros = "\n".join(f"  • {clave} ({tabla})" for tabla, clave in conflictos[:10])
+                mensaje += (f"\n\nOtro usuario modificó antes {len(conflictos)} registros; "
+                            f"se conserva su versión:\n{registros}")
+            if descartadas:
+                mensaje += self.texto_descartadas(descartadas)
+            if conflictos or descartadas:
+                self.mostrar_mensaje("⚠️ Conflictos", mensaje)
+            else:
+                self.mostrar_mensaje("✅ Éxito", mensaje)
 
-            config_data = {
-                'laboratorios': self.laboratorios,
-                'cursos': self.cursos,
-                'asignaciones': self.asignaciones,
-                'fecha_guardado': datetime.now().isoformat()
-            }
+        except Exception as e:
+            self.mostrar_mensaje("❌ Error", f"Error guardando:\n{str(e)}")
 
-            with open(self.config_path, 'w', encoding='utf-8') as f:
-                json.dump(config_data, f, indent=2, ensure_ascii=False)
+    def cambios_a_guardar(self):
+        """{(tabla, clave): datos actuales o None} de los registros editados"""
+        return {(tabla, clave): getattr(self, tabla).get(clave) for tabla, clave in self.cambios_pendientes}
+
+    @staticmethod
+    def texto_descartadas(descartadas):
+        """Aviso de las asignaciones propias que se descartaron por chocar con otras"""
+        lineas = "\n".join(f"  • {propia} (choca con {ajena})" for propia, ajena in descartadas[:10])
+        return (f"\n\n{len(descartadas)} asignaciones sin guardar se solapaban con otras de otro usuario; "
+                f"se conservan las suyas:\n{lineas}")
+
+    def incorporar_cambios(self, cambios):
+        """
+        Aplicar los registros que otros usuarios guardaron desde la última lectura
+
+        Las ediciones propias pendientes de esos mismos registros se descartan,
+        y también las asignaciones pendientes que chocan con una recibida: las
+        nuevas se quitan y las ya guardadas vuelven a su versión del almacén.
+
+        Returns:
+            list: [(asignación propia descartada, asignación recibida con la que chocaba)]
+        """
+        descartadas = []
+        if not cambios:
+            return descartadas
+        for (tabla, clave), datos in cambios.items():
+            self.cambios_pendientes.discard((tabla, clave))
+            registros = getattr(self, tabla)
+            if datos is None:
+                registros.pop(clave, None)
+            else:
+                registros[clave] = datos
+            if tabla == 'asignaciones':
+                self.indice_ocupacion.eliminar(clave)
+                if datos is not None:
+                    for propia in self.indice_ocupacion.solapados(datos['laboratorio'], datos['dia'],
+                                                                  datos['inicio'], datos['fin']):
+                        if ('asignaciones', propia) in self.cambios_pendientes:
+                            self.cambios_pendientes.discard(('asignaciones', propia))
+                            self.asignaciones.pop(propia, None)
+                            self.indice_ocupacion.eliminar(propia)
+                            descartadas.append((propia, clave))
+                    self.indice_ocupacion.agregar(clave, datos['laboratorio'], datos['dia'], datos['inicio'],
+                                                  datos['fin'])
+            elif tabla == 'laboratorios':
+                self.laboratorio_modificado.emit(clave, datos)
+
+        # Las descartadas que ya estaban guardadas recuperan lo que hay en el almacén
+        guardadas = self.abrir_almacen().leer_registros('asignaciones', [propia for propia, _ in descartadas])
+        for propia, datos in guardadas.items():
+            self.asignaciones[propia] = datos
+            self.indice_ocupacion.agregar(propia, datos['laboratorio'], datos['dia'], datos['inicio'], datos['fin'])
 
-            self.mostrar_mensaje("✅ Éxito", f"Configuración guardada en:\n{self.config_path}")
+        self.actualizar_lista_laboratorios()
+        self.actualizar_lista_cursos()
+        self.actualizar_combos()
+        self.actualizar_tabla_asignaciones()
+        self.actualizar_calendario()
+        return descartadas
 
+    def recargar_configuracion(self):
+        """Recoger lo que otros usuarios guardaron, sin releer toda la configuración"""
+        try:
+            if self.reemplazar_al_guardar:
+                self.cargar_configuracion(mostrar_mensaje=True)
+                return
+            cambios = self.abrir_almacen().cambios_desde()
+            descartadas = self.incorporar_cambios(cambios)
+            mensaje = f"Configuración actualizada ({len(cambios)} registros cambiados)"
+            if descartadas:
+                self.mostrar_mensaje("⚠️ Conflictos", mensaje + self.texto_descartadas(descartadas))
+            else:
+                self.mostrar_mensaje("✅ Éxito", mensaje)
         except Exception as e:
-            self.mostrar_mensaje("❌ Error", f"Error guardando:\n{str(e)}")
+            self.mostrar_mensaje("❌ Error", f"Error recargando:\n{str(e)}")
 
     def cargar_configuracion(self, mostrar_mensaje=False):
         """Cargar configuración"""
         try:
-            if not os.path.exists(self.config_path):
+            almacen = self.abrir_almacen()
+            # cargar() fija la revisión leída aunque la base esté vacía
+            laboratorios, cursos, asignaciones = almacen.cargar()
+            if not (laboratorios or cursos or asignaciones):
                 self.cargar_datos_ejemplo()
                 return
 
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                config_data = json.load(f)
-
-            self.laboratorios = config_data.get('laboratorios', {})
-            self.cursos = config_data.get('cursos', {})
-            self.asignaciones = config_data.get('asignaciones', {})
+            self.laboratorios, self.cursos, self.asignaciones = laboratorios, cursos, asignaciones
+            self.indice_ocupacion.reconstruir(self.asignaciones)
+            self.cambios_pendientes.clear()
+            self.reemplazar_al_guardar = False
 
             self.actualizar_lista_laboratorios()
             self.actualizar_lista_cursos()
@@ -736,10 +916,14 @@ class ConfigurarHorarios(QtWidgets.QMainWindow):
         }
 
         self.asignaciones = {}
+        self.indice_ocupacion.reconstruir(self.asignaciones)
+        self.cambios_pendientes.clear()
+        self.reemplazar_al_guardar = True
 
         self.actualizar_lista_laboratorios()
         self.actualizar_lista_cursos()
         self.actualizar_combos()
+        self.actualizar_tabla_asignaciones()
         self.actualizar_calendario()
 
     def exportar_horarios(self):
@@ -805,18 +989,18 @@ class ConfigurarHorarios(QtWidgets.QMainWindow):
                 selection-background-color: rgb(42,130,218);
                 font-size: 12px;
             }
-            QTableWidget { 
+            QTableView { 
                 background-color: rgb(42,42,42); 
                 color: white; 
                 border: 1px solid rgb(127,127,127);
                 gridline-color: rgb(127,127,127);
                 font-size: 12px;
             }
-            QTableWidget::item { 
+            QTableView::item { 
                 border-bottom: 1px solid rgb(127,127,127); 
                 padding: 8px; 
             }
-            QTableWidget::item:selected { background-color: rgb(42,130,218); }
+            QTableView::item:selected { background-color: rgb(42,130,218); }
             QHeaderView::section { 
                 background-color: rgb(35,35,35); 
                 color: white; 
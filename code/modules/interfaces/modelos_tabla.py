@@ -0,0 +1,150 @@
+"""
+Modelos Qt (QAbstractTableModel) para las tablas de resultados y asignaciones
+Las vistas sólo piden las celdas visibles a data(), así que una tabla con
+decenas de miles de filas no crea un QTableWidgetItem por celda
+"""
+
+from PyQt6 import QtCore
+
+DISPLAY = QtCore.Qt.ItemDataRole.DisplayRole
+ALINEACION = QtCore.Qt.ItemDataRole.TextAlignmentRole
+HORIZONTAL = QtCore.Qt.Orientation.Horizontal
+CENTRADO = QtCore.Qt.AlignmentFlag.AlignCenter
+
+
+def _texto(valor):
+    return '' if valor is None else str(valor)
+
+
+class ModeloFilas(QtCore.QAbstractTableModel):
+    """
+    Vista de sólo lectura sobre una lista de filas (dicts)
+
+    Muestra las filas base indicadas por posición, de modo que cambiar de
+    selección (p.ej. otro laboratorio) no copia datos: sólo cambia la lista
+    de posiciones. Cada columna es (título, función fila → valor).
+    """
+
+    def __init__(self, columnas, parent=None):
+        super().__init__(parent)
+        self._columnas = columnas
+        self._filas = []
+        self._posiciones = []
+
+    def establecer_filas(self, filas, posiciones=None):
+        """Cambiar el contenido (posiciones=None muestra todas las filas)"""
+        self.beginResetModel()
+        self._filas = filas
+        self._posiciones = list(range(len(filas))) if posiciones is None else posiciones
+        self.endResetModel()
+
+    def fila(self, row):
+        return self._filas[self._posiciones[row]]
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._posiciones)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._columnas)
+
+    def data(self, index, role=DISPLAY):
+        if not index.isValid():
+            return None
+        if role == DISPLAY:
+            return _texto(self._columnas[index.column()][1](self.fila(index.row())))
+        return None
+
+    def headerData(self, section, orientation, role=DISPLAY):
+        if role == DISPLAY and orientation == HORIZONTAL:
+            return self._columnas[section][0]
+        return super().headerData(section, orientation, role)
+
+
+class ModeloAsignaciones(QtCore.QAbstractTableModel):
+    """
+    Asignaciones de ConfigurarHorarios ({id: {curso, laboratorio, dia, inicio, fin}})
+
+    El diccionario sigue siendo la fuente de verdad; el modelo sólo guarda el
+    orden de los ids (con su fila, para que altas y bajas no recorran la lista)
+    y avisa a la vista de cada alta o baja por separado.
+    """
+
+    COLUMNAS = [('Curso', 'curso'), ('Laboratorio', 'laboratorio'), ('Día', 'dia'),
+                ('Inicio', 'inicio'), ('Fin', 'fin'), ('Acción', None)]
+    COLUMNA_ACCION = 5
+
+    def __init__(self, asignaciones=None, parent=None):
+        super().__init__(parent)
+        self._asignaciones = {}
+        self._ids = []
+        self._filas = {}  # {id: fila}
+        self.establecer(asignaciones or {})
+
+    def establecer(self, asignaciones):
+        """Sustituir todas las asignaciones (p.ej. al cargar la configuración)"""
+        self.beginResetModel()
+        self._asignaciones = asignaciones
+        self._ids = list(asignaciones)
+        self._filas = {asignacion_id: row for row, asignacion_id in enumerate(self._ids)}
+        self.endResetModel()
+
+    def insertar(self, asignacion_id):
+        """Avisar de una asignación añadida al diccionario"""
+        row = self._filas.get(asignacion_id)
+        if row is not None:
+            self._fila_cambiada(row)
+            return
+        row = len(self._ids)
+        self.beginInsertRows(QtCore.QModelIndex(), row, row)
+        self._ids.append(asignacion_id)
+        self._filas[asignacion_id] = row
+        self.endInsertRows()
+
+    def eliminar(self, asignacion_id):
+        """
+        Avisar de una asignación quitada del diccionario
+
+        Se quita la última fila y su asignación pasa al hueco, en lugar de
+        desplazar (y renumerar) todas las que van detrás.
+        """
+        row = self._filas.pop(asignacion_id, None)
+        if row is None:
+            return
+        ultima = len(self._ids) - 1
+        self.beginRemoveRows(QtCore.QModelIndex(), ultima, ultima)
+        movida = self._ids.pop()
+        self.endRemoveRows()
+        if row != ultima:
+            self._ids[row] = movida
+            self._filas[movida] = row
+            self._fila_cambiada(row)
+
+    def _fila_cambiada(self, row):
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.COLUMNAS) - 1))
+
+    def id_en(self, row):
+        return self._ids[row]
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._ids)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNAS)
+
+    def data(self, index, role=DISPLAY):
+        if not index.isValid():
+            return None
+        columna = index.column()
+        if role == DISPLAY:
+            if columna == self.COLUMNA_ACCION:
+                return "🗑️"
+            datos = self._asignaciones.get(self._ids[index.row()], {})
+            return _texto(datos.get(self.COLUMNAS[columna][1]))
+        if role == ALINEACION and columna == self.COLUMNA_ACCION:
+            return CENTRADO
+        return None
+
+    def headerData(self, section, orientation, role=DISPLAY):
+        if role == DISPLAY and orientation == HORIZONTAL:
+            return self.COLUMNAS[section][0]
+        return super().headerData(section, orientation, role)
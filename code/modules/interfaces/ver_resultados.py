@@ -5,14 +5,61 @@ from PyQt6 import QtCore, QtGui, QtWidgets
 import pandas as pd
 from datetime import datetime
 
+from modules.interfaces.modelos_tabla import ModeloFilas
+from modules.utils.estadisticas import calcular_estadisticas, resumen_estadisticas
+from modules.utils.exportar_excel import ExportacionCancelada, exportar_resultados
+from modules.utils.resultados_columnar import (ARCHIVO_RESULTADOS, FilasPerezosas, ResultadosColumnar, es_columnar,
+                                               localizar_resultados, ruta_excel)
+
+# Columnas que necesitan los índices y el panel de estadísticas (Grupo y Profesor se leen por fila)
+COLUMNAS_RESUMEN = ['Asignatura', 'Laboratorio', 'Dia', 'Hora_Inicio', 'Hora_Fin', 'Num_Alumnos', 'Estado']
+
+
+class HiloExportacion(QtCore.QThread):
+    """Exporta los resultados fuera del hilo de la interfaz"""
+
+    progreso = QtCore.pyqtSignal(int, str)
+    terminado = QtCore.pyqtSignal(object, str)  # (archivos o None, error; sin error = cancelada)
+
+    def __init__(self, parametros, parent=None):
+        super().__init__(parent)
+        self.parametros = parametros
+        self._cancelado = False
+
+    def cancelar(self):
+        self._cancelado = True
+
+    def esta_cancelado(self):
+        return self._cancelado
+
+    def run(self):
+        try:
+            archivos = exportar_resultados(progreso=self.progreso.emit, cancelado=self.esta_cancelado,
+                                           **self.parametros)
+            self.terminado.emit(archivos, "")
+        except ExportacionCancelada:
+            self.terminado.emit(None, "")
+        except Exception as e:
+            self.terminado.emit(None, str(e))
+
 
 class VerResultados(QtWidgets.QMainWindow):
-    def __init__(self, parent=None, archivo_resultado=None):
+    def __init__(self, parent=None, archivo_resultado=None, motor=None):
         super().__init__(parent)
         self.parent = parent
-        self.archivo_resultado = archivo_resultado or "horarios_laboratorios.xlsx"
+        self.archivo_resultado = archivo_resultado or ARCHIVO_RESULTADOS
+        self.resultados = None  # ResultadosColumnar abierto (None con Excel o datos de ejemplo)
+        self.hilo_exportacion = None
+        self.motor = motor  # Aporta el tiempo real de ejecución y el total de laboratorios
         self.datos_horarios = None
         self.estadisticas = {}
+        self.metricas = {}
+
+        # Índices construidos una vez por carga: clave → posiciones en self.filas
+        self.filas = []
+        self.filas_por_lab = {}
+        self.filas_por_asignatura = {}
+        self.filas_por_dia = {}
 
         self.setupUi()
         self.cargar_resultados()
@@ -119,10 +166,16 @@ class VerResultados(QtWidgets.QMainWindow):
         self.detalle_lab.setReadOnly(True)
 
         # Tabla de horarios más grande
-        self.tabla_lab = QtWidgets.QTableWidget(self.tab_laboratorios)
+        self.tabla_lab = QtWidgets.QTableView(self.tab_laboratorios)
         self.tabla_lab.setGeometry(QtCore.QRect(960, 20, 520, 620))  # Más grande
-        self.tabla_lab.setColumnCount(5)
-        self.tabla_lab.setHorizontalHeaderLabels(['Día', 'Hora', 'Asignatura', 'Grupo', 'Alumnos'])
+        self.modelo_lab = ModeloFilas([
+            ('Día', lambda fila: fila['Dia']),
+            ('Hora', lambda fila: f"{fila['Hora_Inicio']}-{fila['Hora_Fin']}"),
+            ('Asignatura', lambda fila: fila['Asignatura']),
+            ('Grupo', lambda fila: fila['Grupo']),
+            ('Alumnos', lambda fila: fila['Num_Alumnos'])
+        ], self)
+        self.tabla_lab.setModel(self.modelo_lab)
         self.tabla_lab.horizontalHeader().setStretchLastSection(True)
 
     def setup_tab_asignaturas(self):
@@ -138,10 +191,16 @@ class VerResultados(QtWidgets.QMainWindow):
         self.detalle_asignatura.setReadOnly(True)
 
         # Tabla de grupos más grande
-        self.tabla_grupos = QtWidgets.QTableWidget(self.tab_asignaturas)
+        self.tabla_grupos = QtWidgets.QTableView(self.tab_asignaturas)
         self.tabla_grupos.setGeometry(QtCore.QRect(960, 20, 520, 620))
-        self.tabla_grupos.setColumnCount(5)
-        self.tabla_grupos.setHorizontalHeaderLabels(['Grupo', 'Día', 'Hora', 'Laboratorio', 'Alumnos'])
+        self.modelo_grupos = ModeloFilas([
+            ('Grupo', lambda fila: fila['Grupo']),
+            ('Día', lambda fila: fila['Dia']),
+            ('Hora', lambda fila: f"{fila['Hora_Inicio']}-{fila['Hora_Fin']}"),
+            ('Laboratorio', lambda fila: fila['Laboratorio']),
+            ('Alumnos', lambda fila: fila['Num_Alumnos'])
+        ], self)
+        self.tabla_grupos.setModel(self.modelo_grupos)
         self.tabla_grupos.horizontalHeader().setStretchLastSection(True)
 
     def setup_tab_calendario(self):
@@ -225,13 +284,22 @@ class VerResultados(QtWidgets.QMainWindow):
         self.check_grupos.setText("Grupos por Asignatura")
         self.check_grupos.setChecked(True)
 
+        self.check_dias = QtWidgets.QCheckBox(self.tab_exportar)
+        self.check_dias.setGeometry(QtCore.QRect(50, content_y + 105, 300, 25))
+        self.check_dias.setText("Horarios por Día")
+        self.check_dias.setChecked(True)
+
         self.check_estadisticas_exp = QtWidgets.QCheckBox(self.tab_exportar)
-        self.check_estadisticas_exp.setGeometry(QtCore.QRect(50, content_y + 105, 300, 25))
+        self.check_estadisticas_exp.setGeometry(QtCore.QRect(50, content_y + 140, 300, 25))
         self.check_estadisticas_exp.setText("Estadísticas y Resumen")
         self.check_estadisticas_exp.setChecked(True)
 
+        self.check_individuales = QtWidgets.QCheckBox(self.tab_exportar)
+        self.check_individuales.setGeometry(QtCore.QRect(50, content_y + 175, 380, 25))
+        self.check_individuales.setText("📁 Un archivo por laboratorio y asignatura")
+
         # Botones más grandes
-        button_y = content_y + 160
+        button_y = content_y + 230
         self.btn_exportar = QtWidgets.QPushButton(self.tab_exportar)
         self.btn_exportar.setGeometry(QtCore.QRect(50, button_y, 160, 45))  # Más grande
         self.btn_exportar.setText("🚀 Exportar Todo")
@@ -242,6 +310,13 @@ class VerResultados(QtWidgets.QMainWindow):
         self.btn_preview.setText("👁️ Vista Previa")
         self.btn_preview.clicked.connect(self.mostrar_preview)
 
+        self.progress_exportar = QtWidgets.QProgressBar(self.tab_exportar)
+        self.progress_exportar.setGeometry(QtCore.QRect(50, button_y + 60, 340, 25))
+        self.progress_exportar.setVisible(False)
+
+        self.label_progreso_exportar = QtWidgets.QLabel(self.tab_exportar)
+        self.label_progreso_exportar.setGeometry(QtCore.QRect(50, button_y + 90, 380, 25))
+
         # Área de preview más grande
         self.preview_exportar = QtWidgets.QTextEdit(self.tab_exportar)
         self.preview_exportar.setGeometry(QtCore.QRect(450, 30, 1000, 600))  # Mucho más grande
@@ -273,11 +348,20 @@ class VerResultados(QtWidgets.QMainWindow):
     def cargar_resultados(self):
         """Cargar resultados desde archivo"""
         try:
-            if not os.path.exists(self.archivo_resultado):
+            self.liberar_resultados()
+            ruta = localizar_resultados(self.archivo_resultado)
+            if not os.path.exists(ruta):
                 self.mostrar_datos_ejemplo()
                 return
 
-            self.datos_horarios = pd.read_excel(self.archivo_resultado)
+            if es_columnar(ruta):
+                # Mapeado en memoria: sólo se leen las columnas del resumen
+                self.resultados = ResultadosColumnar(ruta)
+                self.datos_horarios = self.resultados.leer(COLUMNAS_RESUMEN)
+            else:
+                # Resultados de versiones anteriores
+                self.datos_horarios = pd.read_excel(ruta)
+            self.indexar_resultados()
             self.calcular_estadisticas()
             self.actualizar_todas_vistas()
 
@@ -285,6 +369,21 @@ class VerResultados(QtWidgets.QMainWindow):
             self.mostrar_mensaje("❌ Error", f"Error cargando resultados:\n{str(e)}")
             self.mostrar_datos_ejemplo()
 
+    def liberar_resultados(self):
+        """Cerrar el archivo mapeado (Windows no deja reemplazarlo mientras está abierto)"""
+        if self.resultados is None:
+            return
+        if self.hilo_exportacion is not None and self.hilo_exportacion.isRunning():
+            # La exportación lee del mismo archivo mapeado
+            self.hilo_exportacion.cancelar()
+            self.hilo_exportacion.wait()
+        self.modelo_lab.establecer_filas([])
+        self.modelo_grupos.establecer_filas([])
+        self.filas = []
+        self.datos_horarios = None
+        self.resultados.cerrar()
+        self.resultados = None
+
     def mostrar_datos_ejemplo(self):
         """Mostrar datos de ejemplo cuando no hay archivo"""
         self.datos_horarios = pd.DataFrame({
@@ -298,22 +397,49 @@ class VerResultados(QtWidgets.QMainWindow):
             'Estado': ['Asignado', 'Asignado', 'Asignado', 'Asignado', 'Asignado']
         })
 
+        self.indexar_resultados()
         self.calcular_estadisticas()
         self.actualizar_todas_vistas()
 
+    def indexar_resultados(self):
+        """Agrupar una sola vez las filas por laboratorio, asignatura y día"""
+        datos = self.datos_horarios
+        self.filas = []
+        self.filas_por_lab = {}
+        self.filas_por_asignatura = {}
+        self.filas_por_dia = {}
+        if datos is None or datos.empty:
+            return
+
+        if self.resultados is not None:
+            # Las filas completas se convierten por bloques cuando una vista las pide
+            self.filas = FilasPerezosas(self.resultados)
+        else:
+            # Las celdas vacías (grupos en conflicto) llegan como NaN desde Excel
+            textos = datos.select_dtypes(exclude='number').columns
+            self.filas = datos.fillna({columna: '' for columna in textos}).to_dict('records')
+
+        # groupby(...).indices da las posiciones de cada clave (las filas sin valor se omiten)
+        for columna, indice in (('Laboratorio', self.filas_por_lab),
+                                ('Asignatura', self.filas_por_asignatura),
+                                ('Dia', self.filas_por_dia)):
+            if columna in datos.columns:
+                for clave, posiciones in datos.groupby(columna, sort=True).indices.items():
+                    if str(clave):
+                        indice[str(clave)] = posiciones.tolist()
+
     def calcular_estadisticas(self):
         """Calcular estadísticas de los resultados"""
         if self.datos_horarios is None or self.datos_horarios.empty:
             return
 
-        self.estadisticas = {
-            'total_grupos': len(self.datos_horarios),
-            'grupos_asignados': len(self.datos_horarios[self.datos_horarios['Estado'] == 'Asignado']),
-            'conflictos': len(self.datos_horarios[self.datos_horarios['Estado'] == 'Conflicto']),
-            'labs_usados': f"{self.datos_horarios['Laboratorio'].nunique()}/{self.datos_horarios['Laboratorio'].nunique() + 3}",
-            'equilibrio': "95%",
-            'tiempo_ejecucion': "4.2s"
-        }
+        num_laboratorios = tiempo = None
+        if self.motor is not None:
+            num_laboratorios = len(self.motor.laboratorios)
+            tiempo = self.motor.tiempo_ejecucion
+
+        self.metricas = calcular_estadisticas(self.datos_horarios, num_laboratorios, tiempo)
+        self.estadisticas = resumen_estadisticas(self.metricas)
 
         for key, valor in self.estadisticas.items():
             if key in self.labels_stats:
@@ -322,18 +448,14 @@ class VerResultados(QtWidgets.QMainWindow):
     def actualizar_todas_vistas(self):
         """Actualizar todas las vistas con los nuevos datos"""
         self.lista_labs.clear()
-        if self.datos_horarios is not None:
-            laboratorios = self.datos_horarios['Laboratorio'].unique()
-            for lab in sorted(laboratorios):
-                item = QtWidgets.QListWidgetItem(f"🏢 {lab}")
-                self.lista_labs.addItem(item)
+        for lab in sorted(self.filas_por_lab):
+            item = QtWidgets.QListWidgetItem(f"🏢 {lab}")
+            self.lista_labs.addItem(item)
 
         self.lista_asignaturas.clear()
-        if self.datos_horarios is not None:
-            asignaturas = self.datos_horarios['Asignatura'].unique()
-            for asig in sorted(asignaturas):
-                item = QtWidgets.QListWidgetItem(f"📚 {asig}")
-                self.lista_asignaturas.addItem(item)
+        for asig in sorted(self.filas_por_asignatura):
+            item = QtWidgets.QListWidgetItem(f"📚 {asig}")
+            self.lista_asignaturas.addItem(item)
 
     def mostrar_detalle_laboratorio(self, row):
         """Mostrar detalle del laboratorio seleccionado"""
@@ -341,34 +463,29 @@ class VerResultados(QtWidgets.QMainWindow):
             return
 
         lab_text = self.lista_labs.item(row).text().replace("🏢 ", "")
-        datos_lab = self.datos_horarios[self.datos_horarios['Laboratorio'] == lab_text]
+        posiciones = self.filas_por_lab.get(lab_text, [])
+        filas_lab = [self.filas[i] for i in posiciones]
 
         detalle = f"LABORATORIO: {lab_text}\n"
         detalle += "=" * 50 + "\n\n"
         detalle += f"📊 Estadísticas:\n"
-        detalle += f"• Total grupos asignados: {len(datos_lab)}\n"
-        detalle += f"• Total alumnos: {datos_lab['Num_Alumnos'].sum()}\n"
-        detalle += f"• Días utilizados: {datos_lab['Dia'].nunique()}\n"
-        detalle += f"• Asignaturas: {', '.join(datos_lab['Asignatura'].unique())}\n\n"
+        detalle += f"• Total grupos asignados: {len(filas_lab)}\n"
+        detalle += f"• Total alumnos: {sum(fila['Num_Alumnos'] for fila in filas_lab)}\n"
+        detalle += f"• Días utilizados: {len({fila['Dia'] for fila in filas_lab})}\n"
+        detalle += f"• Asignaturas: {', '.join(dict.fromkeys(fila['Asignatura'] for fila in filas_lab))}\n\n"
 
         detalle += f"📅 Horarios por día:\n"
         for dia in ['Lunes', 'Martes', 'Miércoles', 'Jueves', 'Viernes']:
-            datos_dia = datos_lab[datos_lab['Dia'] == dia]
-            if not datos_dia.empty:
+            filas_dia = [fila for fila in filas_lab if fila['Dia'] == dia]
+            if filas_dia:
                 detalle += f"\n{dia}:\n"
-                for _, row in datos_dia.iterrows():
-                    detalle += f"  {row['Hora_Inicio']}-{row['Hora_Fin']} → {row['Asignatura']} ({row['Num_Alumnos']} alumnos)\n"
+                for fila in filas_dia:
+                    detalle += f"  {fila['Hora_Inicio']}-{fila['Hora_Fin']} → {fila['Asignatura']} ({fila['Num_Alumnos']} alumnos)\n"
 
         self.detalle_lab.setText(detalle)
 
-        # Actualizar tabla
-        self.tabla_lab.setRowCount(len(datos_lab))
-        for i, (_, row) in enumerate(datos_lab.iterrows()):
-            self.tabla_lab.setItem(i, 0, QtWidgets.QTableWidgetItem(row['Dia']))
-            self.tabla_lab.setItem(i, 1, QtWidgets.QTableWidgetItem(f"{row['Hora_Inicio']}-{row['Hora_Fin']}"))
-            self.tabla_lab.setItem(i, 2, QtWidgets.QTableWidgetItem(row['Asignatura']))
-            self.tabla_lab.setItem(i, 3, QtWidgets.QTableWidgetItem(row['Grupo']))
-            self.tabla_lab.setItem(i, 4, QtWidgets.QTableWidgetItem(str(row['Num_Alumnos'])))
+        # Actualizar tabla (el modelo sólo recibe las posiciones)
+        self.modelo_lab.establecer_filas(self.filas, posiciones)
 
     def mostrar_detalle_asignatura(self, row):
         """Mostrar detalle de la asignatura seleccionada"""
@@ -376,30 +493,32 @@ class VerResultados(QtWidgets.QMainWindow):
             return
 
         asig_text = self.lista_asignaturas.item(row).text().replace("📚 ", "")
-        datos_asig = self.datos_horarios[self.datos_horarios['Asignatura'] == asig_text]
+        posiciones = self.filas_por_asignatura.get(asig_text, [])
+        filas_asig = [self.filas[i] for i in posiciones]
+        total_alumnos = sum(fila['Num_Alumnos'] for fila in filas_asig)
+        laboratorios = [str(lab) for lab in dict.fromkeys(fila['Laboratorio'] for fila in filas_asig)]
 
         detalle = f"ASIGNATURA: {asig_text}\n"
         detalle += "=" * 50 + "\n\n"
         detalle += f"📊 Estadísticas:\n"
-        detalle += f"• Total grupos: {len(datos_asig)}\n"
-        detalle += f"• Total alumnos: {datos_asig['Num_Alumnos'].sum()}\n"
-        detalle += f"• Promedio alumnos/grupo: {datos_asig['Num_Alumnos'].mean():.1f}\n"
-        detalle += f"• Laboratorios usados: {', '.join(datos_asig['Laboratorio'].unique())}\n\n"
+        detalle += f"• Total grupos: {len(filas_asig)}\n"
+        detalle += f"• Total alumnos: {total_alumnos}\n"
+        detalle += f"• Promedio alumnos/grupo: {total_alumnos / max(len(filas_asig), 1):.1f}\n"
+        por_asignatura = self.metricas.get('por_asignatura')
+        if por_asignatura is not None and asig_text in por_asignatura.index:
+            equilibrio = por_asignatura.loc[asig_text]
+            detalle += (f"• Tamaño de grupo: {equilibrio['minimo']:.0f}-{equilibrio['maximo']:.0f} "
+                        f"(varianza {equilibrio['varianza']:.2f}, Gini {equilibrio['gini']:.3f})\n")
+        detalle += f"• Laboratorios usados: {', '.join(laboratorios)}\n\n"
 
         detalle += f"📋 Distribución de grupos:\n"
-        for _, row in datos_asig.iterrows():
-            detalle += f"• {row['Grupo']}: {row['Num_Alumnos']} alumnos → {row['Laboratorio']} ({row['Dia']} {row['Hora_Inicio']}-{row['Hora_Fin']})\n"
+        for fila in filas_asig:
+            detalle += f"• {fila['Grupo']}: {fila['Num_Alumnos']} alumnos → {fila['Laboratorio']} ({fila['Dia']} {fila['Hora_Inicio']}-{fila['Hora_Fin']})\n"
 
         self.detalle_asignatura.setText(detalle)
 
         # Actualizar tabla de grupos
-        self.tabla_grupos.setRowCount(len(datos_asig))
-        for i, (_, row) in enumerate(datos_asig.iterrows()):
-            self.tabla_grupos.setItem(i, 0, QtWidgets.QTableWidgetItem(row['Grupo']))
-            self.tabla_grupos.setItem(i, 1, QtWidgets.QTableWidgetItem(row['Dia']))
-            self.tabla_grupos.setItem(i, 2, QtWidgets.QTableWidgetItem(f"{row['Hora_Inicio']}-{row['Hora_Fin']}"))
-            self.tabla_grupos.setItem(i, 3, QtWidgets.QTableWidgetItem(row['Laboratorio']))
-            self.tabla_grupos.setItem(i, 4, QtWidgets.QTableWidgetItem(str(row['Num_Alumnos'])))
+        self.modelo_grupos.establecer_filas(self.filas, posiciones)
 
     def mostrar_dia_calendario(self, fecha):
         """Mostrar detalle del día seleccionado en calendario"""
@@ -409,14 +528,15 @@ class VerResultados(QtWidgets.QMainWindow):
         dia_semana = ['Lunes', 'Martes', 'Miércoles', 'Jueves', 'Viernes'][fecha.dayOfWeek() - 1]
 
         if self.datos_horarios is not None:
-            datos_dia = self.datos_horarios[self.datos_horarios['Dia'] == dia_semana]
+            posiciones = self.filas_por_dia.get(dia_semana, [])
 
-            if not datos_dia.empty:
+            if posiciones:
                 detalle = f"Clases programadas para {dia_semana}:\n\n"
-                for _, row in datos_dia.iterrows():
-                    detalle += f"🏢 {row['Laboratorio']}\n"
-                    detalle += f"   {row['Hora_Inicio']}-{row['Hora_Fin']} → {row['Asignatura']} ({row['Grupo']})\n"
-                    detalle += f"   👥 {row['Num_Alumnos']} alumnos\n\n"
+                for i in posiciones:
+                    fila = self.filas[i]
+                    detalle += f"🏢 {fila['Laboratorio']}\n"
+                    detalle += f"   {fila['Hora_Inicio']}-{fila['Hora_Fin']} → {fila['Asignatura']} ({fila['Grupo']})\n"
+                    detalle += f"   👥 {fila['Num_Alumnos']} alumnos\n\n"
             else:
                 detalle = f"No hay clases programadas para {dia_semana}"
         else:
@@ -432,12 +552,11 @@ class VerResultados(QtWidgets.QMainWindow):
         if self.check_horarios.isChecked():
             preview += "📊 HORARIOS POR LABORATORIO\n"
             preview += "-" * 30 + "\n"
-            if self.datos_horarios is not None:
-                for lab in self.datos_horarios['Laboratorio'].unique():
-                    preview += f"\n🏢 {lab}:\n"
-                    datos_lab = self.datos_horarios[self.datos_horarios['Laboratorio'] == lab]
-                    for _, row in datos_lab.iterrows():
-                        preview += f"  {row['Dia']} {row['Hora_Inicio']}-{row['Hora_Fin']} → {row['Asignatura']} ({row['Num_Alumnos']} alumnos)\n"
+            for lab, posiciones in self.filas_por_lab.items():
+                preview += f"\n🏢 {lab}:\n"
+                for i in posiciones:
+                    fila = self.filas[i]
+                    preview += f"  {fila['Dia']} {fila['Hora_Inicio']}-{fila['Hora_Fin']} → {fila['Asignatura']} ({fila['Num_Alumnos']} alumnos)\n"
             preview += "\n"
 
         if self.check_estadisticas_exp.isChecked():
@@ -446,45 +565,102 @@ class VerResultados(QtWidgets.QMainWindow):
             for key, valor in self.estadisticas.items():
                 key_display = key.replace('_', ' ').title()
                 preview += f"• {key_display}: {valor}\n"
+            if self.metricas:
+                preview += "\n🕐 Ocupación de laboratorios por hora:\n"
+                for hora, porcentaje in self.metricas['utilizacion_hora'].items():
+                    preview += f"  {hora:02d}:00 {porcentaje:5.1f}%\n"
 
         self.preview_exportar.setText(preview)
 
     def exportar_resultados(self):
-        """Exportar resultados en los formatos seleccionados"""
-        try:
-            formatos = []
-            if self.check_excel.isChecked():
-                formatos.append("Excel")
-            if self.check_pdf.isChecked():
-                formatos.append("PDF")
-            if self.check_csv.isChecked():
-                formatos.append("CSV")
-
-            if not formatos:
-                self.mostrar_mensaje("⚠️ Aviso", "Selecciona al menos un formato para exportar")
-                return
+        """Exportar resultados en los formatos seleccionados (en segundo plano)"""
+        if self.hilo_exportacion is not None and self.hilo_exportacion.isRunning():
+            self.hilo_exportacion.cancelar()
+            self.btn_exportar.setEnabled(False)
+            self.btn_exportar.setText("⏳ Cancelando...")
+            return
 
-            archivos_generados = []
-            for formato in formatos:
-                archivo = f"horarios_laboratorios.{formato.lower()}"
-                archivos_generados.append(archivo)
+        formatos = []
+        if self.check_excel.isChecked():
+            formatos.append('excel')
+        if self.check_pdf.isChecked():
+            formatos.append('pdf')
+        if self.check_csv.isChecked():
+            formatos.append('csv')
 
-            mensaje = f"✅ Exportación completada!\n\nArchivos generados:\n"
-            for archivo in archivos_generados:
-                mensaje += f"• {archivo}\n"
+        if not formatos:
+            self.mostrar_mensaje("⚠️ Aviso", "Selecciona al menos un formato para exportar")
+            return
+        if self.datos_horarios is None or self.datos_horarios.empty:
+            self.mostrar_mensaje("⚠️ Aviso", "No hay resultados cargados para exportar")
+            return
+
+        vistas = []
+        if self.check_horarios.isChecked():
+            vistas.append('laboratorios')
+        if self.check_grupos.isChecked():
+            vistas.append('asignaturas')
+        if self.check_dias.isChecked():
+            vistas.append('dias')
+
+        parametros = {
+            'tabla': self.datos_horarios,
+            # Secuencia propia: la caché de bloques de self.filas es de la interfaz
+            'filas': FilasPerezosas(self.resultados) if self.resultados is not None else self.filas,
+            'directorio': os.path.dirname(os.path.abspath(self.archivo_resultado)),
+            'formatos': formatos,
+            'vistas': vistas,
+            'estadisticas': self.check_estadisticas_exp.isChecked(),
+            'metricas': self.metricas or None,
+            'individuales': self.check_individuales.isChecked()
+        }
 
-            self.mostrar_mensaje("✅ Éxito", mensaje)
+        self.progress_exportar.setValue(0)
+        self.progress_exportar.setVisible(True)
+        self.btn_exportar.setText("⏹️ Cancelar")
+        self.hilo_exportacion = HiloExportacion(parametros, parent=self)
+        self.hilo_exportacion.progreso.connect(self.progreso_exportacion)
+        self.hilo_exportacion.terminado.connect(self.exportacion_terminada)
+        self.hilo_exportacion.start()
+
+    def progreso_exportacion(self, porcentaje, mensaje):
+        self.progress_exportar.setValue(porcentaje)
+        self.label_progreso_exportar.setText(mensaje)
+
+    def exportacion_terminada(self, archivos, error):
+        """Recoger el resultado del hilo de exportación"""
+        self.progress_exportar.setVisible(False)
+        self.label_progreso_exportar.setText("")
+        self.btn_exportar.setText("🚀 Exportar Todo")
+        self.btn_exportar.setEnabled(True)
+        self.hilo_exportacion = None
 
-        except Exception as e:
-            self.mostrar_mensaje("❌ Error", f"Error en exportación:\n{str(e)}")
+        if archivos is None:
+            if error:
+                self.mostrar_mensaje("❌ Error", f"Error en exportación:\n{error}")
+            return
+
+        mensaje = f"✅ Exportación completada!\n\nArchivos generados:\n"
+        for archivo in archivos[:10]:
+            mensaje += f"• {archivo}\n"
+        if len(archivos) > 10:
+            mensaje += f"• ... y {len(archivos) - 10} más\n"
+        if not archivos:
+            mensaje += "• Ninguno (los informes no han cambiado desde la última exportación)\n"
+        self.mostrar_mensaje("✅ Éxito", mensaje)
 
     def abrir_archivo_externo(self):
         """Abrir archivo de resultados con programa externo"""
         try:
-            if os.path.exists(self.archivo_resultado):
-                os.startfile(self.archivo_resultado)  # Windows
+            ruta = localizar_resultados(self.archivo_resultado)
+            if self.resultados is not None:
+                # El archivo columnar no lo abre una hoja de cálculo: se exporta a Excel
+                ruta = ruta_excel(ruta)
+                self.resultados.leer().to_excel(ruta, index=False)
+            if os.path.exists(ruta):
+                os.startfile(ruta)  # Windows
             else:
-                self.mostrar_mensaje("❌ Error", f"Archivo no encontrado:\n{self.archivo_resultado}")
+                self.mostrar_mensaje("❌ Error", f"Archivo no encontrado:\n{ruta}")
         except Exception as e:
             self.mostrar_mensaje("❌ Error", f"Error abriendo archivo:\n{str(e)}")
 
@@ -558,7 +734,7 @@ class VerResultados(QtWidgets.QMainWindow):
                 padding: 10px;
                 border-bottom: 1px solid rgb(60,60,60);
             }
-            QTableWidget {
+            QTableView {
                 background-color: rgb(42,42,42);
                 color: white;
                 border: 1px solid rgb(127,127,127);
@@ -566,11 +742,11 @@ class VerResultados(QtWidgets.QMainWindow):
                 font-size: 11px;
                 border-radius: 3px;
             }
-            QTableWidget::item {
+            QTableView::item {
                 border-bottom: 1px solid rgb(127,127,127);
                 padding: 8px;
             }
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background-color: rgb(42,130,218);
             }
             QHeaderView::section {
@@ -0,0 +1,9 @@
+"""
+Motor de scheduling para OPTIM - Sistema de Programación de Laboratorios
+"""
+
+from .calendario_lectivo import IndiceCalendario
+from .motor import MotorScheduling, ProgramacionCancelada, generar_horarios
+from .optimizacion import optimizar_horarios
+
+__all__ = ['IndiceCalendario', 'MotorScheduling', 'ProgramacionCancelada', 'generar_horarios', 'optimizar_horarios']
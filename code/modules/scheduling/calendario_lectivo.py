@@ -0,0 +1,139 @@
+"""
+Índice compilado del calendario académico
+Traduce datos_calendario (ver data_sources/calendario.py) a una tabla fecha →
+horario de día de la semana que se aplica y a una matriz semestre × día con
+las sesiones que tiene cada horario semanal, para que el motor compruebe los
+totales del semestre sin recorrer otra vez el JSON
+"""
+
+from datetime import date
+
+import numpy as np
+
+from modules.utils.franjas import CLAVES_DIAS, DIAS_SEMANA
+
+SEMESTRES = ('semestre_1', 'semestre_2')
+
+# Tipos de día especial que cambian el horario ('horario_martes' → se da el del martes)
+TIPOS_CAMBIO_HORARIO = {f"horario_{clave}": i for i, clave in enumerate(CLAVES_DIAS)}
+
+
+def indice_semestre(semestre):
+    """Posición del semestre en la matriz: acepta 1/2 o 'semestre_1'/'semestre_2'"""
+    if isinstance(semestre, str):
+        return SEMESTRES.index(semestre)
+    return int(semestre) - 1
+
+
+def indice_dia(dia):
+    """Posición del día: acepta 0..4, 'lunes' o 'Lunes'"""
+    if isinstance(dia, str):
+        clave = dia.lower()
+        if clave in CLAVES_DIAS:
+            return CLAVES_DIAS.index(clave)
+        return DIAS_SEMANA.index(dia)
+    return int(dia)
+
+
+def _dia_cambiado(configuracion):
+    """Día cuyo horario impone un día especial (None si no lo cambia)"""
+    if not configuracion:
+        return None
+    return TIPOS_CAMBIO_HORARIO.get(configuracion.get('tipo'))
+
+
+class IndiceCalendario:
+    """
+    Días lectivos de cada semestre con el horario que se sigue en cada uno
+
+    Un día marcado como 'horario_viernes' cuenta como sesión del viernes, no del
+    día en que cae; 'horario_especial' y los días normales siguen su propio horario.
+    """
+
+    def __init__(self, dias_por_semestre):
+        """
+        Args:
+            dias_por_semestre (dict): {semestre: [(fecha o None, día efectivo 0..4)]};
+                fecha None para los datos antiguos sin fecha completa
+        """
+        self.fechas = {}
+        self._dia_efectivo = {}
+        self._semestre = {}
+        filas = []
+        for semestre in SEMESTRES:
+            dias = dias_por_semestre.get(semestre, [])
+            fechas = sorted(fecha for fecha, _ in dias if fecha is not None)
+            self.fechas[semestre] = fechas
+            for fecha, efectivo in dias:
+                if fecha is not None:
+                    self._dia_efectivo[fecha] = efectivo
+                    self._semestre[fecha] = semestre
+            filas.append([efectivo for _, efectivo in dias])
+
+        self.sesiones = np.array([np.bincount(np.asarray(fila, dtype=np.int64), minlength=len(CLAVES_DIAS))
+                                  for fila in filas], dtype=np.int64)
+
+    @classmethod
+    def desde_datos(cls, datos_calendario):
+        """
+        Compilar el índice a partir de datos_calendario
+
+        Con 'fechas' (fechas ISO por semestre y columna) se indexa cada fecha; los
+        datos antiguos sólo traen los días como se muestran ('30*') y entonces sólo
+        se cuentan las sesiones, con los cambios de horario de sus claves.
+        """
+        especiales = datos_calendario.get('dias_especiales', {})
+        fechas = datos_calendario.get('fechas')
+        dias_por_semestre = {}
+        for semestre in SEMESTRES:
+            dias = []
+            if fechas:
+                for columna, clave in enumerate(CLAVES_DIAS):
+                    for iso in fechas.get(semestre, {}).get(clave, []):
+                        cambio = _dia_cambiado(especiales.get(iso))
+                        dias.append((date.fromisoformat(iso), columna if cambio is None else cambio))
+            else:
+                for columna, clave in enumerate(CLAVES_DIAS):
+                    for texto in datos_calendario.get(semestre, {}).get(clave, []):
+                        cambio = _dia_cambiado(especiales.get(texto))
+                        dias.append((None, columna if cambio is None else cambio))
+            dias_por_semestre[semestre] = dias
+        return cls(dias_por_semestre)
+
+    def __len__(self):
+        return len(self._dia_efectivo)
+
+    def es_lectivo(self, fecha, semestre=None):
+        if semestre is None:
+            return fecha in self._semestre
+        return self._semestre.get(fecha) == SEMESTRES[indice_semestre(semestre)]
+
+    def dia_efectivo(self, fecha):
+        """Día (0..4) cuyo horario se sigue en la fecha, None si no es lectiva"""
+        return self._dia_efectivo.get(fecha)
+
+    def fechas_de(self, semestre, dia):
+        """Fechas del semestre en que se da el horario de un día de la semana"""
+        dia = indice_dia(dia)
+        return [fecha for fecha in self.fechas[SEMESTRES[indice_semestre(semestre)]]
+                if self._dia_efectivo[fecha] == dia]
+
+    def sesiones_por_dia(self, semestre):
+        """Sesiones del semestre de cada horario semanal (lunes..viernes)"""
+        return list(self.sesiones[indice_semestre(semestre)])
+
+    def sesiones_de(self, semestre, dia):
+        return int(self.sesiones[indice_semestre(semestre)][indice_dia(dia)])
+
+    def sesiones_grupos(self, semestres, dias):
+        """
+        Sesiones del semestre de muchos grupos a la vez
+
+        Args:
+            semestres: semestre de cada grupo (1/2)
+            dias: día de la semana (0..4) asignado a cada grupo
+
+        Returns:
+            array con las sesiones de cada grupo
+        """
+        return self.sesiones[np.asarray(semestres, dtype=np.int64) - 1, np.asarray(dias, dtype=np.int64)]
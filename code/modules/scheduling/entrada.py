@@ -0,0 +1,82 @@
+"""
+Carga de los archivos de entrada del motor de scheduling
+Normaliza alumnos, asignaturas, laboratorios y profesores en diccionarios
+"""
+
+from modules.data_sources.alumnos import cargar_indice_alumnos
+from modules.data_sources.profesores import cargar_profesores
+from modules.data_sources.tablas import leer_tabla
+
+
+def _entero(valor, defecto=0):
+    """Convertir a entero tolerando '2.0' o vacíos"""
+    try:
+        return int(float(valor))
+    except (TypeError, ValueError):
+        return defecto
+
+
+def cargar_alumnos(ruta):
+    """Cargar alumnos → IndiceAlumnos (se comporta como {dni: [asignaturas]})"""
+    return cargar_indice_alumnos(ruta)
+
+
+def cargar_asignaturas(ruta):
+    """Cargar asignaturas → {nombre: {laboratorios, duracion_horas, semestre}}"""
+    asignaturas = {}
+    for fila in leer_tabla(ruta):
+        nombre = fila.get('asignatura', '')
+        if not nombre:
+            continue
+        datos = asignaturas.setdefault(nombre, {
+            'laboratorios': [],
+            'duracion_horas': _entero(fila.get('duracion_horas'), 2),
+            'semestre': _entero(fila.get('semestre'), 0)
+        })
+        laboratorio = fila.get('laboratorio', '')
+        if laboratorio and laboratorio not in datos['laboratorios']:
+            datos['laboratorios'].append(laboratorio)
+    return asignaturas
+
+
+def cargar_laboratorios(ruta):
+    """Cargar laboratorios disponibles → {nombre: {capacidad}}"""
+    laboratorios = {}
+    for fila in leer_tabla(ruta):
+        nombre = fila.get('nombre', '')
+        if not nombre:
+            continue
+        if fila.get('disponible', 'Si').lower() in ('no', 'false', '0'):
+            continue
+        laboratorios[nombre] = {'capacidad': _entero(fila.get('capacidad'), 0)}
+    return laboratorios
+
+
+def cargar_datos_entrada(path_alumnos, path_asignaturas, path_laboratorios, path_profesores, cancelado=None,
+                         cache=None):
+    """
+    Cargar los cuatro archivos obligatorios
+
+    Args:
+        cancelado (callable): se consulta entre archivos; si devuelve True se aborta
+        cache (CacheEntradas): si se indica, los archivos sin cambios no se vuelven a parsear
+
+    Returns:
+        dict: {'alumnos', 'asignaturas', 'laboratorios', 'profesores'} o None si se canceló
+    """
+    cargadores = [
+        ('alumnos', cargar_alumnos, path_alumnos),
+        ('asignaturas', cargar_asignaturas, path_asignaturas),
+        ('laboratorios', cargar_laboratorios, path_laboratorios),
+        ('profesores', cargar_profesores, path_profesores)
+    ]
+
+    datos = {}
+    for clave, cargador, ruta in cargadores:
+        if cancelado is not None and cancelado():
+            return None
+        if cache is not None:
+            datos[clave] = cache.cargar(clave, cargador, ruta)
+        else:
+            datos[clave] = cargador(ruta)
+    return datos
@@ -0,0 +1,743 @@
+#!/usr/bin/env python3
+"""
+Motor de scheduling de laboratorios
+Forma grupos por asignatura y les asigna laboratorio, día y hora mediante
+propagación de restricciones (forward checking + heurística MRV)
+"""
+
+import hashlib
+import heapq
+import math
+import random
+import time
+
+import numpy as np
+
+from modules.utils.cache_entradas import CacheEntradas
+from modules.utils.grupos_equilibrados import calcular_numero_grupos, repartir_grupos, tamanos_equilibrados
+from modules.utils.resultados_columnar import guardar_resultados
+
+from .calendario_lectivo import IndiceCalendario
+from .entrada import cargar_datos_entrada
+from modules.utils.franjas import (DIAS_SEMANA, MINUTOS_FRANJA, NUM_FRANJAS, franja_a_hora, hora_a_minutos,
+                                  mascara_intervalo)
+
+
+def _resumen_matricula(dnis):
+    """Hash BLAKE2 de los DNIs matriculados, independiente del orden y del proceso
+
+    hash() de Python lleva una semilla distinta en cada proceso, y la firma
+    viaja desde los trabajadores de optimizacion.py al proceso de la interfaz.
+    """
+    resumen = hashlib.blake2b(digest_size=16)
+    for dni in sorted(dnis):
+        resumen.update(str(dni).encode('utf-8'))
+        resumen.update(b'\0')
+    return resumen.hexdigest()
+
+
+class ProgramacionCancelada(Exception):
+    """La generación de horarios se canceló antes de terminar"""
+
+
+class Grupo:
+    """Grupo de laboratorio de una asignatura"""
+
+    __slots__ = ('indice', 'asignatura', 'nombre', 'alumnos', 'franjas', 'labs', 'profesores',
+                 'candidatos', 'dominio', 'bloqueo', 'vecinos', 'asignacion')
+
+    def __init__(self, indice, asignatura, numero, alumnos, franjas):
+        self.indice = indice
+        self.asignatura = asignatura
+        self.nombre = f"{asignatura.replace(' ', '_')}_G{numero}"
+        self.alumnos = alumnos
+        self.franjas = franjas  # Duración de la sesión en franjas
+        self.labs = []  # Laboratorios compatibles (índices)
+        self.profesores = []  # Profesores posibles (índices, vacío = sin profesor)
+        self.candidatos = []  # [(lab, dia, mascara, profesor, franja_inicio)]
+        self.dominio = []  # Candidatos todavía compatibles durante la búsqueda
+        self.bloqueo = [0] * len(DIAS_SEMANA)  # Franjas ocupadas por grupos con alumnos comunes
+        self.vecinos = set()  # Índices de grupos con algún alumno en común
+        self.asignacion = None
+
+
+class MotorScheduling:
+    def __init__(self, datos, semestre=None, capacidad_maxima=24, grupos_pares=True,
+                 paso_inicio=2, descanso=('14:00', '15:00'), semilla=None, calendario=None):
+        """
+        Args:
+            datos (dict): salida de cargar_datos_entrada
+            semestre (int): filtrar asignaturas por semestre (None = todas)
+            capacidad_maxima (int): tope de alumnos por grupo
+            grupos_pares (bool): grupos equilibrados en número par (ParticionadorGrupos)
+            paso_inicio (int): separación en franjas entre horas de inicio posibles
+            descanso (tuple): franja sin laboratorios ('HH:MM', 'HH:MM') o None
+            semilla (int): si se indica, los empates del MRV se rompen al azar
+                (cada semilla produce una solución distinta; ver optimizacion.py)
+            calendario (IndiceCalendario): si se indica, las estadísticas incluyen las
+                sesiones del semestre que suman los grupos asignados
+        """
+        self.semestre = semestre
+        self.calendario = calendario
+        self.capacidad_maxima = capacidad_maxima
+        self.grupos_pares = grupos_pares
+        self.paso_inicio = max(1, paso_inicio)
+        self.semilla = semilla
+        self.aleatorio = random.Random(semilla) if semilla is not None else None
+        self.mascara_descanso = 0
+        if descanso:
+            self.mascara_descanso = mascara_intervalo(hora_a_minutos(descanso[0]), hora_a_minutos(descanso[1]))
+
+        self._indexar_datos(datos)
+
+        self.grupos = []
+        self.grupos_por_lab = [set() for _ in self.laboratorios]
+        self.grupos_por_profesor = [set() for _ in self.profesores]
+        self.estadisticas = {}
+        self.tiempo_ejecucion = 0.0
+        self.penalizacion = []  # Veces que cada grupo acabó en conflicto (adelanta su turno)
+        self.cambios = []  # [(grupo, fila_anterior, fila_nueva)] de la última actualización
+        self._firma = None
+
+    def _indexar_datos(self, datos):
+        """Índices de recursos (nombre ↔ posición) a partir de los datos de entrada"""
+        self.datos = datos
+        self.laboratorios = sorted(datos['laboratorios'])
+        self.capacidades = [datos['laboratorios'][lab]['capacidad'] for lab in self.laboratorios]
+        self.indice_lab = {lab: i for i, lab in enumerate(self.laboratorios)}
+
+        # Disponibilidad ya compilada a máscaras: aquí no se parsea ningún texto
+        self.profesores = datos['profesores'].nombres
+        self.disponibilidad = datos['profesores'].mascaras
+        self.indice_profesor = {nombre: i for i, nombre in enumerate(self.profesores)}
+        self.profesores_asignatura = {}
+        for i, asignaturas in enumerate(datos['profesores'].asignaturas):
+            for asignatura in asignaturas:
+                self.profesores_asignatura.setdefault(asignatura, []).append(i)
+
+        self.asignaturas = [
+            nombre for nombre, info in datos['asignaturas'].items()
+            if self.semestre is None or not info['semestre'] or info['semestre'] == self.semestre
+        ]
+
+    # ========= PREPARACIÓN =========
+
+    def preparar(self):
+        """Formar grupos y calcular sus candidatos y vecindades"""
+        self.grupos = []
+        for asignatura, repartos in self._repartir_alumnos().items():
+            self._formar_grupos(asignatura, repartos)
+
+        for grupo in self.grupos:
+            self._construir_candidatos(grupo)
+
+        self._indexar_recursos()
+        self._construir_vecinos()
+        self.penalizacion = [0] * len(self.grupos)
+        self._firma = self._calcular_firma()
+
+    def _formar_grupos(self, asignatura, repartos):
+        duracion = self.datos['asignaturas'][asignatura]['duracion_horas'] * 60
+        franjas = max(1, math.ceil(duracion / MINUTOS_FRANJA))
+        for numero, alumnos in enumerate(repartos, start=1):
+            self.grupos.append(Grupo(len(self.grupos), asignatura, numero, alumnos, franjas))
+
+    def _capacidad_asignatura(self, asignatura):
+        """Capacidad útil de un grupo según los laboratorios compatibles"""
+        capacidades = [
+            self.capacidades[self.indice_lab[lab]]
+            for lab in self.datos['asignaturas'][asignatura]['laboratorios']
+            if lab in self.indice_lab
+        ]
+        if not capacidades or max(capacidades) <= 0:
+            return self.capacidad_maxima
+        return min(self.capacidad_maxima, max(capacidades))
+
+    def _alumnos_por_asignatura(self, asignaturas):
+        """{asignatura: [dni, ...]} para las asignaturas indicadas"""
+        alumnos = self.datos['alumnos']
+        if hasattr(alumnos, 'alumnos_de'):
+            return {asignatura: alumnos.alumnos_de(asignatura) for asignatura in asignaturas}
+
+        alumnos_asignatura = {asignatura: [] for asignatura in asignaturas}
+        for dni, propias in alumnos.items():
+            for asignatura in propias:
+                if asignatura in alumnos_asignatura:
+                    alumnos_asignatura[asignatura].append(dni)
+        return alumnos_asignatura
+
+    def _repartir_alumnos(self, asignaturas=None):
+        """
+        Repartir los alumnos de cada asignatura en grupos
+
+        Con grupos_pares se usa el particionador equilibrado (número par de
+        grupos alineados por perfil de matrícula); si no, bloques consecutivos.
+        """
+        if asignaturas is None:
+            asignaturas = self.asignaturas
+        capacidades = {asignatura: self._capacidad_asignatura(asignatura) for asignatura in asignaturas}
+
+        if self.grupos_pares:
+            return repartir_grupos(self.datos['alumnos'], capacidades, pares=True, semilla=self.semilla or 0)
+
+        alumnos_asignatura = self._alumnos_por_asignatura(asignaturas)
+
+        repartos = {}
+        for asignatura, alumnos in alumnos_asignatura.items():
+            if not alumnos:
+                continue
+            alumnos = sorted(alumnos)
+            num_grupos = calcular_numero_grupos(len(alumnos), capacidades[asignatura], pares=False)
+            repartos[asignatura] = []
+            inicio = 0
+            for tam in tamanos_equilibrados(len(alumnos), num_grupos):
+                repartos[asignatura].append(alumnos[inicio:inicio + tam])
+                inicio += tam
+        return repartos
+
+    def _construir_candidatos(self, grupo):
+        """Enumerar (laboratorio, día, franja, profesor) compatibles con el grupo"""
+        tam = len(grupo.alumnos)
+        labs = [
+            self.indice_lab[lab]
+            for lab in self.datos['asignaturas'][grupo.asignatura]['laboratorios']
+            if lab in self.indice_lab and self.capacidades[self.indice_lab[lab]] >= tam
+        ]
+        profesores = self.profesores_asignatura.get(grupo.asignatura, [])
+
+        base = (1 << grupo.franjas) - 1
+        inicios = [franja for franja in range(0, NUM_FRANJAS - grupo.franjas + 1, self.paso_inicio)
+                   if not (base << franja) & self.mascara_descanso]
+
+        candidatos = []
+        if labs and inicios:
+            if profesores:
+                # Disponibilidad de todos los profesores en todos los días e inicios de una vez
+                libres = self.datos['profesores'].libres(profesores, [base << franja for franja in inicios])
+                huecos = [(dia, inicios[i], profesores[p]) for dia, i, p in np.argwhere(libres).tolist()]
+            else:
+                huecos = [(dia, franja, -1) for dia in range(len(DIAS_SEMANA)) for franja in inicios]
+            candidatos = [(lab, dia, base << franja, profesor, franja)
+                          for dia, franja, profesor in huecos for lab in labs]
+
+        grupo.candidatos = candidatos
+        grupo.labs = labs
+        grupo.profesores = list(profesores)
+
+    def _indexar_recursos(self):
+        """Índices laboratorio → grupos y profesor → grupos para el forward checking"""
+        self.grupos_por_lab = [set() for _ in self.laboratorios]
+        self.grupos_por_profesor = [set() for _ in self.profesores]
+        for grupo in self.grupos:
+            for lab in grupo.labs:
+                self.grupos_por_lab[lab].add(grupo.indice)
+            for profesor in grupo.profesores:
+                self.grupos_por_profesor[profesor].add(grupo.indice)
+
+    def _construir_vecinos(self):
+        """Índice alumno → grupos para detectar grupos que no pueden solaparse"""
+        for grupo in self.grupos:
+            grupo.vecinos = set()
+
+        grupos_alumno = {}
+        for grupo in self.grupos:
+            for dni in grupo.alumnos:
+                grupos_alumno.setdefault(dni, []).append(grupo.indice)
+
+        for indices in grupos_alumno.values():
+            if len(indices) < 2:
+                continue
+            for i in indices:
+                self.grupos[i].vecinos.update(indices)
+
+        for grupo in self.grupos:
+            grupo.vecinos.discard(grupo.indice)
+
+    def _calcular_firma(self):
+        """Resumen de las entradas para detectar qué cambia entre ejecuciones"""
+        profesores = self.datos['profesores']
+        matriculas = self._alumnos_por_asignatura(self.asignaturas)
+        return {
+            'laboratorios': {lab: dict(info) for lab, info in self.datos['laboratorios'].items()},
+            'profesores': {
+                nombre: (tuple(profesores.mascaras[i]), tuple(profesores.asignaturas[i]))
+                for i, nombre in enumerate(profesores.nombres)
+            },
+            'asignaturas': {
+                asignatura: (
+                    tuple(self.datos['asignaturas'][asignatura]['laboratorios']),
+                    self.datos['asignaturas'][asignatura]['duracion_horas'],
+                    self._capacidad_asignatura(asignatura),
+                    _resumen_matricula(matriculas[asignatura])
+                )
+                for asignatura in self.asignaturas
+            }
+        }
+
+    # ========= RESOLUCIÓN =========
+
+    def resolver(self, progreso=None, cancelado=None):
+        """
+        Asignar todos los grupos con MRV + forward checking
+
+        Args:
+            progreso (callable): progreso(porcentaje, mensaje)
+            cancelado (callable): devuelve True si hay que abortar
+
+        Returns:
+            list: filas de resultado (una por grupo)
+        """
+        return self._resolver(set(range(len(self.grupos))), progreso, cancelado)
+
+    def _resolver(self, pendientes, progreso=None, cancelado=None):
+        """Asignar los grupos pendientes respetando las asignaciones del resto"""
+        num_dias = len(DIAS_SEMANA)
+        ocupacion_lab = [[0] * num_dias for _ in self.laboratorios]
+        ocupacion_prof = [[0] * num_dias for _ in self.profesores]
+        carga_asignatura = {asignatura: [0] * num_dias for asignatura in self.asignaturas}
+        carga_lab = [[0] * num_dias for _ in self.laboratorios]
+
+        def ocupar(grupo):
+            lab, dia, mascara, profesor, _ = grupo.asignacion
+            ocupacion_lab[lab][dia] |= mascara
+            if profesor >= 0:
+                ocupacion_prof[profesor][dia] |= mascara
+            carga_asignatura[grupo.asignatura][dia] += 1
+            carga_lab[lab][dia] += 1
+            for vecino in grupo.vecinos:
+                self.grupos[vecino].bloqueo[dia] |= mascara
+
+        def compatible(c, bloqueo):
+            return not (
+                ocupacion_lab[c[0]][c[1]] & c[2]
+                or (c[3] >= 0 and ocupacion_prof[c[3]][c[1]] & c[2])
+                or bloqueo[c[1]] & c[2]
+            )
+
+        for grupo in self.grupos:
+            grupo.bloqueo = [0] * num_dias
+            if grupo.indice in pendientes:
+                grupo.asignacion = None
+
+        # Las asignaciones que se conservan ocupan sus recursos desde el principio
+        fijos = [grupo for grupo in self.grupos if grupo.asignacion is not None]
+        for grupo in fijos:
+            ocupar(grupo)
+        for indice in pendientes:
+            grupo = self.grupos[indice]
+            if fijos:
+                grupo.dominio = [c for c in grupo.candidatos if compatible(c, grupo.bloqueo)]
+            else:
+                grupo.dominio = list(grupo.candidatos)
+
+        if self.aleatorio is not None:
+            prioridad = [self.aleatorio.random() for _ in self.grupos]
+        else:
+            prioridad = [0] * len(self.grupos)
+
+        # MRV (ponderado por conflictos previos); desempate por más restricciones.
+        # Los dominios sólo encogen durante la búsqueda, así que basta un heap con
+        # entradas perezosas: al encoger un dominio se añade otra entrada (que sale
+        # antes) y al extraer se descartan las que ya no corresponden a su tamaño.
+        def entrada(i):
+            grupo = self.grupos[i]
+            return (len(grupo.dominio) / (1 + self.penalizacion[i]), -len(grupo.vecinos), prioridad[i], i,
+                    len(grupo.dominio))
+
+        pendientes = set(pendientes)
+        cola = [entrada(i) for i in pendientes]
+        heapq.heapify(cola)
+        total = len(pendientes) or 1
+        paso_aviso = max(1, total // 20)
+        procesados = 0
+        asignados = 0
+
+        while pendientes:
+            if cancelado is not None and cancelado():
+                raise ProgramacionCancelada()
+
+            *_, actual, tam_dominio = heapq.heappop(cola)
+            if actual not in pendientes or tam_dominio != len(self.grupos[actual].dominio):
+                continue
+            pendientes.discard(actual)
+            grupo = self.grupos[actual]
+            procesados += 1
+
+            if grupo.dominio:
+                asignados += 1
+                cargas = carga_asignatura[grupo.asignatura]
+
+                def clave(c):
+                    return cargas[c[1]], carga_lab[c[0]][c[1]], c[4]
+
+                candidato = min(grupo.dominio, key=clave)
+                lab, dia, _, profesor, _ = candidato
+                grupo.asignacion = candidato
+                ocupar(grupo)
+
+                # Forward checking sólo sobre los grupos que comparten recurso
+                afectados = grupo.vecinos | self.grupos_por_lab[lab]
+                if profesor >= 0:
+                    afectados = afectados | self.grupos_por_profesor[profesor]
+                for indice in afectados & pendientes:
+                    otro = self.grupos[indice]
+                    antes = len(otro.dominio)
+                    otro.dominio = [c for c in otro.dominio if c[1] != dia or compatible(c, otro.bloqueo)]
+                    if len(otro.dominio) != antes:
+                        heapq.heappush(cola, entrada(indice))
+
+            if progreso is not None and (procesados % paso_aviso == 0 or not pendientes):
+                progreso(int(procesados * 100 / total),
+                         f"🏢 {asignados} grupos asignados · {procesados - asignados} conflictos · "
+                         f"{len(pendientes)} pendientes")
+
+        return self.filas_resultado()
+
+    # ========= REPROGRAMACIÓN INCREMENTAL =========
+
+    def actualizar(self, datos, progreso=None, cancelado=None):
+        """
+        Reprogramar tras un cambio en las entradas conservando lo que sigue siendo válido
+
+        Sólo se vuelven a formar los grupos de asignaturas cuya matrícula,
+        duración o capacidad útil cambió; sólo se recalculan los candidatos de
+        las asignaturas que usan un laboratorio o profesor modificado; y sólo se
+        reasignan los grupos cuya asignación dejó de ser válida, los nuevos y
+        los que estaban en conflicto. El resto mantiene laboratorio, día y hora.
+
+        Returns:
+            list: filas de resultado; las diferencias quedan en self.cambios
+        """
+        if self._firma is None:
+            return self.ejecutar(progreso, cancelado)
+
+        inicio = time.perf_counter()
+        filas_anteriores = {fila['Grupo']: fila for fila in self.filas_resultado()}
+        firma_anterior = self._firma
+        laboratorios_anteriores = self.laboratorios
+        profesores_anteriores = self.profesores
+
+        self._indexar_datos(datos)
+        firma = self._calcular_firma()
+
+        # Recursos modificados, añadidos o eliminados
+        labs_cambiados = {
+            lab for lab in firma_anterior['laboratorios'].keys() | firma['laboratorios'].keys()
+            if firma_anterior['laboratorios'].get(lab) != firma['laboratorios'].get(lab)
+        }
+        profesores_cambiados = {
+            nombre for nombre in firma_anterior['profesores'].keys() | firma['profesores'].keys()
+            if firma_anterior['profesores'].get(nombre) != firma['profesores'].get(nombre)
+        }
+
+        # Asignaturas cuyos candidatos pueden cambiar
+        recalcular = set()
+        for asignatura in self.asignaturas:
+            antes = firma_anterior['asignaturas'].get(asignatura)
+            ahora = firma['asignaturas'][asignatura]
+            if antes is None or antes[0] != ahora[0] or labs_cambiados.intersection(ahora[0]):
+                recalcular.add(asignatura)
+        for nombre in profesores_cambiados:
+            for version in (firma_anterior['profesores'].get(nombre), firma['profesores'].get(nombre)):
+                if version is not None:
+                    recalcular.update(version[1])
+
+        # Asignaturas cuyos grupos hay que volver a formar
+        reformar = {
+            asignatura for asignatura in self.asignaturas
+            if firma_anterior['asignaturas'].get(asignatura, (None,))[1:] != firma['asignaturas'][asignatura][1:]
+        }
+
+        if cancelado is not None and cancelado():
+            raise ProgramacionCancelada()
+
+        # Conservar los grupos no afectados, traduciendo índices si cambió la lista de recursos
+        mapa_lab = [self.indice_lab.get(lab, -1) for lab in laboratorios_anteriores]
+        mapa_prof = [self.indice_profesor.get(nombre, -1) for nombre in profesores_anteriores]
+        traducir = mapa_lab != list(range(len(self.laboratorios))) or \
+            mapa_prof != list(range(len(self.profesores)))
+
+        vigentes = set(self.asignaturas)
+        grupos_anteriores = self.grupos
+        self.grupos = []
+        renumerados = False
+        for grupo in grupos_anteriores:
+            if grupo.asignatura not in vigentes or grupo.asignatura in reformar:
+                continue
+            renumerados = renumerados or grupo.indice != len(self.grupos)
+            grupo.indice = len(self.grupos)
+            self.grupos.append(grupo)
+            if not traducir:
+                continue
+            if grupo.asignatura not in recalcular:
+                grupo.candidatos = [self._traducir(c, mapa_lab, mapa_prof) for c in grupo.candidatos]
+                grupo.labs = [mapa_lab[lab] for lab in grupo.labs]
+                grupo.profesores = [mapa_prof[profesor] for profesor in grupo.profesores]
+            if grupo.asignacion is not None:
+                grupo.asignacion = self._traducir(grupo.asignacion, mapa_lab, mapa_prof)
+
+        primer_nuevo = len(self.grupos)
+        if reformar:
+            for asignatura, repartos in self._repartir_alumnos(sorted(reformar)).items():
+                self._formar_grupos(asignatura, repartos)
+
+        self.penalizacion = [0] * len(self.grupos)
+        pendientes = set(range(primer_nuevo, len(self.grupos)))
+        for grupo in self.grupos:
+            if grupo.indice >= primer_nuevo or grupo.asignatura in recalcular:
+                self._construir_candidatos(grupo)
+                if grupo.asignacion is not None and grupo.asignacion not in set(grupo.candidatos):
+                    pendientes.add(grupo.indice)
+            if grupo.asignacion is None:
+                pendientes.add(grupo.indice)
+
+        self._indexar_recursos()
+        # Los vecinos guardan índices: se rehacen si algún grupo se quitó o cambió de posición
+        if reformar or renumerados or len(self.grupos) != len(grupos_anteriores):
+            self._construir_vecinos()
+        self._firma = firma
+
+        if progreso is not None:
+            progreso(20, f"🔁 {len(pendientes)} de {len(self.grupos)} grupos afectados por los cambios")
+
+        def progreso_resolucion(porcentaje, mensaje):
+            if progreso is not None:
+                progreso(20 + int(porcentaje * 0.75), mensaje)
+
+        filas = self._resolver(pendientes, progreso_resolucion, cancelado)
+        self.tiempo_ejecucion = time.perf_counter() - inicio
+
+        filas_nuevas = {fila['Grupo']: fila for fila in filas}
+        self.cambios = [
+            (nombre, filas_anteriores.get(nombre), filas_nuevas.get(nombre))
+            for nombre in sorted(filas_anteriores.keys() | filas_nuevas.keys())
+            if filas_anteriores.get(nombre) != filas_nuevas.get(nombre)
+        ]
+        self.calcular_estadisticas()
+        self.estadisticas['grupos_recalculados'] = len(pendientes)
+        self.estadisticas['cambios'] = len(self.cambios)
+        return filas
+
+    @staticmethod
+    def _traducir(candidato, mapa_lab, mapa_prof):
+        """Candidato con los índices nuevos (None si su laboratorio o profesor ya no existe)"""
+        lab, dia, mascara, profesor, franja = candidato
+        lab = mapa_lab[lab]
+        if profesor >= 0:
+            profesor = mapa_prof[profesor]
+            if profesor < 0:
+                return None
+        if lab < 0:
+            return None
+        return lab, dia, mascara, profesor, franja
+
+    def filas_resultado(self):
+        """Filas con el formato que consume VerResultados"""
+        filas = []
+        for grupo in self.grupos:
+            fila = {
+                'Asignatura': grupo.asignatura,
+                'Grupo': grupo.nombre,
+                'Laboratorio': '',
+                'Profesor': '',
+                'Dia': '',
+                'Hora_Inicio': '',
+                'Hora_Fin': '',
+                'Num_Alumnos': len(grupo.alumnos),
+                'Estado': 'Conflicto'
+            }
+            if grupo.asignacion is not None:
+                lab, dia, _, profesor, franja = grupo.asignacion
+                fila.update({
+                    'Laboratorio': self.laboratorios[lab],
+                    'Profesor': self.profesores[profesor] if profesor >= 0 else '',
+                    'Dia': DIAS_SEMANA[dia],
+                    'Hora_Inicio': franja_a_hora(franja),
+                    'Hora_Fin': franja_a_hora(franja + grupo.franjas),
+                    'Estado': 'Asignado'
+                })
+            filas.append(fila)
+        return filas
+
+    def ejecutar(self, progreso=None, cancelado=None):
+        """Preparar y resolver midiendo el tiempo total"""
+        inicio = time.perf_counter()
+        self.preparar()
+
+        if cancelado is not None and cancelado():
+            raise ProgramacionCancelada()
+
+        if progreso is not None:
+            progreso(20, f"⚖️ {len(self.grupos)} grupos formados en {len(self.asignaturas)} asignaturas")
+
+        def progreso_resolucion(porcentaje, mensaje):
+            if progreso is not None:
+                progreso(20 + int(porcentaje * 0.75), mensaje)
+
+        filas = self.resolver(progreso_resolucion, cancelado)
+        self.tiempo_ejecucion = time.perf_counter() - inicio
+        self.cambios = []
+        self.calcular_estadisticas()
+        return filas
+
+    def restaurar_datos(self, datos):
+        """Reconstruir índices y candidatos de un motor recibido de otro proceso"""
+        self._indexar_datos(datos)
+        self.aleatorio = random.Random(self.semilla) if self.semilla is not None else None
+        for grupo in self.grupos:
+            self._construir_candidatos(grupo)
+        self._indexar_recursos()
+
+    def penalizar_conflictos(self):
+        """Dar más prioridad en la próxima resolución a los grupos que quedaron sin asignar"""
+        for grupo in self.grupos:
+            if grupo.asignacion is None:
+                self.penalizacion[grupo.indice] += 1
+
+    def puntuacion(self):
+        """(conflictos, desequilibrio) de la solución actual: menor es mejor
+
+        El desequilibrio suma, por asignatura, el cuadrado de las sesiones de
+        cada día, así que premia repartir los grupos a lo largo de la semana.
+        """
+        conflictos = 0
+        sesiones = {}
+        for grupo in self.grupos:
+            if grupo.asignacion is None:
+                conflictos += 1
+            else:
+                clave = (grupo.asignatura, grupo.asignacion[1])
+                sesiones[clave] = sesiones.get(clave, 0) + 1
+        return conflictos, sum(n * n for n in sesiones.values())
+
+    def calcular_estadisticas(self):
+        asignados = sum(1 for grupo in self.grupos if grupo.asignacion is not None)
+        self.estadisticas = {
+            'total_grupos': len(self.grupos),
+            'grupos_asignados': asignados,
+            'conflictos': len(self.grupos) - asignados,
+            'alumnos': len(self.datos['alumnos']),
+            'tiempo_ejecucion': f"{self.tiempo_ejecucion:.2f}s"
+        }
+        if self.calendario is not None:
+            self.estadisticas.update(self._sesiones_semestre())
+
+    def _sesiones_semestre(self):
+        """Sesiones del semestre de los grupos asignados según el calendario
+
+        Cada grupo repite su sesión semanal en todos los días lectivos que siguen
+        el horario de su día; los grupos cuyo día no tiene ninguno quedan sin sesiones.
+        """
+        semestres, dias = [], []
+        for grupo in self.grupos:
+            semestre = self.semestre or self.datos['asignaturas'][grupo.asignatura]['semestre']
+            if grupo.asignacion is not None and semestre:
+                semestres.append(semestre)
+                dias.append(grupo.asignacion[1])
+        sesiones = [int(n) for n in self.calendario.sesiones_grupos(semestres, dias)] if dias else []
+        return {
+            'sesiones_semestre': sum(sesiones),
+            'grupos_sin_sesiones': sum(1 for n in sesiones if n == 0)
+        }
+
+
+# Función principal de fachada
+def generar_horarios(path_alumnos, path_asignaturas, path_laboratorios, path_profesores,
+                     semestre=None, capacidad_maxima=24, grupos_pares=True,
+                     archivo_resultado=None, progreso=None, cancelado=None, usar_cache=True,
+                     motor_anterior=None, ajustes_laboratorios=None, optimizar=False,
+                     tiempo_optimizacion=60.0, calendario=None):
+    """
+    Cargar los archivos de entrada, generar la programación y exportarla
+
+    Args:
+        archivo_resultado (str): archivo donde volcar las filas (None = no exportar); con
+            extensión .arrow/.feather se escribe en formato columnar, si no en Excel
+        progreso (callable): progreso(porcentaje, mensaje) con avances por etapa
+        cancelado (callable): devuelve True para abortar la ejecución
+        usar_cache (bool): reutilizar las entradas ya parseadas si los archivos no cambiaron
+        motor_anterior (MotorScheduling): si se indica y los parámetros coinciden, sólo se
+            reprograma lo afectado por los cambios de entrada (ver MotorScheduling.actualizar)
+        ajustes_laboratorios (dict): {nombre: {'capacidad'} o None} aplicados sobre el archivo
+            de laboratorios (p.ej. ediciones hechas en ConfigurarHorarios)
+        optimizar (bool): búsqueda multiarranque en paralelo (ver optimizacion.py)
+        tiempo_optimizacion (float): presupuesto en segundos de la optimización
+        calendario (dict | IndiceCalendario): datos del calendario académico para contar
+            las sesiones del semestre (ver calendario_lectivo.py)
+
+    Returns:
+        tuple: (motor, cod_error, msje_error)
+    """
+    def avisar(porcentaje, mensaje):
+        if progreso is not None:
+            progreso(porcentaje, mensaje)
+
+    try:
+        avisar(0, "📂 Cargando archivos...")
+        cache = CacheEntradas() if usar_cache else None
+        datos = cargar_datos_entrada(path_alumnos, path_asignaturas, path_laboratorios, path_profesores,
+                                     cancelado, cache)
+        if datos is None:
+            return None, 3, "Generación cancelada por el usuario"
+        for nombre, ajuste in (ajustes_laboratorios or {}).items():
+            if ajuste is None:
+                datos['laboratorios'].pop(nombre, None)
+            else:
+                datos['laboratorios'][nombre] = {'capacidad': ajuste['capacidad']}
+        matriculas = sum(len(asignaturas) for asignaturas in datos['alumnos'].values())
+        if cache is not None and cache.aciertos:
+            avisar(5, f"⚡ {cache.aciertos} de 4 archivos recuperados de la caché")
+        avisar(10, f"📂 Cargadas {matriculas} matrículas de {len(datos['alumnos'])} alumnos, "
+                   f"{len(datos['asignaturas'])} asignaturas, {len(datos['laboratorios'])} laboratorios "
+                   f"y {len(datos['profesores'])} profesores")
+    except Exception as e:
+        return None, 1, f"Error cargando archivos de entrada: {str(e)}"
+
+    try:
+        if cancelado is not None and cancelado():
+            raise ProgramacionCancelada()
+
+        if isinstance(calendario, dict):
+            calendario = IndiceCalendario.desde_datos(calendario)
+
+        reutilizable = motor_anterior is not None and (
+            motor_anterior.semestre == semestre
+            and motor_anterior.capacidad_maxima == capacidad_maxima
+            and motor_anterior.grupos_pares == grupos_pares
+        )
+        if optimizar:
+            from .optimizacion import optimizar_horarios
+
+            def progreso_optimizacion(porcentaje, mensaje):
+                avisar(10 + int(porcentaje * 0.85), mensaje)
+
+            motor = optimizar_horarios(datos, semestre=semestre, capacidad_maxima=capacidad_maxima,
+                                       grupos_pares=grupos_pares, tiempo_maximo=tiempo_optimizacion,
+                                       progreso=progreso_optimizacion, cancelado=cancelado)
+            filas = motor.filas_resultado()
+        elif reutilizable:
+            motor = motor_anterior
+            filas = motor.actualizar(datos, progreso, cancelado)
+        else:
+            motor = MotorScheduling(datos, semestre=semestre, capacidad_maxima=capacidad_maxima,
+                                    grupos_pares=grupos_pares, calendario=calendario)
+            filas = motor.ejecutar(progreso, cancelado)
+
+        if motor.calendario is not calendario:
+            motor.calendario = calendario
+            motor.calcular_estadisticas()
+        if 'sesiones_semestre' in motor.estadisticas:
+            avisar(92, f"📆 {motor.estadisticas['sesiones_semestre']} sesiones en el semestre "
+                       f"({motor.estadisticas['grupos_sin_sesiones']} grupos sin días lectivos)")
+
+        if archivo_resultado:
+            avisar(95, "💾 Exportando resultados...")
+            guardar_resultados(filas, archivo_resultado)
+
+        avisar(100, f"📅 Conflictos pendientes: {motor.estadisticas['conflictos']}")
+        return motor, 0, "Horarios generados correctamente"
+
+    except ProgramacionCancelada:
+        return None, 3, "Generación cancelada por el usuario"
+    except Exception as e:
+        return None, 2, f"Error generando horarios: {str(e)}"
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Optimización avanzada: búsqueda multiarranque en paralelo
+Cada proceso forma sus propios grupos y repite la construcción MRV con
+desempates aleatorios, adelantando en cada intento los grupos que quedaron en
+conflicto (squeaky wheel); se conserva la programación con mejor puntuación
+de todos los procesos
+"""
+
+import multiprocessing
+import os
+import queue
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from .motor import MotorScheduling, ProgramacionCancelada
+
+# Estado compartido con los procesos trabajadores (se fija en el inicializador)
+_parada = None
+_avisos = None
+
+
+def _inicializar_trabajador(parada, avisos):
+    global _parada, _avisos
+    _parada = parada
+    _avisos = avisos
+
+
+def _buscar(datos, parametros, semilla, limite, paciencia):
+    """
+    Proceso trabajador: construcciones repetidas hasta agotar tiempo o paciencia
+
+    Returns:
+        tuple: (puntuacion, semilla, motor sin datos ni candidatos) o None si se canceló
+    """
+    def cancelado():
+        return _parada is not None and _parada.is_set()
+
+    mejor_puntuacion = None
+    mejores = None
+    intentos = 0
+    try:
+        motor = MotorScheduling(datos, semilla=semilla, **parametros)
+        motor.preparar()
+
+        ultima_mejora = time.time()
+        while True:
+            motor.resolver(cancelado=cancelado)
+            intentos += 1
+            puntuacion = motor.puntuacion()
+            if mejor_puntuacion is None or puntuacion < mejor_puntuacion:
+                mejor_puntuacion = puntuacion
+                mejores = [grupo.asignacion for grupo in motor.grupos]
+                ultima_mejora = time.time()
+                if _avisos is not None:
+                    _avisos.put((semilla, intentos, puntuacion))
+            motor.penalizar_conflictos()
+
+            ahora = time.time()
+            if ahora >= limite or ahora - ultima_mejora >= paciencia or cancelado():
+                break
+    except ProgramacionCancelada:
+        if mejores is None:
+            return None
+
+    for grupo, asignacion in zip(motor.grupos, mejores):
+        grupo.asignacion = asignacion
+
+    # Sólo viaja de vuelta la solución: datos y candidatos se reconstruyen en el padre
+    motor.datos = None
+    motor.aleatorio = None
+    for grupo in motor.grupos:
+        grupo.candidatos = []
+        grupo.dominio = []
+    return mejor_puntuacion, semilla, motor
+
+
+def optimizar_horarios(datos, semestre=None, capacidad_maxima=24, grupos_pares=True,
+                       tiempo_maximo=60.0, paciencia=15.0, procesos=None, busquedas=None,
+                       progreso=None, cancelado=None):
+    """
+    Lanzar búsquedas independientes en un ProcessPoolExecutor y quedarse con la mejor
+
+    Args:
+        datos (dict): salida de cargar_datos_entrada
+        tiempo_maximo (float): presupuesto total en segundos (reloj de pared)
+        paciencia (float): segundos sin mejora tras los que una búsqueda se detiene
+        procesos (int): procesos en paralelo (None = uno por núcleo)
+        busquedas (int): búsquedas independientes (None = una por proceso)
+        progreso (callable): progreso(porcentaje, mensaje)
+        cancelado (callable): devuelve True para abortar
+
+    Returns:
+        MotorScheduling: el de mejor puntuación, listo para actualizar() o exportar
+    """
+    procesos = procesos or os.cpu_count() or 1
+    busquedas = busquedas or procesos
+    parametros = {'semestre': semestre, 'capacidad_maxima': capacidad_maxima, 'grupos_pares': grupos_pares}
+
+    inicio = time.time()
+    limite = inicio + tiempo_maximo
+    contexto = multiprocessing.get_context()
+    parada = contexto.Event()
+    avisos = contexto.Queue()
+
+    mejor = None
+    mejor_puntuacion = None
+    mejor_aviso = None
+    with ProcessPoolExecutor(max_workers=procesos, mp_context=contexto,
+                             initializer=_inicializar_trabajador, initargs=(parada, avisos)) as ejecutor:
+        futuros = {ejecutor.submit(_buscar, datos, parametros, semilla, limite, paciencia)
+                   for semilla in range(1, busquedas + 1)}
+        try:
+            while futuros:
+                terminados, futuros = wait(futuros, timeout=0.5, return_when=FIRST_COMPLETED)
+                if cancelado is not None and cancelado():
+                    parada.set()
+
+                for futuro in terminados:
+                    resultado = futuro.result()
+                    if resultado is not None and (mejor_puntuacion is None or resultado[0] < mejor_puntuacion):
+                        mejor_puntuacion, _, mejor = resultado
+
+                # Avisos de mejora de los trabajadores: sólo se informa del mejor global
+                mejora = False
+                try:
+                    while True:
+                        semilla, intentos, puntuacion = avisos.get_nowait()
+                        if mejor_aviso is None or puntuacion < mejor_aviso[2]:
+                            mejor_aviso = (semilla, intentos, puntuacion)
+                            mejora = True
+                except queue.Empty:
+                    pass
+
+                if progreso is not None and mejora:
+                    porcentaje = min(99, int((time.time() - inicio) * 100 / max(tiempo_maximo, 0.001)))
+                    progreso(porcentaje, f"🧪 Búsqueda {mejor_aviso[0]} (intento {mejor_aviso[1]}): "
+                                         f"{mejor_aviso[2][0]} conflictos · desequilibrio {mejor_aviso[2][1]}")
+        finally:
+            parada.set()
+
+    if cancelado is not None and cancelado():
+        raise ProgramacionCancelada()
+    if mejor is None:
+        raise RuntimeError("Ninguna búsqueda devolvió resultado")
+
+    # Reconstruir en el padre lo que no se envió entre procesos
+    mejor.restaurar_datos(datos)
+    mejor.tiempo_ejecucion = time.time() - inicio
+    mejor.calcular_estadisticas()
+    mejor.estadisticas['busquedas'] = busquedas
+    mejor.estadisticas['procesos'] = procesos
+    if progreso is not None:
+        progreso(100, f"🏆 Mejor solución: búsqueda {mejor.semilla} · {mejor_puntuacion[0]} conflictos")
+    return mejor
@@ -0,0 +1,99 @@
+"""
+Caché en disco de los archivos de entrada ya parseados
+Cada estructura normalizada se guarda en binario (pickle) bajo una clave que
+combina el hash del contenido del archivo, el cargador y su versión; si el
+archivo no cambia, la siguiente ejecución no vuelve a parsearlo
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+
+DIRECTORIO_CACHE = "cache/entradas"
+
+# Subir al cambiar el formato de lo que devuelve cualquier cargador
+VERSION_CARGADORES = 1
+
+TAM_LECTURA = 1 << 20
+
+
+def hash_archivo(ruta):
+    """Hash BLAKE2 del contenido del archivo (leído por trozos)"""
+    resumen = hashlib.blake2b(digest_size=20)
+    with open(ruta, 'rb') as f:
+        for trozo in iter(lambda: f.read(TAM_LECTURA), b''):
+            resumen.update(trozo)
+    return resumen.hexdigest()
+
+
+class CacheEntradas:
+    """Caché {(cargador, hash del archivo): estructura parseada}"""
+
+    def __init__(self, directorio=DIRECTORIO_CACHE, version=VERSION_CARGADORES):
+        self.directorio = directorio
+        self.version = version
+        self.aciertos = 0
+        self.fallos = 0
+
+    def _ruta_entrada(self, nombre, ruta):
+        return os.path.join(self.directorio, f"{nombre}-v{self.version}-{hash_archivo(ruta)}.pkl")
+
+    def cargar(self, nombre, cargador, ruta):
+        """
+        Devolver cargador(ruta) usando la caché si el archivo no ha cambiado
+
+        Args:
+            nombre (str): identificador del cargador ('alumnos', 'profesores'...)
+            cargador (callable): función que parsea el archivo
+            ruta (str): archivo de entrada
+        """
+        ruta_cache = self._ruta_entrada(nombre, ruta)
+
+        try:
+            with open(ruta_cache, 'rb') as f:
+                datos = pickle.load(f)
+            self.aciertos += 1
+            return datos
+        except FileNotFoundError:
+            pass
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError) as e:
+            # Entrada corrupta o de una versión incompatible: se regenera
+            print(f"⚠️ Caché inválida para {nombre}: {e}")
+
+        self.fallos += 1
+        datos = cargador(ruta)
+        if datos is not None:
+            self._guardar(nombre, ruta_cache, datos)
+        return datos
+
+    def _guardar(self, nombre, ruta_cache, datos):
+        """Escritura atómica; las versiones anteriores del mismo cargador se borran"""
+        try:
+            os.makedirs(self.directorio, exist_ok=True)
+            descriptor, temporal = tempfile.mkstemp(dir=self.directorio, suffix='.tmp')
+            with os.fdopen(descriptor, 'wb') as f:
+                pickle.dump(datos, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporal, ruta_cache)
+        except OSError as e:
+            print(f"⚠️ No se pudo guardar la caché de {nombre}: {e}")
+            return
+
+        actual = os.path.basename(ruta_cache)
+        for archivo in os.listdir(self.directorio):
+            if archivo.startswith(f"{nombre}-") and archivo.endswith('.pkl') and archivo != actual:
+                try:
+                    os.remove(os.path.join(self.directorio, archivo))
+                except OSError:
+                    pass
+
+    def limpiar(self):
+        """Borrar todas las entradas de la caché"""
+        if not os.path.isdir(self.directorio):
+            return
+        for archivo in os.listdir(self.directorio):
+            if archivo.endswith(('.pkl', '.tmp')):
+                try:
+                    os.remove(os.path.join(self.directorio, archivo))
+                except OSError:
+                    pass
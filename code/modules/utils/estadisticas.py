@@ -0,0 +1,130 @@
+"""
+Estadísticas de una programación a partir de sus filas de resultado
+Todo se calcula en una pasada vectorizada (pandas/numpy) sobre la tabla, sin
+filtrar el DataFrame una vez por contador; sirve tanto para VerResultados como
+para informes por lotes fuera de la interfaz
+"""
+
+import numpy as np
+import pandas as pd
+
+from modules.utils.franjas import DIAS_SEMANA, HORA_FIN_JORNADA, HORA_INICIO_JORNADA
+
+HORAS_JORNADA = list(range(HORA_INICIO_JORNADA // 60, HORA_FIN_JORNADA // 60))
+
+
+def _minutos(columna):
+    """Serie 'HH:MM' → array de minutos desde medianoche"""
+    partes = columna.astype(str).str.split(':', n=2, expand=True)
+    return (partes[0].astype(int) * 60 + partes[1].astype(int)).to_numpy()
+
+
+def _por_asignatura(tabla):
+    """
+    Tamaño y equilibrio de los grupos de cada asignatura
+
+    El índice de Gini sale de las filas ordenadas por tamaño dentro de cada
+    asignatura: G = 2·Σ(i·x_i) / (n·Σx) − (n+1)/n, con i el rango 1..n.
+    """
+    ordenado = tabla[['Asignatura', 'Num_Alumnos', 'Estado']].sort_values(['Asignatura', 'Num_Alumnos'])
+    alumnos = ordenado['Num_Alumnos'].astype(float)
+    rango = ordenado.groupby('Asignatura', sort=False).cumcount() + 1
+    ordenado = ordenado.assign(alumnos=alumnos, cuadrado=alumnos ** 2, ponderado=rango * alumnos,
+                               conflicto=(ordenado['Estado'] != 'Asignado').astype(int))
+
+    resumen = ordenado.groupby('Asignatura').agg(
+        grupos=('alumnos', 'size'),
+        alumnos=('alumnos', 'sum'),
+        minimo=('alumnos', 'min'),
+        maximo=('alumnos', 'max'),
+        cuadrado=('cuadrado', 'sum'),
+        ponderado=('ponderado', 'sum'),
+        conflictos=('conflicto', 'sum')
+    )
+    n = resumen['grupos']
+    resumen['media'] = resumen['alumnos'] / n
+    resumen['varianza'] = (resumen['cuadrado'] / n - resumen['media'] ** 2).clip(lower=0)
+    total = resumen['alumnos'].where(resumen['alumnos'] > 0)
+    resumen['gini'] = (2 * resumen['ponderado'] / (n * total) - (n + 1) / n).fillna(0.0).clip(lower=0)
+    return resumen.drop(columns=['cuadrado', 'ponderado'])
+
+
+def _ocupacion_por_hora(asignadas):
+    """Minutos ocupados de cada fila en cada hora de la jornada (matriz filas × horas)"""
+    inicio = _minutos(asignadas['Hora_Inicio'])[:, None]
+    fin = _minutos(asignadas['Hora_Fin'])[:, None]
+    horas = np.array(HORAS_JORNADA)[None, :] * 60
+    return np.clip(np.minimum(fin, horas + 60) - np.maximum(inicio, horas), 0, 60)
+
+
+def calcular_estadisticas(tabla, num_laboratorios=None, tiempo_ejecucion=None):
+    """
+    Métricas de una programación
+
+    Args:
+        tabla (DataFrame | list): filas de resultado (Asignatura, Grupo, Laboratorio,
+            Dia, Hora_Inicio, Hora_Fin, Num_Alumnos, Estado)
+        num_laboratorios (int): laboratorios disponibles (None = los que aparecen)
+        tiempo_ejecucion (float): segundos que tardó el motor, si se conocen
+
+    Returns:
+        dict: contadores, 'equilibrio' (1 − Gini medio ponderado por alumnos),
+            'por_asignatura' (DataFrame), 'utilizacion_hora' (Series, % por hora)
+            y 'utilizacion_laboratorio' (DataFrame laboratorio × hora, %)
+    """
+    if not isinstance(tabla, pd.DataFrame):
+        tabla = pd.DataFrame(list(tabla))
+
+    estados = tabla['Estado'].value_counts() if not tabla.empty else pd.Series(dtype=int)
+    asignado = (tabla['Estado'] == 'Asignado').to_numpy() if not tabla.empty else np.zeros(0, dtype=bool)
+    asignadas = tabla[asignado]
+
+    labs_usados = int(asignadas['Laboratorio'].nunique()) if not asignadas.empty else 0
+    labs_totales = max(num_laboratorios or 0, labs_usados)
+
+    estadisticas = {
+        'total_grupos': len(tabla),
+        'grupos_asignados': int(estados.get('Asignado', 0)),
+        'conflictos': int(len(tabla) - estados.get('Asignado', 0)),
+        'labs_usados': labs_usados,
+        'labs_totales': labs_totales,
+        'tiempo_ejecucion': tiempo_ejecucion,
+        'equilibrio': 1.0,
+        'por_asignatura': pd.DataFrame(),
+        'utilizacion_hora': pd.Series(0.0, index=HORAS_JORNADA),
+        'utilizacion_laboratorio': pd.DataFrame(columns=HORAS_JORNADA, dtype=float),
+        'utilizacion_media': 0.0
+    }
+    if tabla.empty:
+        return estadisticas
+
+    por_asignatura = _por_asignatura(tabla)
+    estadisticas['por_asignatura'] = por_asignatura
+    if por_asignatura['alumnos'].sum() > 0:
+        gini_medio = np.average(por_asignatura['gini'], weights=por_asignatura['alumnos'])
+        estadisticas['equilibrio'] = float(1 - gini_medio)
+
+    if labs_totales and not asignadas.empty:
+        minutos = _ocupacion_por_hora(asignadas)
+        disponibles = len(DIAS_SEMANA) * 60
+        por_lab = pd.DataFrame(minutos, columns=HORAS_JORNADA).groupby(asignadas['Laboratorio'].to_numpy()).sum()
+        estadisticas['utilizacion_laboratorio'] = por_lab * 100 / disponibles
+        estadisticas['utilizacion_hora'] = pd.Series(minutos.sum(axis=0) * 100 / (disponibles * labs_totales),
+                                                     index=HORAS_JORNADA)
+        estadisticas['utilizacion_media'] = float(minutos.sum() * 100 /
+                                                  (disponibles * labs_totales * len(HORAS_JORNADA)))
+    return estadisticas
+
+
+def resumen_estadisticas(estadisticas):
+    """Textos de los contadores principales (los que muestra el panel de VerResultados)"""
+    tiempo = estadisticas['tiempo_ejecucion']
+    return {
+        'total_grupos': estadisticas['total_grupos'],
+        'grupos_asignados': estadisticas['grupos_asignados'],
+        'conflictos': estadisticas['conflictos'],
+        'labs_usados': f"{estadisticas['labs_usados']}/{estadisticas['labs_totales']}",
+        'equilibrio': f"{estadisticas['equilibrio'] * 100:.1f}%",
+        'utilizacion': f"{estadisticas['utilizacion_media']:.1f}%",
+        'tiempo_ejecucion': f"{tiempo:.2f}s" if tiempo is not None else "—"
+    }
@@ -0,0 +1,556 @@
+"""
+Exportación de resultados a Excel, CSV y PDF por escritura en streaming
+Las filas se piden una a una a la secuencia de resultados y se escriben en
+cuanto se leen: el libro Excel usa el modo de memoria constante de xlsxwriter
+(o el write-only de openpyxl), el CSV se escribe línea a línea y el PDF se
+dibuja directamente en el canvas página a página. Los informes individuales
+(uno por laboratorio y asignatura) se reparten en un pool de procesos y sólo
+se regeneran los que cambiaron desde la última exportación
+"""
+
+import csv
+import hashlib
+import json
+import os
+import re
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+
+from modules.utils.estadisticas import calcular_estadisticas, resumen_estadisticas
+from modules.utils.franjas import DIAS_SEMANA
+
+try:
+    import xlsxwriter
+
+    XLSXWRITER_DISPONIBLE = True
+except ImportError:
+    XLSXWRITER_DISPONIBLE = False
+
+try:
+    from reportlab.lib.pagesizes import A4, landscape
+    from reportlab.pdfgen import canvas
+
+    REPORTLAB_DISPONIBLE = True
+except ImportError:
+    REPORTLAB_DISPONIBLE = False
+
+COLUMNAS = ['Asignatura', 'Grupo', 'Laboratorio', 'Profesor', 'Dia', 'Hora_Inicio', 'Hora_Fin',
+            'Num_Alumnos', 'Estado']
+FORMATOS = ('excel', 'csv', 'pdf')
+EXTENSIONES = {'excel': '.xlsx', 'csv': '.csv', 'pdf': '.pdf'}
+
+# Vistas con una hoja (o sección del PDF) por valor de la columna
+VISTAS = {
+    'laboratorios': ('Laboratorio', 'Lab'),
+    'asignaturas': ('Asignatura', 'Asig'),
+    'dias': ('Dia', 'Día')
+}
+
+CADA_FILAS = 2000  # Frecuencia con la que se consulta la cancelación dentro de una hoja
+
+DIRECTORIO_INFORMES = 'informes'
+MANIFIESTO = '.manifiesto.json'  # {archivo: hash de las filas con que se generó}
+VERSION_INFORMES = 1  # Subir al cambiar el aspecto de los informes (invalida el manifiesto)
+MINIMO_PARA_POOL = 8  # Con menos documentos pendientes no compensa arrancar procesos
+
+
+class ExportacionCancelada(Exception):
+    """La exportación se canceló antes de terminar"""
+
+
+# ========= ORDEN Y AGRUPACIÓN =========
+
+def _orden(tabla):
+    """Posiciones de las filas ordenadas por día y hora de inicio (los conflictos al final)"""
+    dia = tabla['Dia'].map({d: i for i, d in enumerate(DIAS_SEMANA)}).fillna(len(DIAS_SEMANA)).to_numpy()
+    hora = tabla['Hora_Inicio'].fillna('').astype(str).str.zfill(5).to_numpy()
+    return np.lexsort((hora, dia))
+
+
+def _agrupar(tabla, orden, columna):
+    """{valor: posiciones} con las posiciones ya en orden de día y hora"""
+    ordenada = tabla[columna].iloc[orden].reset_index(drop=True)
+    grupos = {}
+    for clave, relativas in ordenada.groupby(ordenada, sort=True).indices.items():
+        if str(clave):
+            grupos[str(clave)] = orden[relativas]
+    if columna == 'Dia':
+        grupos = {dia: grupos[dia] for dia in DIAS_SEMANA if dia in grupos}
+    return grupos
+
+
+def _texto(valor):
+    if valor is None or (isinstance(valor, float) and np.isnan(valor)):
+        return ''
+    return valor
+
+
+# ========= EXCEL =========
+
+def _nombre_hoja(texto, usados):
+    """Nombre de hoja válido (≤31 caracteres, sin []:*?/\\) y único"""
+    base = re.sub(r'[\[\]:*?/\\]', '_', texto)[:31]
+    nombre = base
+    contador = 2
+    while nombre.lower() in usados:
+        sufijo = f"~{contador}"
+        nombre = base[:31 - len(sufijo)] + sufijo
+        contador += 1
+    usados.add(nombre.lower())
+    return nombre
+
+
+class _LibroXlsxwriter:
+    """xlsxwriter en modo constant_memory: cada fila se vuelca al escribir la siguiente"""
+
+    def __init__(self, ruta):
+        self._libro = xlsxwriter.Workbook(ruta, {'constant_memory': True})
+        self._cabecera = self._libro.add_format({'bold': True, 'bg_color': '#2A82DA', 'font_color': 'white'})
+
+    def hoja(self, nombre, columnas):
+        hoja = self._libro.add_worksheet(nombre)
+        hoja.write_row(0, 0, columnas, self._cabecera)
+        hoja.freeze_panes(1, 0)
+        siguiente = [1]
+
+        def escribir(valores):
+            hoja.write_row(siguiente[0], 0, valores)
+            siguiente[0] += 1
+        return escribir
+
+    def cerrar(self):
+        self._libro.close()
+
+
+class _LibroOpenpyxl:
+    """Alternativa sin xlsxwriter: libro write-only de openpyxl"""
+
+    def __init__(self, ruta):
+        from openpyxl import Workbook
+        self._ruta = ruta
+        self._libro = Workbook(write_only=True)
+
+    def hoja(self, nombre, columnas):
+        hoja = self._libro.create_sheet(nombre)
+        hoja.append(columnas)
+        return hoja.append
+
+    def cerrar(self):
+        self._libro.save(self._ruta)
+
+
+def _exportar_excel(ruta, filas, vistas, metricas, avanzar):
+    libro = _LibroXlsxwriter(ruta) if XLSXWRITER_DISPONIBLE else _LibroOpenpyxl(ruta)
+    usados = set()
+    try:
+        # La primera hoja es la tabla completa: pd.read_excel(ruta) la sigue leyendo como antes
+        escribir = libro.hoja(_nombre_hoja('Horarios', usados), COLUMNAS)
+        for i, fila in enumerate(filas):
+            escribir([_texto(fila.get(c)) for c in COLUMNAS])
+            avanzar(i)
+        avanzar(None, "📊 Excel: tabla completa")
+
+        if metricas is not None:
+            escribir = libro.hoja(_nombre_hoja('Resumen', usados), ['Métrica', 'Valor'])
+            for clave, valor in resumen_estadisticas(metricas).items():
+                escribir([clave.replace('_', ' ').capitalize(), str(valor)])
+
+            escribir = libro.hoja(_nombre_hoja('Equilibrio', usados),
+                                  ['Asignatura', 'Grupos', 'Alumnos', 'Mínimo', 'Máximo', 'Media',
+                                   'Varianza', 'Gini', 'Conflictos'])
+            for asignatura, datos in metricas['por_asignatura'].iterrows():
+                escribir([asignatura, int(datos['grupos']), int(datos['alumnos']), datos['minimo'],
+                          datos['maximo'], round(datos['media'], 2), round(datos['varianza'], 2),
+                          round(datos['gini'], 4), int(datos['conflictos'])])
+
+            escribir = libro.hoja(_nombre_hoja('Ocupación', usados), ['Hora', 'Ocupación (%)'])
+            for hora, porcentaje in metricas['utilizacion_hora'].items():
+                escribir([f"{hora:02d}:00", round(float(porcentaje), 1)])
+            avanzar(None, "📈 Excel: resumen y estadísticas")
+
+        for vista, grupos in vistas:
+            prefijo = VISTAS[vista][1]
+            for valor, posiciones in grupos.items():
+                escribir = libro.hoja(_nombre_hoja(f"{prefijo} {valor}", usados), COLUMNAS)
+                for i, posicion in enumerate(posiciones):
+                    fila = filas[posicion]
+                    escribir([_texto(fila.get(c)) for c in COLUMNAS])
+                    avanzar(i)
+                avanzar(None, f"📊 Excel: {prefijo} {valor}")
+    finally:
+        libro.cerrar()
+
+
+# ========= CSV =========
+
+def _exportar_csv(ruta, filas, avanzar):
+    # utf-8-sig para que Excel reconozca los acentos al abrirlo
+    with open(ruta, 'w', encoding='utf-8-sig', newline='') as f:
+        escritor = csv.writer(f)
+        escritor.writerow(COLUMNAS)
+        for i, fila in enumerate(filas):
+            escritor.writerow([_texto(fila.get(c)) for c in COLUMNAS])
+            avanzar(i)
+    avanzar(None, "📋 CSV: tabla completa")
+
+
+# ========= PDF =========
+
+class _PaginasPDF:
+    """Tablas de texto dibujadas en el canvas con salto de página automático"""
+
+    MARGEN = 36
+    ALTO_LINEA = 13
+    ANCHOS = [150, 110, 110, 110, 70, 45, 45, 50, 60]
+
+    def __init__(self, ruta):
+        self._canvas = canvas.Canvas(ruta, pagesize=landscape(A4))
+        self._ancho, self._alto = landscape(A4)
+        self._y = self._alto - self.MARGEN
+        self._pagina = 1
+
+    def _salto(self, lineas=1):
+        if self._y - lineas * self.ALTO_LINEA >= self.MARGEN:
+            return False
+        self._canvas.setFont('Helvetica', 8)
+        self._canvas.drawRightString(self._ancho - self.MARGEN, self.MARGEN / 2, f"Página {self._pagina}")
+        self._canvas.showPage()
+        self._pagina += 1
+        self._y = self._alto - self.MARGEN
+        return True
+
+    def titulo(self, texto):
+        self._salto(4)
+        self._y -= self.ALTO_LINEA
+        self._canvas.setFont('Helvetica-Bold', 13)
+        self._canvas.drawString(self.MARGEN, self._y, texto)
+        self._y -= self.ALTO_LINEA
+
+    def linea(self, valores, negrita=False):
+        self._canvas.setFont('Helvetica-Bold' if negrita else 'Helvetica', 8)
+        x = self.MARGEN
+        for valor, ancho in zip(valores, self.ANCHOS):
+            texto = str(valor)
+            # Recortar al ancho de la columna
+            while texto and self._canvas.stringWidth(texto) > ancho - 4:
+                texto = texto[:-1]
+            self._canvas.drawString(x, self._y, texto)
+            x += ancho
+        self._y -= self.ALTO_LINEA
+
+    def tabla(self, cabecera, filas, avanzar):
+        self.linea(cabecera, negrita=True)
+        for i, valores in enumerate(filas):
+            if self._salto():
+                self.linea(cabecera, negrita=True)
+            self.linea(valores)
+            avanzar(i)
+
+    def cerrar(self):
+        self._salto(10 ** 6)  # Pie de la última página
+        self._canvas.save()
+
+
+def _exportar_pdf(ruta, filas, vistas, metricas, avanzar):
+    if not REPORTLAB_DISPONIBLE:
+        raise ImportError("reportlab no está instalado: no se puede exportar a PDF")
+
+    paginas = _PaginasPDF(ruta)
+    try:
+        paginas.titulo("Horarios de laboratorios")
+        if metricas is not None:
+            paginas.tabla(['Métrica', 'Valor'],
+                          ([clave.replace('_', ' ').capitalize(), valor]
+                           for clave, valor in resumen_estadisticas(metricas).items()), avanzar)
+            avanzar(None, "📈 PDF: resumen")
+
+        for vista, grupos in vistas:
+            columna, prefijo = VISTAS[vista]
+            for valor, posiciones in grupos.items():
+                paginas.titulo(f"{prefijo}: {valor}")
+                paginas.tabla(COLUMNAS, ([_texto(filas[p].get(c)) for c in COLUMNAS] for p in posiciones), avanzar)
+                avanzar(None, f"📄 PDF: {prefijo} {valor}")
+
+        if not vistas:
+            paginas.titulo("Todas las sesiones")
+            paginas.tabla(COLUMNAS, ([_texto(fila.get(c)) for c in COLUMNAS] for fila in filas), avanzar)
+            avanzar(None, "📄 PDF: tabla completa")
+    finally:
+        paginas.cerrar()
+
+
+# ========= INFORMES INDIVIDUALES =========
+
+def _sin_progreso(i, mensaje=None):
+    pass
+
+
+def _nombre_archivo(valor):
+    return re.sub(r'[^\w.-]+', '_', str(valor)).strip('_') or 'sin_nombre'
+
+
+def _escribir_informe(ruta_base, titulo, filas, formatos):
+    """
+    Proceso trabajador: un informe (la tabla de un laboratorio o asignatura) por formato
+
+    Returns:
+        list: rutas escritas
+    """
+    rutas = []
+    for formato in formatos:
+        ruta = ruta_base + EXTENSIONES[formato]
+        if formato == 'excel':
+            libro = _LibroXlsxwriter(ruta) if XLSXWRITER_DISPONIBLE else _LibroOpenpyxl(ruta)
+            try:
+                escribir = libro.hoja(_nombre_hoja(titulo, set()), COLUMNAS)
+                for fila in filas:
+                    escribir([_texto(fila.get(c)) for c in COLUMNAS])
+            finally:
+                libro.cerrar()
+        elif formato == 'csv':
+            _exportar_csv(ruta, filas, _sin_progreso)
+        else:
+            if not REPORTLAB_DISPONIBLE:
+                raise ImportError("reportlab no está instalado: no se puede exportar a PDF")
+            paginas = _PaginasPDF(ruta)
+            try:
+                paginas.titulo(titulo)
+                paginas.tabla(COLUMNAS, ([_texto(fila.get(c)) for c in COLUMNAS] for fila in filas), _sin_progreso)
+            finally:
+                paginas.cerrar()
+        rutas.append(ruta)
+    return rutas
+
+
+def _hash_informe(titulo, filas, formato):
+    contenido = json.dumps([VERSION_INFORMES, titulo, formato, [[fila.get(c) for c in COLUMNAS] for fila in filas]],
+                           ensure_ascii=False, default=str)
+    return hashlib.blake2b(contenido.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _leer_manifiesto(directorio):
+    try:
+        with open(os.path.join(directorio, MANIFIESTO), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _guardar_manifiesto(directorio, manifiesto):
+    descriptor, temporal = tempfile.mkstemp(dir=directorio, suffix='.tmp')
+    with os.fdopen(descriptor, 'w', encoding='utf-8') as f:
+        json.dump(manifiesto, f, indent=1, ensure_ascii=False, sort_keys=True)
+    os.replace(temporal, os.path.join(directorio, MANIFIESTO))
+
+
+def generar_informes(tabla, filas=None, directorio=DIRECTORIO_INFORMES, formatos=FORMATOS,
+                     vistas=('laboratorios', 'asignaturas'), procesos=None, progreso=None, cancelado=None):
+    """
+    Un archivo por laboratorio y por asignatura en cada formato, en paralelo
+
+    Cada documento se identifica por el hash de sus filas; si coincide con el del
+    manifiesto de la exportación anterior y el archivo sigue existiendo, se omite.
+    Al terminar se borran los informes de las vistas y formatos exportados que
+    ya no corresponden a nada del horario (laboratorios o asignaturas que han
+    desaparecido); los de otras vistas o formatos no se tocan.
+
+    Args:
+        tabla, filas: como en exportar_resultados
+        directorio (str): carpeta raíz (una subcarpeta por vista)
+        procesos (int): procesos del pool (None = uno por núcleo)
+        progreso (callable): progreso(porcentaje, mensaje) agregado de todos los procesos
+        cancelado (callable): devuelve True para abortar (lanza ExportacionCancelada)
+
+    Returns:
+        tuple: (rutas generadas, número de archivos omitidos por no haber cambiado)
+    """
+    if not isinstance(tabla, pd.DataFrame):
+        tabla = pd.DataFrame(list(tabla))
+    if filas is None:
+        textos = tabla.select_dtypes(exclude='number').columns
+        filas = tabla.fillna({columna: '' for columna in textos}).to_dict('records')
+
+    formatos = [f for f in FORMATOS if f in formatos]
+    orden = _orden(tabla) if not tabla.empty else np.zeros(0, dtype=int)
+    manifiesto = _leer_manifiesto(directorio)
+    actuales = set()  # Archivos de esta exportación, generados u omitidos
+    carpetas = set()
+
+    # Documentos pendientes: (ruta base, título, filas, formatos a regenerar, {archivo: hash})
+    pendientes = []
+    omitidos = 0
+    for vista in VISTAS:
+        if vista not in vistas or vista == 'dias':
+            continue
+        columna, prefijo = VISTAS[vista]
+        carpetas.add(vista)
+        os.makedirs(os.path.join(directorio, vista), exist_ok=True)
+        for valor, posiciones in _agrupar(tabla, orden, columna).items():
+            if cancelado is not None and cancelado():
+                raise ExportacionCancelada()
+            filas_doc = [filas[p] for p in posiciones]
+            titulo = f"{prefijo} {valor}"
+            relativa = os.path.join(vista, _nombre_archivo(valor))
+            hashes = {}
+            for formato in formatos:
+                archivo = relativa + EXTENSIONES[formato]
+                actuales.add(archivo)
+                hashes[archivo] = _hash_informe(titulo, filas_doc, formato)
+                if manifiesto.get(archivo) == hashes[archivo] and os.path.exists(os.path.join(directorio, archivo)):
+                    omitidos += 1
+                    del hashes[archivo]
+            if hashes:
+                cambiados = [f for f in formatos if relativa + EXTENSIONES[f] in hashes]
+                pendientes.append((os.path.join(directorio, relativa), titulo, filas_doc, cambiados, hashes))
+
+    archivos_pendientes = max(sum(len(documento[3]) for documento in pendientes), 1)
+    generados = []
+
+    def completado(documento, rutas):
+        generados.extend(rutas)
+        manifiesto.update(documento[4])
+        if progreso is not None:
+            progreso(min(99, len(generados) * 100 // archivos_pendientes),
+                     f"📁 Informes: {documento[1]} ({len(generados)} archivos, {omitidos} sin cambios)")
+
+    completa = False
+    try:
+        if len(pendientes) < MINIMO_PARA_POOL or procesos == 1:
+            for documento in pendientes:
+                if cancelado is not None and cancelado():
+                    raise ExportacionCancelada()
+                completado(documento, _escribir_informe(*documento[:4]))
+        else:
+            with ProcessPoolExecutor(max_workers=procesos or os.cpu_count() or 1) as ejecutor:
+                futuros = {ejecutor.submit(_escribir_informe, *documento[:4]): documento for documento in pendientes}
+                restantes = set(futuros)
+                try:
+                    while restantes:
+                        terminados, restantes = wait(restantes, timeout=0.5, return_when=FIRST_COMPLETED)
+                        for futuro in terminados:
+                            completado(futuros[futuro], futuro.result())
+                        if cancelado is not None and cancelado():
+                            raise ExportacionCancelada()
+                finally:
+                    # Los que no han empezado no llegan a ejecutarse
+                    for futuro in restantes:
+                        futuro.cancel()
+        completa = True
+    finally:
+        if completa:
+            extensiones = {EXTENSIONES[f] for f in formatos}
+            for archivo in [a for a in manifiesto if a not in actuales and os.path.dirname(a) in carpetas
+                            and os.path.splitext(a)[1] in extensiones]:
+                try:
+                    os.remove(os.path.join(directorio, archivo))
+                except OSError:
+                    pass
+                del manifiesto[archivo]
+        # Lo ya escrito queda registrado aunque se cancele a medias; las entradas de
+        # otras vistas y formatos se conservan y sólo se olvidan los archivos borrados
+        _guardar_manifiesto(directorio, {archivo: valor for archivo, valor in manifiesto.items()
+                                         if os.path.exists(os.path.join(directorio, archivo))})
+
+    if progreso is not None:
+        progreso(100, f"✅ {len(generados)} informes generados, {omitidos} sin cambios")
+    return generados, omitidos
+
+
+# ========= FACHADA =========
+
+def exportar_resultados(tabla, filas=None, directorio='.', nombre_base='horarios_laboratorios',
+                        formatos=FORMATOS, vistas=('laboratorios', 'asignaturas', 'dias'),
+                        estadisticas=True, metricas=None, individuales=False, procesos=None,
+                        progreso=None, cancelado=None):
+    """
+    Exportar una programación a los formatos pedidos
+
+    Args:
+        tabla (DataFrame | list): filas de resultado, o al menos las columnas con las que
+            se agrupa y ordena (Asignatura, Laboratorio, Dia, Hora_Inicio, Estado...)
+        filas (Sequence): filas completas (dicts) por posición; None = las de la tabla.
+            Se leen una a una, así que vale una secuencia perezosa (FilasPerezosas)
+        formatos (iterable): subconjunto de ('excel', 'csv', 'pdf')
+        vistas (iterable): hojas/secciones por 'laboratorios', 'asignaturas' y 'dias'
+        estadisticas (bool): añadir resumen, equilibrio por asignatura y ocupación por hora
+        metricas (dict): salida de calcular_estadisticas si ya está calculada
+        individuales (bool): además, un archivo por laboratorio y asignatura (generar_informes)
+            en la subcarpeta DIRECTORIO_INFORMES
+        procesos (int): procesos para los informes individuales (None = uno por núcleo)
+        progreso (callable): progreso(porcentaje, mensaje)
+        cancelado (callable): devuelve True para abortar (lanza ExportacionCancelada)
+
+    Returns:
+        list: rutas de los archivos generados
+    """
+    if not isinstance(tabla, pd.DataFrame):
+        tabla = pd.DataFrame(list(tabla))
+    if filas is None:
+        textos = tabla.select_dtypes(exclude='number').columns
+        filas = tabla.fillna({columna: '' for columna in textos}).to_dict('records')
+
+    formatos = [f for f in FORMATOS if f in formatos]
+    orden = _orden(tabla) if not tabla.empty else np.zeros(0, dtype=int)
+    grupos = [(vista, _agrupar(tabla, orden, VISTAS[vista][0])) for vista in VISTAS if vista in vistas]
+    if estadisticas and metricas is None:
+        metricas = calcular_estadisticas(tabla)
+    elif not estadisticas:
+        metricas = None
+
+    # Pasos para la barra de progreso: una unidad por hoja/sección de cada formato
+    secciones = sum(len(g) for _, g in grupos)
+    pasos = {
+        'excel': 1 + (1 if metricas is not None else 0) + secciones,
+        'csv': 1,
+        'pdf': (1 if metricas is not None else 0) + (secciones or 1)
+    }
+    total = max(sum(pasos[f] for f in formatos), 1)
+    hechos = [0]
+    # Con informes individuales, la exportación principal ocupa la primera mitad de la barra
+    escala = 50 if individuales else 100
+
+    def avanzar(i, mensaje=None):
+        if i is not None:
+            if i % CADA_FILAS == 0 and cancelado is not None and cancelado():
+                raise ExportacionCancelada()
+            return
+        hechos[0] += 1
+        if cancelado is not None and cancelado():
+            raise ExportacionCancelada()
+        if progreso is not None:
+            progreso(min(99, hechos[0] * escala // total), mensaje)
+
+    os.makedirs(directorio, exist_ok=True)
+    generados = []
+    for formato in formatos:
+        ruta = os.path.join(directorio, nombre_base + EXTENSIONES[formato])
+        try:
+            if formato == 'excel':
+                _exportar_excel(ruta, filas, grupos, metricas, avanzar)
+            elif formato == 'csv':
+                _exportar_csv(ruta, filas, avanzar)
+            else:
+                _exportar_pdf(ruta, filas, grupos, metricas, avanzar)
+        except ExportacionCancelada:
+            # No dejar archivos a medias
+            for archivo in generados + [ruta]:
+                if os.path.exists(archivo):
+                    os.remove(archivo)
+            raise
+        generados.append(ruta)
+
+    if individuales:
+        def progreso_informes(porcentaje, mensaje):
+            if progreso is not None:
+                progreso(50 + porcentaje // 2, mensaje)
+
+        informes, _ = generar_informes(tabla, filas, os.path.join(directorio, DIRECTORIO_INFORMES), formatos,
+                                       vistas, procesos, progreso_informes, cancelado)
+        generados.extend(informes)
+
+    if progreso is not None:
+        progreso(100, f"✅ {len(generados)} archivos exportados")
+    return generados
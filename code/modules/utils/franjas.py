@@ -0,0 +1,81 @@
+"""
+Rejilla horaria discreta usada por el motor de scheduling
+Convierte horas "HH:MM" en franjas y máscaras de bits por día
+"""
+
+# Jornada de laboratorios (ver HorariosLaboratorio en configuracion_labs.xml)
+HORA_INICIO_JORNADA = 8 * 60
+HORA_FIN_JORNADA = 20 * 60
+MINUTOS_FRANJA = 15
+NUM_FRANJAS = (HORA_FIN_JORNADA - HORA_INICIO_JORNADA) // MINUTOS_FRANJA
+
+# Las máscaras de franjas se guardan en enteros de 64 bits (numpy uint64)
+if NUM_FRANJAS > 64:
+    raise ValueError(f"La jornada tiene {NUM_FRANJAS} franjas; las máscaras admiten 64 como máximo")
+
+DIAS_SEMANA = ['Lunes', 'Martes', 'Miércoles', 'Jueves', 'Viernes']
+CLAVES_DIAS = ['lunes', 'martes', 'miercoles', 'jueves', 'viernes']
+
+
+def hora_a_minutos(hora):
+    """Convertir 'HH:MM' (o 'H:MM') en minutos desde medianoche"""
+    horas, minutos = str(hora).strip().split(':')[:2]
+    return int(horas) * 60 + int(minutos)
+
+
+def minutos_a_hora(minutos):
+    """Convertir minutos desde medianoche en 'HH:MM'"""
+    return f"{minutos // 60:02d}:{minutos % 60:02d}"
+
+
+def franja_a_hora(franja):
+    """Hora 'HH:MM' en la que empieza una franja"""
+    return minutos_a_hora(HORA_INICIO_JORNADA + franja * MINUTOS_FRANJA)
+
+
+def mascara_intervalo(inicio_min, fin_min):
+    """Máscara de bits con las franjas que cubre [inicio_min, fin_min)"""
+    inicio_min = max(inicio_min, HORA_INICIO_JORNADA)
+    fin_min = min(fin_min, HORA_FIN_JORNADA)
+    if fin_min <= inicio_min:
+        return 0
+
+    # Una franja sólo cuenta si queda cubierta entera: el inicio se redondea
+    # hacia arriba y el fin hacia abajo
+    primera = -(-(inicio_min - HORA_INICIO_JORNADA) // MINUTOS_FRANJA)
+    ultima = (fin_min - HORA_INICIO_JORNADA) // MINUTOS_FRANJA
+    if ultima <= primera:
+        return 0
+    return ((1 << (ultima - primera)) - 1) << primera
+
+
+def parsear_intervalos(texto):
+    """
+    Parsear un texto de disponibilidad tipo '08:00-12:00;14:00-18:00'
+
+    Returns:
+        list: [(inicio_min, fin_min), ...] ignorando tramos mal formados
+    """
+    intervalos = []
+    if texto is None:
+        return intervalos
+
+    for tramo in str(texto).split(';'):
+        tramo = tramo.strip()
+        if not tramo or '-' not in tramo:
+            continue
+        try:
+            inicio, fin = tramo.split('-', 1)
+            intervalos.append((hora_a_minutos(inicio), hora_a_minutos(fin)))
+        except ValueError:
+            continue
+
+    return intervalos
+
+
+def mascara_disponibilidad(texto):
+    """Máscara de bits con todas las franjas disponibles de un texto"""
+    mascara = 0
+    for inicio, fin in parsear_intervalos(texto):
+        mascara |= mascara_intervalo(inicio, fin)
+    return mascara
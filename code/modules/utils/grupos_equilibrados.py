@@ -0,0 +1,220 @@
+"""
+Reparto de alumnos en grupos equilibrados por asignatura
+Siembra voraz por perfil de matrícula + búsqueda local por intercambios
+"""
+
+import math
+import random
+import time
+
+
+def calcular_numero_grupos(num_alumnos, capacidad, pares=True):
+    """Número de grupos para num_alumnos sin superar la capacidad (par si se pide)"""
+    capacidad = max(1, capacidad)
+    num_grupos = max(1, math.ceil(num_alumnos / capacidad))
+    if pares and num_grupos % 2 and num_alumnos > num_grupos:
+        num_grupos += 1
+    return num_grupos
+
+
+def tamanos_equilibrados(num_alumnos, num_grupos):
+    """Tamaños que difieren como mucho en uno, p.ej. (25, 4) → [7, 6, 6, 6]"""
+    base, resto = divmod(num_alumnos, num_grupos)
+    return [base + 1 if i < resto else base for i in range(num_grupos)]
+
+
+class ParticionadorGrupos:
+    """
+    Reparte los alumnos de cada asignatura en grupos de tamaño casi igual
+
+    Además de equilibrar, intenta que los alumnos que comparten asignaturas
+    caigan en grupos "alineados", reduciendo los pares de grupos de distintas
+    asignaturas con alumnos comunes. Cada uno de esos pares es una restricción
+    de no solapamiento para el motor, así que menos pares = más huecos libres.
+    """
+
+    def __init__(self, matriculas, capacidades, pares=True, tiempo_maximo=1.0,
+                 iteraciones_por_matricula=20, semilla=0):
+        """
+        Args:
+            matriculas (dict): {dni: [asignaturas]}
+            capacidades (dict): {asignatura: máximo de alumnos por grupo}
+            pares (bool): forzar número par de grupos
+            tiempo_maximo (float): segundos como máximo para la búsqueda local
+            iteraciones_por_matricula (int): presupuesto de intercambios
+            semilla (int): semilla del generador aleatorio
+        """
+        self.matriculas = matriculas
+        self.capacidades = capacidades
+        self.pares = pares
+        self.tiempo_maximo = tiempo_maximo
+        self.iteraciones_por_matricula = iteraciones_por_matricula
+        self.aleatorio = random.Random(semilla)
+
+        self.pares_conflicto = 0
+
+    def particionar(self):
+        """
+        Returns:
+            dict: {asignatura: [[dni, ...], ...]} con un número de grupos par si se pidió
+        """
+        alumnos_asignatura = {}
+        for dni, asignaturas in self.matriculas.items():
+            for asignatura in asignaturas:
+                if asignatura in self.capacidades:
+                    alumnos_asignatura.setdefault(asignatura, []).append(dni)
+
+        grupos = self._sembrar(alumnos_asignatura)
+        self._busqueda_local(grupos)
+        return {
+            asignatura: [sorted(grupo) for grupo in lista]
+            for asignatura, lista in grupos.items()
+        }
+
+    # ========= SIEMBRA VORAZ =========
+
+    def _sembrar(self, alumnos_asignatura):
+        """Ordenar por perfil de matrícula y cortar en bloques consecutivos"""
+        perfiles = {dni: tuple(sorted(asignaturas)) for dni, asignaturas in self.matriculas.items()}
+
+        grupos = {}
+        for asignatura, alumnos in alumnos_asignatura.items():
+            num_grupos = calcular_numero_grupos(len(alumnos), self.capacidades[asignatura], self.pares)
+            ordenados = sorted(alumnos, key=lambda dni: (perfiles[dni], dni))
+
+            lista = []
+            inicio = 0
+            for tam in tamanos_equilibrados(len(ordenados), num_grupos):
+                lista.append(set(ordenados[inicio:inicio + tam]))
+                inicio += tam
+            grupos[asignatura] = lista
+
+        return grupos
+
+    # ========= BÚSQUEDA LOCAL =========
+
+    def _busqueda_local(self, grupos):
+        """Intercambiar alumnos entre grupos de una asignatura si reduce pares en conflicto"""
+        # Identificador global de cada grupo y grupo de cada (alumno, asignatura)
+        ids = {}
+        grupo_de = {}
+        for asignatura, lista in grupos.items():
+            for posicion, grupo in enumerate(lista):
+                gid = len(ids)
+                ids[gid] = (asignatura, posicion)
+                for dni in grupo:
+                    grupo_de[(dni, asignatura)] = gid
+
+        # Multiplicidad de cada par de grupos que comparten alumnos
+        conteo = {}
+        for dni, asignaturas in self.matriculas.items():
+            propios = [grupo_de[(dni, a)] for a in asignaturas if (dni, a) in grupo_de]
+            for i, g1 in enumerate(propios):
+                for g2 in propios[i + 1:]:
+                    par = (g1, g2) if g1 < g2 else (g2, g1)
+                    conteo[par] = conteo.get(par, 0) + 1
+        self.pares_conflicto = len(conteo)
+
+        # Sólo las asignaturas con más de un grupo admiten intercambios
+        divisibles = [a for a, lista in grupos.items() if len(lista) > 1]
+        if not divisibles:
+            return
+        miembros = {a: [list(grupo) for grupo in grupos[a]] for a in divisibles}
+        companeros = {gid: grupos[a][p] for gid, (a, p) in ids.items()}
+        pesos = [sum(len(g) for g in grupos[a]) for a in divisibles]
+
+        total_matriculas = len(grupo_de)
+        iteraciones = self.iteraciones_por_matricula * total_matriculas
+        limite = time.perf_counter() + self.tiempo_maximo
+        aleatorio = self.aleatorio
+
+        for iteracion in range(iteraciones):
+            if iteracion % 1000 == 0 and time.perf_counter() > limite:
+                break
+
+            asignatura = aleatorio.choices(divisibles, weights=pesos)[0]
+            lista = miembros[asignatura]
+            p1 = aleatorio.randrange(len(lista))
+            i1 = aleatorio.randrange(len(lista[p1]))
+            x = lista[p1][i1]
+            g1 = grupo_de[(x, asignatura)]
+
+            # Destino: el grupo donde están más compañeros de x en sus otras asignaturas
+            p2 = self._grupo_afin(x, asignatura, g1, ids, grupo_de, companeros)
+            if p2 is None:
+                p2 = aleatorio.randrange(len(lista) - 1)
+                p2 += p2 >= p1
+            i2 = aleatorio.randrange(len(lista[p2]))
+            y = lista[p2][i2]
+            g2 = grupo_de[(y, asignatura)]
+
+            cambios = {}
+            self._mover(cambios, grupo_de, x, asignatura, g1, g2)
+            self._mover(cambios, grupo_de, y, asignatura, g2, g1)
+
+            delta = 0
+            for par, cambio in cambios.items():
+                if cambio:
+                    antes = conteo.get(par, 0)
+                    delta += (antes + cambio > 0) - (antes > 0)
+
+            # Aceptar mejoras y, de vez en cuando, movimientos neutros para salir de mesetas
+            if delta < 0 or (delta == 0 and aleatorio.random() < 0.1):
+                for par, cambio in cambios.items():
+                    if cambio:
+                        valor = conteo.get(par, 0) + cambio
+                        if valor:
+                            conteo[par] = valor
+                        else:
+                            conteo.pop(par, None)
+                lista[p1][i1], lista[p2][i2] = y, x
+                grupo_de[(x, asignatura)], grupo_de[(y, asignatura)] = g2, g1
+                companeros[g1].discard(x)
+                companeros[g1].add(y)
+                companeros[g2].discard(y)
+                companeros[g2].add(x)
+
+        self.pares_conflicto = len(conteo)
+        for asignatura in divisibles:
+            grupos[asignatura] = [set(grupo) for grupo in miembros[asignatura]]
+
+    def _grupo_afin(self, dni, asignatura, actual, ids, grupo_de, companeros):
+        """Posición del grupo de la asignatura con más compañeros de dni (o None)"""
+        otra = [a for a in self.matriculas[dni] if a != asignatura and (dni, a) in grupo_de]
+        if not otra:
+            return None
+        referencia = companeros[grupo_de[(dni, self.aleatorio.choice(otra))]]
+
+        votos = {}
+        for companero in referencia:
+            gid = grupo_de.get((companero, asignatura))
+            if gid is not None and gid != actual:
+                votos[gid] = votos.get(gid, 0) + 1
+        if not votos:
+            return None
+        return ids[max(votos, key=votos.get)][1]
+
+    def _mover(self, cambios, grupo_de, dni, asignatura, origen, destino):
+        """Acumular en cambios el efecto de mover dni de origen a destino"""
+        for otra in self.matriculas[dni]:
+            if otra == asignatura:
+                continue
+            otro = grupo_de.get((dni, otra))
+            if otro is None:
+                continue
+            par_origen = (origen, otro) if origen < otro else (otro, origen)
+            par_destino = (destino, otro) if destino < otro else (otro, destino)
+            cambios[par_origen] = cambios.get(par_origen, 0) - 1
+            cambios[par_destino] = cambios.get(par_destino, 0) + 1
+
+
+def repartir_grupos(matriculas, capacidades, pares=True, tiempo_maximo=1.0, semilla=0):
+    """
+    Función de fachada para repartir todas las asignaturas de una vez
+
+    Returns:
+        dict: {asignatura: [[dni, ...], ...]}
+    """
+    particionador = ParticionadorGrupos(matriculas, capacidades, pares=pares,
+                                        tiempo_maximo=tiempo_maximo, semilla=semilla)
+    return particionador.particionar()
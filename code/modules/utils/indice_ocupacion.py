@@ -0,0 +1,95 @@
+"""
+Índice de ocupación de laboratorios por (laboratorio, día)
+Guarda intervalos en minutos enteros ordenados por inicio para responder
+"¿está libre?" y "¿qué se solapa?" con búsqueda binaria
+"""
+
+from bisect import bisect_left, insort
+
+from modules.utils.franjas import hora_a_minutos
+
+
+class _IntervalosDia:
+    """Intervalos [inicio, fin) de un laboratorio en un día, ordenados por inicio"""
+
+    __slots__ = ('intervalos', 'duracion_maxima')
+
+    def __init__(self):
+        self.intervalos = []  # [(inicio, fin, id)] ordenada
+        self.duracion_maxima = 0
+
+    def agregar(self, intervalo):
+        insort(self.intervalos, intervalo)
+        self.duracion_maxima = max(self.duracion_maxima, intervalo[1] - intervalo[0])
+
+    def eliminar(self, intervalo):
+        pos = bisect_left(self.intervalos, intervalo)
+        if pos < len(self.intervalos) and self.intervalos[pos] == intervalo:
+            del self.intervalos[pos]
+            if intervalo[1] - intervalo[0] == self.duracion_maxima:
+                self.duracion_maxima = max((f - i for i, f, _ in self.intervalos), default=0)
+
+    def solapados(self, inicio, fin):
+        """Intervalos que se solapan con [inicio, fin)"""
+        # Sólo puede solaparse lo que empieza en [inicio - duracion_maxima, fin)
+        desde = bisect_left(self.intervalos, (inicio - self.duracion_maxima,))
+        hasta = bisect_left(self.intervalos, (fin,))
+        return [intervalo for intervalo in self.intervalos[desde:hasta] if intervalo[1] > inicio]
+
+
+class IndiceOcupacion:
+    """Ocupación de laboratorios sincronizada con el diccionario de asignaciones"""
+
+    def __init__(self):
+        self._dias = {}  # (laboratorio, dia) -> _IntervalosDia
+        self._ubicacion = {}  # id -> ((laboratorio, dia), intervalo)
+
+    def __len__(self):
+        return len(self._ubicacion)
+
+    def __contains__(self, asignacion_id):
+        return asignacion_id in self._ubicacion
+
+    def agregar(self, asignacion_id, laboratorio, dia, inicio, fin):
+        """Registrar una asignación (horas 'HH:MM' o minutos)"""
+        if asignacion_id in self._ubicacion:
+            self.eliminar(asignacion_id)
+
+        clave = (laboratorio, dia)
+        intervalo = (self._minutos(inicio), self._minutos(fin), asignacion_id)
+        self._dias.setdefault(clave, _IntervalosDia()).agregar(intervalo)
+        self._ubicacion[asignacion_id] = (clave, intervalo)
+
+    def eliminar(self, asignacion_id):
+        """Quitar una asignación del índice (si existe)"""
+        ubicacion = self._ubicacion.pop(asignacion_id, None)
+        if ubicacion is None:
+            return
+
+        clave, intervalo = ubicacion
+        dia = self._dias[clave]
+        dia.eliminar(intervalo)
+        if not dia.intervalos:
+            del self._dias[clave]
+
+    def solapados(self, laboratorio, dia, inicio, fin):
+        """IDs de las asignaciones que se solapan con el intervalo dado"""
+        intervalos = self._dias.get((laboratorio, dia))
+        if intervalos is None:
+            return []
+        return [intervalo[2] for intervalo in intervalos.solapados(self._minutos(inicio), self._minutos(fin))]
+
+    def esta_libre(self, laboratorio, dia, inicio, fin):
+        """True si el laboratorio no tiene nada en [inicio, fin)"""
+        return not self.solapados(laboratorio, dia, inicio, fin)
+
+    def reconstruir(self, asignaciones):
+        """Reconstruir el índice desde {id: {laboratorio, dia, inicio, fin}}"""
+        self._dias = {}
+        self._ubicacion = {}
+        for asignacion_id, datos in asignaciones.items():
+            self.agregar(asignacion_id, datos['laboratorio'], datos['dia'], datos['inicio'], datos['fin'])
+
+    @staticmethod
+    def _minutos(hora):
+        return hora if isinstance(hora, int) else hora_a_minutos(hora)
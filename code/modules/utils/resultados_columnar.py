@@ -0,0 +1,159 @@
+"""
+Resultados de la programación en formato columnar (Arrow IPC)
+El motor vuelca las filas a un archivo Arrow que VerResultados abre mapeado en
+memoria: leer una columna o un rango de filas no parsea el resto del archivo,
+y las filas sólo se convierten a dict por bloques cuando una vista las pide.
+Excel queda como formato de exportación
+"""
+
+import os
+import tempfile
+from collections.abc import Sequence
+
+try:
+    import pyarrow as pa
+
+    PYARROW_DISPONIBLE = True
+except ImportError:
+    PYARROW_DISPONIBLE = False
+
+ARCHIVO_RESULTADOS = "horarios_laboratorios.arrow"
+EXTENSIONES_COLUMNARES = ('.arrow', '.feather')
+
+# Filas por lote del archivo y por bloque de conversión a dict
+TAM_LOTE = 4096
+TAM_BLOQUE = 512
+BLOQUES_EN_MEMORIA = 64
+
+
+def es_columnar(ruta):
+    return os.path.splitext(ruta)[1].lower() in EXTENSIONES_COLUMNARES
+
+
+def ruta_excel(ruta):
+    """Misma ruta con extensión .xlsx"""
+    return os.path.splitext(ruta)[0] + '.xlsx'
+
+
+def localizar_resultados(ruta):
+    """
+    Archivo de resultados que realmente existe para una ruta pedida
+
+    Si se pide el columnar pero no existe (o no hay pyarrow), se recurre al
+    Excel del mismo nombre que generaban las versiones anteriores.
+    """
+    if es_columnar(ruta) and (not PYARROW_DISPONIBLE or not os.path.exists(ruta)):
+        alternativa = ruta_excel(ruta)
+        if os.path.exists(alternativa):
+            return alternativa
+    return ruta
+
+
+def guardar_resultados(filas, ruta):
+    """
+    Volcar las filas de resultado a disco según la extensión de la ruta
+
+    Returns:
+        str: ruta escrita (la .xlsx equivalente si se pidió Arrow sin pyarrow)
+    """
+    if es_columnar(ruta) and not PYARROW_DISPONIBLE:
+        print("⚠️ pyarrow no disponible: los resultados se guardan en Excel")
+        ruta = ruta_excel(ruta)
+
+    if not es_columnar(ruta):
+        import pandas as pd
+        pd.DataFrame(filas).to_excel(ruta, index=False)
+        return ruta
+
+    tabla = pa.Table.from_pylist(list(filas))
+    directorio = os.path.dirname(os.path.abspath(ruta))
+    descriptor, temporal = tempfile.mkstemp(dir=directorio, suffix='.tmp')
+    os.close(descriptor)
+    try:
+        # Sin compresión para que el archivo se pueda mapear en memoria tal cual
+        with pa.OSFile(temporal, 'wb') as destino:
+            with pa.ipc.new_file(destino, tabla.schema) as escritor:
+                escritor.write_table(tabla, max_chunksize=TAM_LOTE)
+        os.replace(temporal, ruta)
+    except BaseException:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
+    return ruta
+
+
+class ResultadosColumnar:
+    """
+    Archivo Arrow de resultados abierto con memory map
+
+    read_all() sobre el mapa no copia datos: las columnas apuntan al archivo y
+    sólo se materializa lo que se convierte a pandas o a Python.
+    """
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self._mapa = pa.memory_map(ruta, 'r')
+        self._tabla = pa.ipc.open_file(self._mapa).read_all()
+        self.columnas = self._tabla.schema.names
+        self._texto = {campo.name for campo in self._tabla.schema
+                       if pa.types.is_string(campo.type) or pa.types.is_null(campo.type)}
+
+    def __len__(self):
+        return self._tabla.num_rows
+
+    def leer(self, columnas=None, inicio=0, fin=None):
+        """DataFrame con sólo las columnas y el rango de filas pedidos"""
+        columnas = [c for c in (columnas or self.columnas) if c in self.columnas]
+        fin = len(self) if fin is None else min(fin, len(self))
+        return self._tabla.select(columnas).slice(inicio, max(fin - inicio, 0)).to_pandas()
+
+    def filas(self, inicio=0, fin=None):
+        """Lista de dicts de un rango (los textos vacíos como '')"""
+        fin = len(self) if fin is None else min(fin, len(self))
+        filas = self._tabla.slice(inicio, max(fin - inicio, 0)).to_pylist()
+        for fila in filas:
+            for columna in self._texto:
+                if fila[columna] is None:
+                    fila[columna] = ''
+        return filas
+
+    def cerrar(self):
+        self._tabla = None
+        self._mapa.close()
+
+
+class FilasPerezosas(Sequence):
+    """
+    Secuencia de filas (dicts) de un ResultadosColumnar convertidas por bloques
+
+    Sustituye a la lista de dicts de VerResultados: las vistas acceden por
+    posición y sólo se convierten los bloques que contienen esas posiciones.
+    """
+
+    def __init__(self, resultados, tam_bloque=TAM_BLOQUE, bloques_en_memoria=BLOQUES_EN_MEMORIA):
+        self._resultados = resultados
+        self._tam_bloque = tam_bloque
+        self._maximo = bloques_en_memoria
+        self._bloques = {}
+
+    def __len__(self):
+        return len(self._resultados)
+
+    def __getitem__(self, posicion):
+        if isinstance(posicion, slice):
+            return [self[i] for i in range(*posicion.indices(len(self)))]
+        if posicion < 0:
+            posicion += len(self)
+        if not 0 <= posicion < len(self):
+            raise IndexError(posicion)
+
+        numero, desplazamiento = divmod(posicion, self._tam_bloque)
+        bloque = self._bloques.pop(numero, None)
+        if bloque is None:
+            inicio = numero * self._tam_bloque
+            bloque = self._resultados.filas(inicio, inicio + self._tam_bloque)
+            if len(self._bloques) >= self._maximo:
+                # Se descarta el bloque usado hace más tiempo (el primero del dict)
+                del self._bloques[next(iter(self._bloques))]
+        self._bloques[numero] = bloque
+        return bloque[desplazamiento]
@@ -0,0 +1,12 @@
+"""
+Configuración común de los tests: se ejecutan desde code/ con las rutas de la aplicación
+"""
+
+import os
+import sys
+
+DIRECTORIO_CODIGO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DIRECTORIO_EJEMPLO = os.path.join(DIRECTORIO_CODIGO, 'ejemplo', 'datos_ejemplo')
+
+if DIRECTORIO_CODIGO not in sys.path:
+    sys.path.insert(0, DIRECTORIO_CODIGO)
@@ -0,0 +1,165 @@
+"""
+Almacén SQLite de ConfigurarHorarios: guardado por registro y conflictos entre usuarios
+"""
+
+import pytest
+
+from modules.data_sources import horario
+from modules.data_sources.horario import AlmacenHorarios, ConflictoEdicion
+
+LAB_A = {'capacidad': 24, 'equipamiento': 'Osciloscopios', 'edificio': 'A'}
+LAB_B = {'capacidad': 20, 'equipamiento': 'Campana', 'edificio': 'B'}
+
+
+@pytest.mark.parametrize('sistema, local', [('ext4', True), ('xfs', True), ('nfs4', False), ('cifs', False),
+                                            ('fuse.sshfs', False), (None, False)])
+def test_solo_wal_en_disco_local(monkeypatch, tmp_path, sistema, local):
+    monkeypatch.setattr(horario.os, 'name', 'posix')
+    monkeypatch.setattr(horario, '_sistema_archivos_posix', lambda ruta: sistema)
+
+    assert horario.es_unidad_local(str(tmp_path / 'horarios.db')) is local
+    assert not horario.es_unidad_local('//servidor/recurso/horarios.db')
+
+    almacen = AlmacenHorarios(str(tmp_path / 'horarios.db'))
+    modo = almacen._conexion.execute("PRAGMA journal_mode").fetchone()[0]
+    assert modo == ('wal' if local else 'delete')
+    almacen.cerrar()
+
+
+@pytest.fixture
+def ruta(tmp_path):
+    return str(tmp_path / 'horarios.db')
+
+
+def abrir(ruta):
+    almacen = AlmacenHorarios(ruta, compartido=False)
+    almacen.cargar()
+    return almacen
+
+
+def test_guardar_y_cargar(ruta):
+    almacen = abrir(ruta)
+    almacen.aplicar({('laboratorios', 'Lab_A'): LAB_A,
+                     ('cursos', 'M204'): {'descripcion': 'Mecánica', 'es_doble_grado': True, 'comparte_con': ''},
+                     ('asignaciones', 'a1'): {'curso': 'M204', 'laboratorio': 'Lab_A', 'dia': 'Lunes',
+                                              'inicio': '08:00', 'fin': '10:00'}})
+
+    laboratorios, cursos, asignaciones = abrir(ruta).cargar()
+    assert laboratorios == {'Lab_A': LAB_A}
+    assert cursos['M204']['es_doble_grado'] is True
+    assert asignaciones['a1']['fin'] == '10:00'
+
+
+
+def asignacion(curso, inicio, fin, laboratorio='Lab_A', dia='Lunes'):
+    return {'curso': curso, 'laboratorio': laboratorio, 'dia': dia, 'inicio': inicio, 'fin': fin}
+
+
+def test_asignaciones_solapadas_con_otro_id_son_conflicto(ruta):
+    uno, otro = abrir(ruta), abrir(ruta)
+    uno.aplicar({('asignaciones', 'M204_Lab_A_Lunes_08:00'): asignacion('M204', '08:00', '10:00')})
+
+    with pytest.raises(ConflictoEdicion) as error:
+        otro.aplicar({('asignaciones', 'E104_Lab_A_Lunes_09:00'): asignacion('E104', '09:00', '11:00')})
+    assert error.value.conflictos == []
+    assert error.value.solapes == [('E104_Lab_A_Lunes_09:00', 'M204_Lab_A_Lunes_08:00')]
+    assert list(abrir(ruta).cargar()[2]) == ['M204_Lab_A_Lunes_08:00']
+
+    # Contiguas, en otro laboratorio o sustituyendo a la que chocaba sí se guardan
+    otro.cambios_desde()
+    otro.aplicar({('asignaciones', 'E104_Lab_A_Lunes_10:00'): asignacion('E104', '10:00', '12:00'),
+                  ('asignaciones', 'E104_Lab_B_Lunes_09:00'): asignacion('E104', '09:00', '11:00', 'Lab_B')})
+    otro.aplicar({('asignaciones', 'M204_Lab_A_Lunes_08:00'): None,
+                  ('asignaciones', 'E104_Lab_A_Lunes_08:00'): asignacion('E104', '08:00', '10:00')})
+    assert sorted(abrir(ruta).cargar()[2]) == ['E104_Lab_A_Lunes_08:00', 'E104_Lab_A_Lunes_10:00',
+                                               'E104_Lab_B_Lunes_09:00']
+
+
+def test_leer_registros(ruta):
+    almacen = abrir(ruta)
+    almacen.aplicar({('asignaciones', 'a1'): asignacion('M204', '08:00', '10:00')})
+
+    assert abrir(ruta).leer_registros('asignaciones', ['a1', 'no_existe']) == {
+        'a1': asignacion('M204', '08:00', '10:00')}
+
+
+def test_labs_distintos_no_chocan(ruta):
+    abrir(ruta).aplicar({('laboratorios', 'Lab_A'): LAB_A, ('laboratorios', 'Lab_B'): LAB_B})
+    uno, otro = abrir(ruta), abrir(ruta)
+
+    uno.aplicar({('laboratorios', 'Lab_A'): dict(LAB_A, capacidad=30)})
+    otro.aplicar({('laboratorios', 'Lab_B'): dict(LAB_B, capacidad=10)})
+
+    laboratorios = abrir(ruta).cargar()[0]
+    assert laboratorios['Lab_A']['capacidad'] == 30
+    assert laboratorios['Lab_B']['capacidad'] == 10
+
+
+def test_mismo_registro_es_conflicto_y_no_guarda_nada(ruta):
+    abrir(ruta).aplicar({('laboratorios', 'Lab_A'): LAB_A})
+    uno, otro = abrir(ruta), abrir(ruta)
+    uno.aplicar({('laboratorios', 'Lab_A'): dict(LAB_A, capacidad=30)})
+
+    with pytest.raises(ConflictoEdicion) as error:
+        otro.aplicar({('laboratorios', 'Lab_A'): dict(LAB_A, capacidad=5),
+                      ('laboratorios', 'Lab_B'): LAB_B})
+    assert error.value.conflictos == [('laboratorios', 'Lab_A')]
+    assert abrir(ruta).cargar()[0] == {'Lab_A': dict(LAB_A, capacidad=30)}
+
+    # Tras recoger los cambios del otro usuario ya se puede guardar
+    assert otro.cambios_desde() == {('laboratorios', 'Lab_A'): dict(LAB_A, capacidad=30)}
+    otro.aplicar({('laboratorios', 'Lab_A'): dict(LAB_A, capacidad=5)})
+    assert abrir(ruta).cargar()[0]['Lab_A']['capacidad'] == 5
+
+
+@pytest.mark.parametrize('primero, segundo', [(LAB_A, None), (None, LAB_A)])
+def test_borrar_y_editar_a_la_vez_es_conflicto(ruta, primero, segundo):
+    abrir(ruta).aplicar({('laboratorios', 'Lab_A'): LAB_A})
+    uno, otro = abrir(ruta), abrir(ruta)
+    uno.aplicar({('laboratorios', 'Lab_A'): primero and dict(primero, capacidad=1)})
+
+    with pytest.raises(ConflictoEdicion):
+        otro.aplicar({('laboratorios', 'Lab_A'): segundo})
+
+
+def test_alta_simultanea_del_mismo_registro_es_conflicto(ruta):
+    uno, otro = abrir(ruta), abrir(ruta)
+    uno.aplicar({('laboratorios', 'Lab_A'): LAB_A})
+
+    with pytest.raises(ConflictoEdicion):
+        otro.aplicar({('laboratorios', 'Lab_A'): LAB_B})
+
+
+def test_cambios_desde_incluye_borrados(ruta):
+    abrir(ruta).aplicar({('laboratorios', 'Lab_A'): LAB_A, ('laboratorios', 'Lab_B'): LAB_B})
+    uno, otro = abrir(ruta), abrir(ruta)
+    uno.aplicar({('laboratorios', 'Lab_A'): None})
+
+    assert otro.cambios_desde() == {('laboratorios', 'Lab_A'): None}
+    assert otro.cambios_desde() == {}
+
+
+def test_reemplazar_no_pisa_lo_guardado_por_otro(ruta):
+    # Los dos abren la base vacía; uno guarda su configuración y el otro los datos de ejemplo
+    uno, otro = abrir(ruta), abrir(ruta)
+    uno.aplicar({('laboratorios', 'Lab_A'): LAB_A})
+
+    with pytest.raises(ConflictoEdicion):
+        otro.guardar_todo({'Lab_B': LAB_B}, {}, {})
+    assert abrir(ruta).cargar()[0] == {'Lab_A': LAB_A}
+
+    otro.cargar()
+    otro.guardar_todo({'Lab_B': LAB_B}, {}, {})
+    assert abrir(ruta).cargar()[0] == {'Lab_B': LAB_B}
+
+
+def test_migra_el_json_una_sola_vez(tmp_path, ruta):
+    ruta_json = tmp_path / 'horarios_sistema.json'
+    ruta_json.write_text('{"laboratorios": {"Lab_A": {"capacidad": 24}}, "cursos": {}, "asignaciones": {}}',
+                         encoding='utf-8')
+    almacen = AlmacenHorarios(ruta, compartido=False)
+
+    assert almacen.migrar_json(str(ruta_json))
+    assert almacen.cargar()[0]['Lab_A']['capacidad'] == 24
+    almacen.aplicar({('laboratorios', 'Lab_A'): None})
+    assert not almacen.migrar_json(str(ruta_json))
@@ -0,0 +1,115 @@
+"""
+Calendario sin navegador: enlace al PDF por HTTP y GET condicional de la caché
+contra un servidor local que sirve una página y un PDF guardados
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import fitz
+import pytest
+
+from modules.data_sources import calendario
+from modules.data_sources.calendario import CalendarioScraper
+
+ETAG = '"calendario-v1"'
+
+PAGINA = """<html><body>
+<a href="/noticias">Noticias</a>
+<a href="/descarga/calendario">Calendario T&iacute;tulos de Grado</a>
+</body></html>"""
+
+
+def pdf_calendario():
+    doc = fitz.open()
+    doc.new_page().insert_text((50, 60), "Calendario académico Curso 2024-2025")
+    for filas in (["L M X J V", "9 10 11 12 13", "16 17 18 19 20*"],
+                  ["L M X J V", "3 4 5 6 7", "10 11 12 13 14"]):
+        pagina = doc.new_page()
+        for i, fila in enumerate(filas):
+            pagina.insert_text((100, 200 + 20 * i), fila)
+    return doc.tobytes()
+
+
+class Servidor(ThreadingHTTPServer):
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), Manejador)
+        self.pdf = pdf_calendario()
+        self.peticiones = []  # [(método, ruta, estado)]
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class Manejador(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def responder(self, estado, cabeceras=(), cuerpo=b''):
+        self.server.peticiones.append((self.command, self.path, estado))
+        self.send_response(estado)
+        for cabecera, valor in cabeceras:
+            self.send_header(cabecera, valor)
+        self.send_header('Content-Length', str(len(cuerpo)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(cuerpo)
+
+    def do_GET(self):
+        if self.path == '/pagina':
+            self.responder(200, [('Content-Type', 'text/html; charset=utf-8')], PAGINA.encode('utf-8'))
+        elif self.path == '/descarga/calendario':
+            self.responder(302, [('Location', '/docs/calendario.pdf')])
+        elif self.path == '/docs/calendario.pdf':
+            if self.headers.get('If-None-Match') == ETAG:
+                self.responder(304, [('ETag', ETAG)])
+            else:
+                self.responder(200, [('Content-Type', 'application/pdf'), ('ETag', ETAG)], self.server.pdf)
+        else:
+            self.responder(404)
+
+    do_HEAD = do_GET
+
+
+@pytest.fixture
+def servidor():
+    servidor = Servidor()
+    hilo = threading.Thread(target=servidor.serve_forever, daemon=True)
+    hilo.start()
+    yield servidor
+    servidor.shutdown()
+    servidor.server_close()
+
+
+def test_enlace_al_pdf_siguiendo_la_redireccion(servidor):
+    enlace = CalendarioScraper(usar_cache=False)._buscar_enlace_http(f"{servidor.url}/pagina")
+
+    assert enlace == f"{servidor.url}/docs/calendario.pdf"
+    assert ('HEAD', '/descarga/calendario', 302) in servidor.peticiones
+    assert ('HEAD', '/docs/calendario.pdf', 200) in servidor.peticiones
+
+
+def test_304_reutiliza_el_pdf_de_la_cache(servidor, tmp_path, monkeypatch):
+    url = f"{servidor.url}/pagina"
+    scraper = CalendarioScraper(directorio_cache=str(tmp_path))
+
+    datos, error, _ = scraper.obtener_calendario_desde_web(url)
+    assert error == 0
+    assert datos['fechas']['semestre_1']['viernes'] == ['2024-09-13', '2024-09-20']
+    assert scraper._browser is None
+
+    # Mismo PDF: el servidor responde 304 y se devuelven los datos guardados
+    servidor.peticiones.clear()
+    segundo, error, mensaje = CalendarioScraper(directorio_cache=str(tmp_path)).obtener_calendario_desde_web(url)
+    assert (segundo, error) == (datos, 0)
+    assert 'sin cambios' in mensaje
+    assert servidor.peticiones == [('GET', '/docs/calendario.pdf', 304)]
+
+    # Con otra versión de la extracción el 304 basta: se reextrae el PDF guardado
+    servidor.peticiones.clear()
+    monkeypatch.setattr(calendario, 'VERSION_EXTRACCION', calendario.VERSION_EXTRACCION + 1)
+    tercero, error, mensaje = CalendarioScraper(directorio_cache=str(tmp_path)).obtener_calendario_desde_web(url)
+    assert (tercero, error) == (datos, 0)
+    assert 'actualizado' in mensaje
+    assert servidor.peticiones == [('GET', '/docs/calendario.pdf', 304)]
@@ -0,0 +1,124 @@
+"""
+Lectura de las tablas de semanas del calendario, resolución de sus fechas y calendario en uso
+"""
+
+from datetime import date
+
+import fitz
+
+from modules.data_sources.calendario import (VERSION_EXTRACCION, CacheCalendario, CalendarioScraper, cargar_calendario,
+                                             extraer_texto_pdf, guardar_calendario, resolver_fechas, tokenizar_tablas)
+from modules.scheduling.calendario_lectivo import IndiceCalendario
+
+# Primer semestre 2024-2025 con un cambio de mes y el 14 de octubre marcado
+TABLA_1 = """Curso 2024-2025
+SEPTIEMBRE
+L M X J V
+9 10 11 12 13
+30 1 2 3 4
+14* 15 16 17 18
+"""
+
+# Segundo semestre: una fila por celda y el salto de las vacaciones de Semana Santa
+TABLA_2 = "FEBRERO\nL\nM\nX\nJ\nV\n" + "\n".join(
+    ['3', '4', '5', '6', '7', '14', '15', '16', '17', '18*', '21', '22', '23', '24', '25']) + "\nFIN\n"
+
+
+def test_tokenizar_tablas_agrupa_filas_de_cinco():
+    tablas = tokenizar_tablas(TABLA_1 + "12 13\n" + TABLA_2)
+
+    assert len(tablas) == 2
+    assert tablas[0][1] == [(30, False), (1, False), (2, False), (3, False), (4, False)]
+    assert tablas[0][2][0] == (14, True)
+    assert tablas[1][1] == [(14, False), (15, False), (16, False), (17, False), (18, True)]
+
+
+def test_cabecera_incompleta_no_abre_tabla():
+    assert tokenizar_tablas("L M X 1 2 3 4 5") == []
+
+
+def test_resolver_fechas_cruza_meses_y_vacaciones():
+    primer, segundo = tokenizar_tablas(TABLA_1 + TABLA_2)
+
+    fechas = resolver_fechas(primer, 2024, 8)
+    assert fechas[0] == (date(2024, 9, 9), False, 0)
+    assert [f for f, _, _ in fechas[5:7]] == [date(2024, 9, 30), date(2024, 10, 1)]
+    assert fechas[10] == (date(2024, 10, 14), True, 0)
+    assert all(fecha.weekday() == columna for fecha, _, columna in fechas)
+
+    fechas = resolver_fechas(segundo, 2025, 1)
+    assert fechas[0][0] == date(2025, 2, 3)
+    # 14..18 no cae de lunes a viernes en febrero de 2025: es abril, tras saltarse marzo
+    assert fechas[5][0] == date(2025, 4, 14)
+    assert fechas[9] == (date(2025, 4, 18), True, 4)
+
+
+def test_extraer_datos_semestres_usa_fechas_iso():
+    datos = CalendarioScraper(usar_cache=False)._extraer_datos_semestres(TABLA_1 + TABLA_2)
+
+    assert datos['curso_academico'] == '2024-2025'
+    assert datos['semestre_1']['lunes'] == ['9', '30', '14*']
+    assert datos['fechas']['semestre_1']['lunes'] == ['2024-09-09', '2024-09-30', '2024-10-14']
+    assert datos['fechas']['semestre_2']['viernes'][-1] == '2025-04-25'
+    assert set(datos['dias_especiales']) == {'2024-10-14', '2025-04-18'}
+
+    indice = IndiceCalendario.desde_datos(datos)
+    assert indice.es_lectivo(date(2024, 10, 1), 1)
+    assert indice.sesiones_por_dia(2) == [3, 3, 3, 3, 3]
+
+
+def test_sin_tablas_es_un_error_de_lectura():
+    scraper = CalendarioScraper(usar_cache=False)
+
+    assert scraper._extraer_datos_semestres("Curso 2024-2025\nSin tablas 30* ni 9*") is None
+    assert scraper._extraer_datos_semestres(TABLA_1) is None
+
+
+def pdf_calendario(paginas_con_tabla, total):
+    """PDF con texto en todas las páginas y una tabla (fila a fila, cada celda por separado) en las indicadas"""
+    doc = fitz.open()
+    for numero in range(total):
+        pagina = doc.new_page()
+        pagina.insert_text((50, 60), f"Curso 2024-2025 página {numero}")
+        if numero in paginas_con_tabla:
+            for fila, celdas in enumerate(['LMXJV', range(9, 14)]):
+                for columna, celda in enumerate(celdas):
+                    pagina.insert_text((100 + 60 * columna, 200 + 20 * fila), str(celda))
+    return doc.tobytes()
+
+
+def test_solo_se_extrae_el_texto_de_las_paginas_con_tabla(monkeypatch):
+    leidas = []
+    get_text = fitz.Page.get_text
+
+    def contar(pagina, *args, **kwargs):
+        leidas.append(pagina.number)
+        return get_text(pagina, *args, **kwargs)
+
+    monkeypatch.setattr(fitz.Page, 'get_text', contar)
+
+    texto = extraer_texto_pdf(pdf_calendario({2, 4}, 6), procesos=1)
+
+    assert leidas == [0, 2, 4]
+    assert 'página 0' in texto and 'página 2' in texto and 'página 3' not in texto
+    assert tokenizar_tablas(texto) == [[[(9, False), (10, False), (11, False), (12, False), (13, False)]]] * 2
+
+
+def test_calendario_vigente_se_guarda_y_se_recupera(tmp_path):
+    ruta = str(tmp_path / 'config' / 'calendario_vigente.json')
+    datos = CalendarioScraper(usar_cache=False)._extraer_datos_semestres(TABLA_1 + TABLA_2)
+
+    assert cargar_calendario(ruta, directorio_cache=str(tmp_path / 'cache')) is None
+    guardar_calendario(datos, ruta)
+    assert cargar_calendario(ruta, directorio_cache=str(tmp_path / 'cache')) == datos
+
+
+def test_sin_calendario_guardado_se_usa_el_ultimo_de_la_web(tmp_path):
+    cache = CacheCalendario(str(tmp_path))
+    for url, comprobado, curso in [('a', 200, '2025-2026'), ('b', 100, '2024-2025'), ('c', 300, '2026-2027')]:
+        cache.guardar(url, {'hash': url, 'enlace_comprobado': comprobado, 'datos': {'curso_academico': curso},
+                            'version': VERSION_EXTRACCION if url != 'c' else VERSION_EXTRACCION - 1})
+
+    datos = cargar_calendario(str(tmp_path / 'no_existe.json'), directorio_cache=str(tmp_path))
+
+    assert datos == {'curso_academico': '2025-2026'}
@@ -0,0 +1,78 @@
+"""
+ConfigurarHorarios: incorporar lo guardado por otro usuario sin duplicar reservas
+"""
+
+import os
+
+import pytest
+
+QtWidgets = pytest.importorskip('PyQt6.QtWidgets')
+
+from modules.data_sources.horario import AlmacenHorarios  # noqa: E402
+from modules.interfaces import configurar_horarios  # noqa: E402
+
+
+def asignacion(curso, inicio, fin):
+    return {'curso': curso, 'laboratorio': 'Lab_Fisica_A', 'dia': 'Lunes', 'inicio': inicio, 'fin': fin}
+
+
+@pytest.fixture
+def ventana(tmp_path, monkeypatch):
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    aplicacion = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    monkeypatch.setattr(configurar_horarios, 'RUTA_ALMACEN', str(tmp_path / 'horarios.db'))
+    monkeypatch.setattr(configurar_horarios, 'RUTA_JSON_ANTERIOR', str(tmp_path / 'no_existe.json'))
+    mensajes = []
+    monkeypatch.setattr(configurar_horarios.ConfigurarHorarios, 'mostrar_mensaje',
+                        lambda self, titulo, mensaje: mensajes.append((titulo, mensaje)))
+
+    ventana = configurar_horarios.ConfigurarHorarios()
+    ventana.guardar_configuracion()  # Datos de ejemplo al almacén
+    mensajes.clear()
+    yield ventana, mensajes
+    ventana.almacen.cerrar()
+    ventana.close()
+    aplicacion.processEvents()
+
+
+def agregar(ventana, clave, datos):
+    ventana.asignaciones[clave] = datos
+    ventana.indice_ocupacion.agregar(clave, datos['laboratorio'], datos['dia'], datos['inicio'], datos['fin'])
+    ventana.marcar_cambio('asignaciones', clave)
+
+
+def test_asignacion_propia_que_choca_con_otra_guardada_se_descarta(ventana):
+    ventana, mensajes = ventana
+    otro = AlmacenHorarios(ventana.config_path, compartido=False)
+    otro.cargar()
+    otro.aplicar({('asignaciones', 'E104_remota'): asignacion('E104', '09:00', '11:00')})
+
+    agregar(ventana, 'M204_local', asignacion('M204', '08:00', '10:00'))
+    agregar(ventana, 'M206_local', asignacion('M206', '11:00', '13:00'))
+    ventana.guardar_configuracion()
+
+    assert sorted(AlmacenHorarios(ventana.config_path).cargar()[2]) == ['E104_remota', 'M206_local']
+    assert sorted(ventana.asignaciones) == ['E104_remota', 'M206_local']
+    assert ventana.indice_ocupacion.solapados('Lab_Fisica_A', 'Lunes', '08:00', '09:00') == []
+    titulo, mensaje = mensajes[-1]
+    assert titulo == "⚠️ Conflictos" and 'M204_local (choca con E104_remota)' in mensaje
+    otro.cerrar()
+
+
+def test_asignacion_ya_guardada_vuelve_a_su_version(ventana):
+    ventana, mensajes = ventana
+    agregar(ventana, 'M204_local', asignacion('M204', '08:00', '10:00'))
+    ventana.guardar_configuracion()
+
+    otro = AlmacenHorarios(ventana.config_path, compartido=False)
+    otro.cargar()
+    otro.aplicar({('asignaciones', 'E104_remota'): asignacion('E104', '12:00', '14:00')})
+
+    # Se mueve la propia a una hora que el otro usuario acaba de ocupar
+    agregar(ventana, 'M204_local', asignacion('M204', '12:00', '14:00'))
+    ventana.recargar_configuracion()
+
+    assert ventana.asignaciones['M204_local'] == asignacion('M204', '08:00', '10:00')
+    assert ventana.cambios_pendientes == set()
+    assert mensajes[-1][0] == "⚠️ Conflictos"
+    otro.cerrar()
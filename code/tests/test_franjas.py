@@ -0,0 +1,38 @@
+"""
+Rejilla de franjas: sólo cuentan las franjas cubiertas enteras
+"""
+
+import pytest
+
+from modules.utils.franjas import (HORA_FIN_JORNADA, HORA_INICIO_JORNADA, NUM_FRANJAS, hora_a_minutos,
+                                   mascara_disponibilidad, mascara_intervalo)
+
+
+def franjas(mascara):
+    return [i for i in range(NUM_FRANJAS) if mascara >> i & 1]
+
+
+@pytest.mark.parametrize('inicio, fin, esperado', [
+    ('08:00', '09:00', [0, 1, 2, 3]),
+    ('08:10', '09:00', [1, 2, 3]),  # 08:00-08:15 no queda cubierta
+    ('08:00', '08:50', [0, 1, 2]),  # 08:45-09:00 tampoco
+    ('08:10', '08:50', [1, 2]),
+    ('08:15', '08:30', [1]),
+    ('08:05', '08:25', []),  # Ninguna franja entera
+    ('09:00', '09:00', []),
+    ('10:00', '09:00', []),
+])
+def test_mascara_redondea_hacia_dentro(inicio, fin, esperado):
+    assert franjas(mascara_intervalo(hora_a_minutos(inicio), hora_a_minutos(fin))) == esperado
+
+
+def test_mascara_recorta_a_la_jornada():
+    assert mascara_intervalo(HORA_INICIO_JORNADA - 60, HORA_FIN_JORNADA + 60) == (1 << NUM_FRANJAS) - 1
+    assert mascara_intervalo(HORA_INICIO_JORNADA - 60, HORA_INICIO_JORNADA) == 0
+    assert franjas(mascara_intervalo(hora_a_minutos('19:45'), HORA_FIN_JORNADA + 30)) == [NUM_FRANJAS - 1]
+
+
+def test_disponibilidad_con_varios_tramos():
+    mascara = mascara_disponibilidad('08:00-08:30; 19:50-20:00;mal;09:00-x')
+    assert franjas(mascara) == [0, 1]
+    assert mascara_disponibilidad(None) == 0
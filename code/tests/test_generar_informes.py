@@ -0,0 +1,62 @@
+"""
+Manifiesto de los informes incrementales
+"""
+
+import json
+import os
+
+from modules.utils.exportar_excel import MANIFIESTO, generar_informes
+
+FILAS = [
+    {'Asignatura': 'Física', 'Grupo': 'A', 'Laboratorio': 'Lab_A', 'Profesor': 'P1', 'Dia': 'Lunes',
+     'Hora_Inicio': '08:00', 'Hora_Fin': '10:00', 'Num_Alumnos': 20, 'Estado': 'Asignado'},
+    {'Asignatura': 'Química', 'Grupo': 'B', 'Laboratorio': 'Lab_B', 'Profesor': 'P2', 'Dia': 'Martes',
+     'Hora_Inicio': '10:00', 'Hora_Fin': '12:00', 'Num_Alumnos': 18, 'Estado': 'Asignado'},
+]
+
+
+def manifiesto(directorio):
+    with open(os.path.join(directorio, MANIFIESTO), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_exportar_otra_vista_conserva_el_manifiesto(tmp_path):
+    directorio = str(tmp_path)
+    generados, _ = generar_informes(FILAS, directorio=directorio, formatos=('csv',), vistas=('laboratorios',))
+    assert len(generados) == 2
+
+    generar_informes(FILAS, directorio=directorio, formatos=('csv',), vistas=('asignaturas',))
+    assert len(manifiesto(directorio)) == 4
+
+    # Los de laboratorios siguen registrados: no se vuelven a escribir
+    generados, omitidos = generar_informes(FILAS, directorio=directorio, formatos=('csv',), vistas=('laboratorios',))
+    assert (generados, omitidos) == ([], 2)
+
+
+def test_solo_se_olvidan_los_archivos_borrados(tmp_path):
+    directorio = str(tmp_path)
+    generar_informes(FILAS, directorio=directorio, formatos=('csv',))
+    os.remove(os.path.join(directorio, 'laboratorios', 'Lab_A.csv'))
+
+    generar_informes(FILAS, directorio=directorio, formatos=('csv',), vistas=('asignaturas',))
+
+    assert sorted(manifiesto(directorio)) == [os.path.join('asignaturas', 'Física.csv'),
+                                              os.path.join('asignaturas', 'Química.csv'),
+                                              os.path.join('laboratorios', 'Lab_B.csv')]
+
+
+def test_se_borran_los_informes_que_ya_no_estan_en_el_horario(tmp_path):
+    directorio = str(tmp_path)
+    generar_informes(FILAS, directorio=directorio, formatos=('csv',))
+
+    # Lab_A y Física desaparecen del horario; sólo se exporta de nuevo la vista de laboratorios
+    generar_informes(FILAS[1:], directorio=directorio, formatos=('csv',), vistas=('laboratorios',))
+
+    assert sorted(manifiesto(directorio)) == [os.path.join('asignaturas', 'Física.csv'),
+                                              os.path.join('asignaturas', 'Química.csv'),
+                                              os.path.join('laboratorios', 'Lab_B.csv')]
+    assert os.listdir(os.path.join(directorio, 'laboratorios')) == ['Lab_B.csv']
+
+    generar_informes(FILAS[1:], directorio=directorio, formatos=('csv',))
+    assert os.listdir(os.path.join(directorio, 'asignaturas')) == ['Química.csv']
+    assert len(manifiesto(directorio)) == 2
@@ -0,0 +1,96 @@
+"""
+Importación en bloque de asignaciones (leer_asignaciones + validar_asignaciones)
+"""
+
+import json
+
+import pytest
+
+from modules.data_sources.horario import leer_asignaciones, validar_asignaciones
+from modules.utils.indice_ocupacion import IndiceOcupacion
+
+LABORATORIOS = {'Lab_A': {}, 'Lab_B': {}}
+CURSOS = {'M204': {}, 'E104': {}}
+
+
+def fila(curso='M204', laboratorio='Lab_A', dia='Lunes', inicio='08:00', fin='10:00'):
+    return {'curso': curso, 'laboratorio': laboratorio, 'dia': dia, 'inicio': inicio, 'fin': fin}
+
+
+@pytest.fixture
+def existentes():
+    asignaciones = {'M204_Lab_A_Lunes_08:00': fila()}
+    indice = IndiceOcupacion()
+    indice.reconstruir(asignaciones)
+    return asignaciones, indice
+
+
+def validar(filas, existentes):
+    asignaciones, indice = existentes
+    return validar_asignaciones(filas, LABORATORIOS, CURSOS, indice, asignaciones)
+
+
+def test_filas_validas_se_normalizan(existentes):
+    nuevas, errores = validar([fila(dia='miercoles', inicio='9:00', fin='11:00'),
+                               fila(curso='E104', laboratorio='Lab_B', dia='MIÉRCOLES')], existentes)
+
+    assert errores == []
+    assert nuevas == {
+        'M204_Lab_A_Miércoles_09:00': fila(dia='Miércoles', inicio='09:00', fin='11:00'),
+        'E104_Lab_B_Miércoles_08:00': fila(curso='E104', laboratorio='Lab_B', dia='Miércoles')
+    }
+
+
+def test_informa_de_todos_los_errores_a_la_vez(existentes):
+    asignaciones, indice = existentes
+    filas = [
+        fila(inicio='09:00', fin='11:00'),  # 2: choca con la existente
+        fila(laboratorio='Lab_B', dia='Martes'),  # 3: válida
+        fila(curso='E104', laboratorio='Lab_B', dia='Martes', inicio='09:30', fin='10:30'),  # 4: choca con la 3
+        fila(curso='X999'),  # 5
+        fila(laboratorio='Lab_Z'),  # 6
+        fila(dia='Sábado'),  # 7
+        fila(inicio='12:00', fin='10:00'),  # 8
+        fila(inicio='mediodía'),  # 9
+        fila(inicio=''),  # 10
+        fila(laboratorio='Lab_B', dia='Martes'),  # 11: repetida dentro del lote
+        fila(),  # 12: repetida respecto a la existente
+    ]
+
+    nuevas, errores = validar(filas, existentes)
+
+    assert list(nuevas) == ['M204_Lab_B_Martes_08:00']
+    assert [numero for numero, _ in errores] == [2, 4, 5, 6, 7, 8, 9, 10, 11, 12]
+    motivos = dict(errores)
+    assert 'ya ocupado' in motivos[2]
+    assert 'otra fila del lote' in motivos[4]
+    assert 'faltan inicio' in motivos[10]
+    assert 'repetida' in motivos[11] and 'repetida' in motivos[12]
+    # La validación no toca la configuración
+    assert len(asignaciones) == 1 and len(indice) == 1
+
+
+def test_franjas_contiguas_no_chocan(existentes):
+    nuevas, errores = validar([fila(inicio='10:00', fin='12:00'), fila(inicio='12:00', fin='13:00')], existentes)
+
+    assert errores == []
+    assert len(nuevas) == 2
+
+
+def test_leer_csv_con_cabeceras_del_exportador(tmp_path):
+    ruta = tmp_path / 'asignaciones.csv'
+    ruta.write_text('Curso,Laboratorio,Día,Hora_Inicio,Hora_Fin\nM204, Lab_A ,Lunes,8:00,10:00\n',
+                    encoding='utf-8')
+
+    assert leer_asignaciones(str(ruta)) == [fila(inicio='8:00')]
+
+
+@pytest.mark.parametrize('contenido', [
+    [fila()],
+    {'asignaciones': {'x': fila()}, 'laboratorios': {}},
+])
+def test_leer_json(tmp_path, contenido):
+    ruta = tmp_path / 'asignaciones.json'
+    ruta.write_text(json.dumps(contenido), encoding='utf-8')
+
+    assert leer_asignaciones(str(ruta)) == [fila()]
@@ -0,0 +1,58 @@
+"""
+ModeloAsignaciones: altas y bajas sin recorrer la lista de ids
+"""
+
+import pytest
+
+QtCore = pytest.importorskip('PyQt6.QtCore')
+
+from modules.interfaces.modelos_tabla import ModeloAsignaciones  # noqa: E402
+
+
+def asignacion(curso):
+    return {'curso': curso, 'laboratorio': 'Lab_A', 'dia': 'Lunes', 'inicio': '08:00', 'fin': '10:00'}
+
+
+def contenido(modelo):
+    return [modelo.data(modelo.index(row, 0)) for row in range(modelo.rowCount())]
+
+
+@pytest.fixture
+def modelo():
+    asignaciones = {f"id{i}": asignacion(f"C{i}") for i in range(5)}
+    return ModeloAsignaciones(asignaciones), asignaciones
+
+
+def test_alta_y_modificacion(modelo):
+    modelo, asignaciones = modelo
+    cambiadas = []
+    modelo.dataChanged.connect(lambda inicio, fin: cambiadas.append(inicio.row()))
+
+    asignaciones['id5'] = asignacion('C5')
+    modelo.insertar('id5')
+    asignaciones['id2'] = asignacion('X2')
+    modelo.insertar('id2')
+
+    assert contenido(modelo) == ['C0', 'C1', 'X2', 'C3', 'C4', 'C5']
+    assert cambiadas == [2]
+
+
+def test_baja_pasa_la_ultima_al_hueco(modelo):
+    modelo, asignaciones = modelo
+    quitadas = []
+    modelo.rowsRemoved.connect(lambda padre, inicio, fin: quitadas.append(inicio))
+
+    del asignaciones['id1']
+    modelo.eliminar('id1')
+    del asignaciones['id3']
+    modelo.eliminar('id3')
+    modelo.eliminar('no_existe')
+
+    assert contenido(modelo) == ['C0', 'C4', 'C2']
+    assert quitadas == [4, 3]
+    # Las posiciones siguen al día: se puede dar de baja la que se movió
+    del asignaciones['id4']
+    modelo.eliminar('id4')
+    modelo.insertar('id2')
+    assert contenido(modelo) == ['C0', 'C2']
+    assert [modelo.id_en(row) for row in range(2)] == ['id0', 'id2']
@@ -0,0 +1,136 @@
+"""
+Reprogramación incremental (MotorScheduling.actualizar) con los CSV de ejemplo
+"""
+
+import os
+import shutil
+
+import pytest
+
+from conftest import DIRECTORIO_EJEMPLO
+from modules.scheduling import MotorScheduling
+from modules.scheduling.entrada import cargar_datos_entrada
+
+ARCHIVOS = ('alumnos', 'asignaturas', 'laboratorios', 'profesores')
+
+
+@pytest.fixture
+def directorio(tmp_path):
+    for nombre in ARCHIVOS:
+        shutil.copy(os.path.join(DIRECTORIO_EJEMPLO, f"{nombre}.csv"), tmp_path)
+    return tmp_path
+
+
+def cargar(directorio):
+    return cargar_datos_entrada(*(str(directorio / f"{nombre}.csv") for nombre in ARCHIVOS))
+
+
+def editar(directorio, nombre, transformar):
+    ruta = directorio / f"{nombre}.csv"
+    lineas = ruta.read_text(encoding='utf-8').splitlines()
+    ruta.write_text('\n'.join(transformar(lineas)) + '\n', encoding='utf-8')
+
+
+def comprobar_solucion(motor):
+    """Ningún laboratorio, profesor o alumno tiene dos sesiones solapadas"""
+    asignados = [grupo for grupo in motor.grupos if grupo.asignacion is not None]
+    for i, grupo in enumerate(asignados):
+        lab, dia, mascara, profesor, _ = grupo.asignacion
+        if profesor >= 0:
+            assert motor.disponibilidad[profesor][dia] & mascara == mascara
+        for otro in asignados[i + 1:]:
+            lab_otro, dia_otro, mascara_otra, profesor_otro, _ = otro.asignacion
+            if dia != dia_otro or not mascara & mascara_otra:
+                continue
+            assert lab != lab_otro
+            assert profesor < 0 or profesor != profesor_otro
+            assert not set(grupo.alumnos) & set(otro.alumnos)
+
+    for grupo in motor.grupos:
+        assert all(0 <= vecino < len(motor.grupos) for vecino in grupo.vecinos)
+
+
+@pytest.fixture
+def motor(directorio):
+    motor = MotorScheduling(cargar(directorio))
+    motor.ejecutar()
+    comprobar_solucion(motor)
+    return motor
+
+
+def test_sin_cambios_no_reasigna_nada(motor, directorio):
+    motor.actualizar(cargar(directorio))
+
+    assert motor.cambios == []
+    assert motor.estadisticas['grupos_recalculados'] == motor.estadisticas['conflictos']
+
+
+def test_asignatura_eliminada(motor, directorio):
+    editar(directorio, 'asignaturas', lambda lineas: [l for l in lineas if not l.startswith('Física I,')])
+
+    filas = motor.actualizar(cargar(directorio))
+
+    assert filas
+    assert all(fila['Asignatura'] != 'Física I' for fila in filas)
+    assert [grupo.indice for grupo in motor.grupos] == list(range(len(motor.grupos)))
+    comprobar_solucion(motor)
+    # Una segunda actualización sobre el motor renumerado también funciona
+    motor.actualizar(cargar(directorio))
+    assert motor.cambios == []
+
+
+def test_laboratorio_renombrado(motor, directorio):
+    def renombrar(lineas):
+        return [l.replace('Lab_Fisica_A', 'Lab_Fisica_Nuevo') for l in lineas]
+
+    editar(directorio, 'laboratorios', renombrar)
+    editar(directorio, 'asignaturas', renombrar)
+
+    filas = motor.actualizar(cargar(directorio))
+
+    laboratorios = {fila['Laboratorio'] for fila in filas if fila['Estado'] == 'Asignado'}
+    assert 'Lab_Fisica_A' not in laboratorios
+    assert 'Lab_Fisica_A' not in motor.laboratorios
+    comprobar_solucion(motor)
+
+
+def test_profesor_con_otra_disponibilidad(motor, directorio):
+    # El profesor de Física I sólo puede los viernes de 08:00 a 12:00
+    def restringir(lineas):
+        return [
+            'Dr. García López,Física I,,,,,08:00-12:00,garcia.lopez@upm.es' if l.startswith('Dr. García López,')
+            else l for l in lineas
+        ]
+
+    editar(directorio, 'profesores', restringir)
+
+    filas = motor.actualizar(cargar(directorio))
+
+    for fila in filas:
+        if fila['Profesor'] == 'Dr. García López':
+            assert fila['Dia'] == 'Viernes'
+            assert '08:00' <= fila['Hora_Inicio'] and fila['Hora_Fin'] <= '12:00'
+    # Sólo se mueven grupos de Física I, la asignatura que imparte
+    assert all(nombre.startswith('Física_I_') for nombre, _, _ in motor.cambios)
+    comprobar_solucion(motor)
+
+
+def test_firma_estable_entre_procesos(motor):
+    # La firma debe coincidir aunque se calcule en otro intérprete (PYTHONHASHSEED distinto)
+    import pickle
+    import subprocess
+    import sys
+
+    from conftest import DIRECTORIO_CODIGO
+
+    codigo = (
+        "import pickle, sys\n"
+        "from modules.scheduling import MotorScheduling\n"
+        "motor = MotorScheduling(pickle.load(sys.stdin.buffer))\n"
+        "motor.preparar()\n"
+        "sys.stdout.buffer.write(pickle.dumps(motor._firma['asignaturas']))\n"
+    )
+    salida = subprocess.run([sys.executable, '-c', codigo], input=pickle.dumps(motor.datos),
+                            capture_output=True, cwd=DIRECTORIO_CODIGO, env={'PYTHONHASHSEED': '12345'},
+                            check=True).stdout
+    assert pickle.loads(salida) == motor._firma['asignaturas']
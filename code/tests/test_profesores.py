@@ -0,0 +1,26 @@
+"""
+Disponibilidad de profesores compilada a máscaras
+"""
+
+from modules.data_sources.profesores import DisponibilidadProfesores
+from modules.utils.franjas import hora_a_minutos, mascara_intervalo
+
+
+def mascara(inicio, fin):
+    return mascara_intervalo(hora_a_minutos(inicio), hora_a_minutos(fin))
+
+
+def test_libres_por_dia_mascara_y_profesor():
+    profesores = DisponibilidadProfesores()
+    profesores.agregar('A', 'Física', ['08:00-10:00', '', '', '', '12:00-14:00'])
+    profesores.agregar('B', 'Física', ['09:00-11:00', '', '', '', '08:00-14:00'])
+    profesores.agregar('A', 'Química', [])  # Segunda fila del mismo profesor
+
+    franjas = [mascara('08:00', '09:00'), mascara('09:00', '10:00'), mascara('12:00', '13:00')]
+    libres = profesores.libres([0, 1], franjas)
+
+    assert libres.shape == (5, 3, 2)
+    assert libres[0].tolist() == [[True, False], [True, True], [False, False]]
+    assert not libres[1:4].any()
+    assert libres[4].tolist() == [[False, True], [False, True], [True, True]]
+    assert profesores.asignaturas[0] == ['Física', 'Química']